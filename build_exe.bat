@@ -16,7 +16,7 @@ if %errorlevel% neq 0 (
 
 REM --- PyInstaller-Befehl ausführen ---
 echo Starte PyInstaller...
-pyinstaller --onefile --noconsole --icon=speedreader_icon.png --add-data="speedreader_icon.png;." --name SpeedReader main.py
+pyinstaller --onefile --noconsole --icon=speedreader_icon.png --add-data="speedreader_icon.png;." --add-data="word_frequency.bin;." --hidden-import=document_extractors --hidden-import=markup_extractors --name SpeedReader main.py
 
 REM --- Fehlerbehandlung ---
 if %errorlevel% neq 0 (
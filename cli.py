@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# Command line entry points. No Tk: runs on headless machines.
+#   python cli.py read <datei>...      Hands files to the running Speed Reader
+#   python cli.py prepare <datei>...   Extracts and tokenizes files in parallel into prepared documents
+#   python cli.py stats <datei>        Prints token count and reading time at the configured WPM
+#   python cli.py push [datei]         Sends text (file or stdin) over the control API
+#   python cli.py control <aktion>     pause / resume / status / seek N / set_wpm N over the control API
+
+import os
+import sys
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from single_instance import send_to_running_instance
+
+def _reading_stats(tokens, weights, settings, wpm):
+    """Returns (display item count, reading time in ms) from the delay timeline, as the reader would play it."""
+    from utils import group_display_items
+    from pacing import build_delay_timeline
+    display_items, item_to_word_indices = group_display_items(tokens, settings.get("chunk_size"))
+    timeline = build_delay_timeline(tokens, display_items, item_to_word_indices, settings, weights if settings.get("adaptive_pacing") else None)
+    return len(display_items), timeline.total_ms(wpm)
+
+def _load_document(filepath, use_cache=True, parallel=False):
+    """
+    Extracts and tokenizes a file (or takes it from the cache); parallel tokenizes very large texts on all cores.
+
+    Returns:
+        tuple: (PreparedDocument, from_cache, error message of a partial extraction or None)
+    """
+    from extractors import PartialExtractionError
+    from extraction_sandbox import extract_document_safe
+    from document_cache import build_prepared_document, load_cached_document
+    from word_frequency import get_frequency_lookup
+    from config import ConfigManager
+    cached = load_cached_document(filepath) if use_cache else None
+    if cached is not None: return cached, True, None
+    partial_error = None
+    try: text, headings = extract_document_safe(filepath, use_cache=False)
+    except PartialExtractionError as e: text = e.text; headings = e.headings; partial_error = e.message
+    return build_prepared_document(text, ConfigManager().get("orp_position"), get_frequency_lookup(), headings, parallel), False, partial_error
+
+def _prepare_file(filepath, output_path, force, parallel=False):
+    """
+    Pool worker: extraction, tokenization, weights and timeline for one file; writes the prepared document
+    to output_path (None = the app's cache).
+    Returns a plain tuple (exceptions with extra arguments do not survive the trip back from the pool).
+    parallel: only when called outside the pool (a single file), see tokenize_parallel.
+    """
+    from extractors import ExtractionError
+    from document_cache import write_prepared, store_cached_document
+    from config import ConfigManager
+    try:
+        document, from_cache, partial_error = _load_document(filepath, use_cache=not force and output_path is None, parallel=parallel)
+        if output_path is not None:
+            stat = os.stat(filepath); document.source_size = stat.st_size; document.source_mtime_ns = stat.st_mtime_ns
+            write_prepared(output_path, document)
+        elif from_cache: output_path = None
+        else: output_path = store_cached_document(filepath, document)
+        settings = ConfigManager(); wpm = settings.get("wpm")
+        _item_count, total_ms = _reading_stats(document.tokenized.tokens, document.weights, settings, wpm)
+        return filepath, output_path, len(document.tokenized.tokens), total_ms, partial_error
+    except ExtractionError as e: return filepath, None, 0, 0, f"{e.title}: {e.message}"
+    except (OSError, ValueError) as e: return filepath, None, 0, 0, str(e)
+
+def _output_paths(filepaths, output_dir):
+    """
+    Output file per input file: its name plus the bundle extension. Files with the same name from different
+    folders get the cache key of their path appended, so none overwrites another.
+    """
+    from document_cache import get_cache_key, PREPARED_EXTENSION
+    if output_dir is None: return {path: None for path in filepaths}
+    name_counts = {}
+    for path in filepaths: name = os.path.normcase(os.path.basename(path)); name_counts[name] = name_counts.get(name, 0) + 1
+    output_paths = {}
+    for path in filepaths:
+        name = os.path.basename(path)
+        if name_counts[os.path.normcase(name)] > 1: stem, ext = os.path.splitext(name); name = f"{stem}-{get_cache_key(path)[:8]}{ext}"
+        output_paths[path] = os.path.join(output_dir, name + PREPARED_EXTENSION)
+    return output_paths
+
+def _iter_prepared(filepaths, output_dir, force, jobs):
+    """Results of _prepare_file as they finish: one process per file, or for a single file the cores go to its tokenizer."""
+    output_paths = _output_paths(filepaths, output_dir)
+    if len(filepaths) == 1: yield _prepare_file(filepaths[0], output_paths[filepaths[0]], force, parallel=jobs != 1); return
+    with ProcessPoolExecutor(max_workers=jobs or None) as executor:
+        for future in as_completed([executor.submit(_prepare_file, path, output_paths[path], force) for path in filepaths]): yield future.result()
+
+def command_read(args):
+    request = {"action": "read_files", "paths": [os.path.abspath(path) for path in args.files]}
+    if send_to_running_instance(request): print("An laufenden Speed Reader übergeben."); return 0
+    print("Kein laufender Speed Reader gefunden. Starten mit: python main.py " + " ".join(args.files), file=sys.stderr)
+    return 1
+
+def command_prepare(args):
+    from utils import format_duration
+    filepaths = [path for path in args.files if os.path.isfile(path)]
+    missing = set(args.files) - set(filepaths)
+    for path in missing: print(f"Nicht gefunden: {path}", file=sys.stderr)
+    filepaths = list({os.path.normcase(os.path.abspath(path)): path for path in filepaths}.values()) # Each file once
+    if args.output: os.makedirs(args.output, exist_ok=True)
+    failed = 0
+    for filepath, output_path, token_count, total_ms, error in _iter_prepared(filepaths, args.output, args.force, args.jobs):
+        name = os.path.basename(filepath)
+        if not token_count: failed += 1; print(f"FEHLER {name}: {error}", file=sys.stderr); continue
+        target = output_path or "bereits im Cache"
+        print(f"{name}: {token_count} Tokens, {format_duration(total_ms / 1000)} -> {target}" + (f" (unvollständig: {error})" if error else ""))
+    return 1 if failed or missing else 0
+
+def command_stats(args):
+    from extractors import ExtractionError
+    from config import ConfigManager
+    from utils import format_duration, MARKER_TOKENS
+    try: document, from_cache, partial_error = _load_document(args.file, parallel=True)
+    except ExtractionError as e: print(f"{e.title}: {e.message}", file=sys.stderr); return 1
+    except OSError as e: print(f"Datei konnte nicht gelesen werden: {e}", file=sys.stderr); return 1
+    settings = ConfigManager(); wpm = args.wpm or settings.get("wpm")
+    tokens = document.tokenized.tokens
+    item_count, total_ms = _reading_stats(tokens, document.weights, settings, wpm)
+    word_count = sum(1 for token in tokens if token not in MARKER_TOKENS)
+    print(f"Datei:        {args.file}{' (aus Cache)' if from_cache else ''}")
+    if partial_error: print(f"Warnung:      unvollständig gelesen ({partial_error})")
+    print(f"Tokens:       {len(tokens)} ({word_count} Wörter, {len(tokens) - word_count} Absätze)")
+    print(f"Anzeigen:     {item_count} (Wortgruppe {settings.get('chunk_size')})")
+    if document.chapters: print(f"Kapitel:      {len(document.chapters)}")
+    print(f"Lesezeit:     {format_duration(total_ms / 1000)} bei {wpm} WPM")
+    return 0
+
+def _control_client():
+    from control_api import ControlClient
+    try: return ControlClient()
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Steuerschnittstelle nicht erreichbar ({e}). Ist sie in den Einstellungen aktiviert?", file=sys.stderr); return None
+
+def command_push(args):
+    if args.file:
+        with open(args.file, encoding='utf-8', errors='replace') as f: text = f.read()
+    else: text = sys.stdin.read()
+    client = _control_client()
+    if client is None: return 1
+    with client:
+        try: result = client.push_text(text, title=args.title or (os.path.basename(args.file) if args.file else None), append=args.append)
+        except (OSError, RuntimeError) as e: print(f"Fehler: {e}", file=sys.stderr); return 1
+    print(f"{result.get('tokens', 0)} Tokens gesendet.")
+    return 0
+
+def command_control(args):
+    params = {}
+    if args.action in ("seek", "set_wpm"):
+        if args.value is None: print(f"'{args.action}' braucht einen Wert.", file=sys.stderr); return 1
+        params = {"word": args.value} if args.action == "seek" else {"wpm": args.value}
+    client = _control_client()
+    if client is None: return 1
+    with client:
+        try: result = client.request(args.action, **params)
+        except (OSError, RuntimeError) as e: print(f"Fehler: {e}", file=sys.stderr); return 1
+    result.pop("ok", None)
+    for key, value in result.items(): print(f"{key}: {value}")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="speedreader", description="Speed Reader ohne Oberfläche.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    read_parser = commands.add_parser("read", help="Dateien im laufenden Speed Reader lesen")
+    read_parser.add_argument("files", nargs="+"); read_parser.set_defaults(handler=command_read)
+    prepare_parser = commands.add_parser("prepare", help="Dateien vorab extrahieren und tokenisieren (parallel)")
+    prepare_parser.add_argument("files", nargs="+")
+    prepare_parser.add_argument("--output", "-o", help="Ordner für die vorbereiteten Dateien (Standard: Cache der App)")
+    prepare_parser.add_argument("--jobs", "-j", type=int, default=0, help="Anzahl Prozesse (Standard: alle Kerne)")
+    prepare_parser.add_argument("--force", action="store_true", help="Auch bereits vorbereitete Dateien neu verarbeiten")
+    prepare_parser.set_defaults(handler=command_prepare)
+    stats_parser = commands.add_parser("stats", help="Tokens und Lesezeit einer Datei anzeigen")
+    stats_parser.add_argument("file"); stats_parser.add_argument("--wpm", type=int, help="Geschwindigkeit (Standard: aus den Einstellungen)")
+    stats_parser.set_defaults(handler=command_stats)
+    push_parser = commands.add_parser("push", help="Text über die Steuerschnittstelle senden (Datei oder stdin)")
+    push_parser.add_argument("file", nargs="?"); push_parser.add_argument("--title")
+    push_parser.add_argument("--append", action="store_true", help="An den laufenden Text anhängen")
+    push_parser.set_defaults(handler=command_push)
+    control_parser = commands.add_parser("control", help="Wiedergabe steuern")
+    control_parser.add_argument("action", choices=("pause", "resume", "status", "seek", "set_wpm"))
+    control_parser.add_argument("value", nargs="?", type=int); control_parser.set_defaults(handler=command_control)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
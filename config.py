@@ -42,6 +42,7 @@ DEFAULT_SETTINGS = {
     "hotkey": "<ctrl>+<alt>+r",
     "enable_orp": True,
     "orp_position": 0.35,      # 0.0 - 1.0
+    "chunk_orp_mode": "longest", # ORP bei Wortgruppen: 'longest', 'center' oder 'off'
     "reader_borderless": False,
     "reader_always_on_top": True,
     "hide_main_window": True,
@@ -53,7 +54,13 @@ DEFAULT_SETTINGS = {
     "initial_delay_ms": 150,
     "word_length_threshold": 3,    # Schwelle für längere Wörter
     "extra_ms_per_char": 12,        # Extra ms pro Zeichen über Schwelle
-    "show_continuous_context": True # NEU: Kontinuierlichen Kontext unten anzeigen
+    "adaptive_pacing": False,       # Anzeigezeit nach Wortkomplexität gewichten
+    "show_continuous_context": True, # NEU: Kontinuierlichen Kontext unten anzeigen
+    "context_snippet_live": False,   # Textausschnitt auch während des Lesens anzeigen
+    "control_api": False,            # Lokale Steuerschnittstelle für Skripte (control_api.py)
+    "skim_percent": 30,              # Überfliegen (Strg+S): Anteil der gelesenen Sätze in %
+    "hide_repeats": False,           # Wiederholte Absätze (zitierte Antworten, Signaturen) ausblenden, Strg+D zeigt sie
+    "remember_position": True        # Leseposition pro Datei merken und beim nächsten Öffnen dort weiterlesen
 }
 SETTINGS_FILE = get_appdata_path()
 
@@ -78,15 +85,17 @@ class ConfigManager:
 
             # Ensure correct types after loading/updating
             # Added word_length_threshold, extra_ms_per_char, initial_delay_ms
-            for key in ['wpm', 'font_size', 'chunk_size', 'initial_delay_ms', 'word_length_threshold', 'extra_ms_per_char']:
+            for key in ['wpm', 'font_size', 'chunk_size', 'initial_delay_ms', 'word_length_threshold', 'extra_ms_per_char', 'skim_percent']:
                 if key in settings: settings[key] = int(settings[key])
             for key in ['pause_punctuation', 'pause_comma', 'pause_paragraph', 'orp_position']:
                  if key in settings: settings[key] = float(settings[key])
             # Added show_continuous_context
-            for key in ['enable_orp', 'reader_borderless', 'reader_always_on_top', 'hide_main_window', 'dark_mode', 'show_context', 'run_on_startup', 'show_continuous_context']:
+            for key in ['enable_orp', 'reader_borderless', 'reader_always_on_top', 'hide_main_window', 'dark_mode', 'show_context', 'run_on_startup', 'show_continuous_context', 'context_snippet_live', 'adaptive_pacing', 'control_api', 'hide_repeats', 'remember_position']:
                  if key in settings: settings[key] = bool(settings[key])
             if settings.get("context_layout") not in ["vertical", "horizontal"]:
                  settings["context_layout"] = self.defaults["context_layout"]
+            if settings.get("chunk_orp_mode") not in ["longest", "center", "off"]:
+                 settings["chunk_orp_mode"] = self.defaults["chunk_orp_mode"]
 
         except (json.JSONDecodeError, IOError, TypeError, ValueError) as e:
             print(f"Error loading settings from {self.filename}: {e}. Using default settings.")
@@ -97,6 +106,7 @@ class ConfigManager:
         if settings.get("initial_delay_ms", 1500) < 0: settings["initial_delay_ms"] = 0
         if settings.get("word_length_threshold", 8) < 1: settings["word_length_threshold"] = 1
         if settings.get("extra_ms_per_char", 8) < 0: settings["extra_ms_per_char"] = 0
+        settings["skim_percent"] = max(5, min(100, settings.get("skim_percent", 30)))
 
         return settings
 
@@ -108,8 +118,11 @@ class ConfigManager:
             if self.settings.get("initial_delay_ms", 1500) < 0: self.settings["initial_delay_ms"] = 0
             if self.settings.get("word_length_threshold", 8) < 1: self.settings["word_length_threshold"] = 1
             if self.settings.get("extra_ms_per_char", 8) < 0: self.settings["extra_ms_per_char"] = 0
+            self.settings["skim_percent"] = max(5, min(100, self.settings.get("skim_percent", 30)))
             if self.settings.get("context_layout") not in ["vertical", "horizontal"]:
                  self.settings["context_layout"] = self.defaults["context_layout"]
+            if self.settings.get("chunk_orp_mode") not in ["longest", "center", "off"]:
+                 self.settings["chunk_orp_mode"] = self.defaults["chunk_orp_mode"]
 
             dir_path = os.path.dirname(self.filename)
             if dir_path and not os.path.exists(dir_path):
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+# Local control API for scripts: one JSON object per line over a Unix socket (loopback TCP plus token on Windows).
+# A selector loop on a background thread parses requests and tokenizes pushed text; everything else
+# is handed to the Tk thread through a queue.Queue. No Tk in here.
+
+import os
+import sys
+import json
+import queue
+import socket
+import secrets
+import selectors
+import tempfile
+import threading
+
+from config import get_appdata_path
+from utils import IncrementalTokenizer
+
+# --- Constants ---
+CONTROL_NAME = "speedreader-control"
+ENDPOINT_FILE = "control_endpoint.json" # Loopback endpoint: port and token (user's settings folder)
+MAX_LINE_BYTES = 4 * 1024 * 1024        # One request; larger texts are pushed in chunks
+PUSH_CHUNK_CHARS = 256 * 1024           # Chunk size used by ControlClient.push_text
+SELECT_TIMEOUT_S = 0.05                 # Also the delay for replies coming back from the Tk thread
+RECV_BYTES = 64 * 1024
+
+# Protocol (requests may carry an "id" that is echoed in the reply):
+#   {"action": "push_text", "text": "...", "title": "...", "append": false}
+#   {"action": "push_begin", "title": "...", "append": false}, {"action": "push_chunk", "data": "..."}..., {"action": "push_end"}
+#   {"action": "pause"} / {"action": "resume"} / {"action": "seek", "word": 1234} / {"action": "set_wpm", "wpm": 600}
+#   {"action": "status"}
+# Replies: {"ok": true, ...} or {"ok": false, "error": "..."}
+
+def use_unix_socket(): return hasattr(socket, "AF_UNIX") and sys.platform != 'win32'
+
+def get_control_address():
+    """Unix socket path of the control API (POSIX only)."""
+    base_dir = os.getenv('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base_dir, f"{CONTROL_NAME}-{os.getuid()}.sock")
+
+def get_endpoint_file():
+    return get_appdata_path(ENDPOINT_FILE)
+
+class _Connection:
+    __slots__ = ("sock", "inbox", "outbox", "push", "authorized")
+    def __init__(self, sock):
+        self.sock = sock; self.inbox = b""; self.outbox = b""; self.push = None; self.authorized = False
+
+class ControlServer:
+    """
+    Serves the control API. Complete commands are put into command_queue as (request, reply);
+    the Tk thread executes them and calls reply(result dict) with the answer.
+    """
+    def __init__(self, command_queue):
+        self.command_queue = command_queue
+        self.replies = queue.Queue() # (connection, reply dict) from the Tk thread
+        self.selector = None; self.listen_sock = None; self.thread = None
+        self.address = None; self.token = None; self.running = False
+
+    def start(self):
+        """Opens the endpoint and starts the selector thread; returns False if that failed."""
+        try:
+            if use_unix_socket():
+                self.address = get_control_address()
+                if os.path.exists(self.address): os.unlink(self.address) # The single instance owns the name
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM); sock.bind(self.address); os.chmod(self.address, 0o600)
+            else:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM); sock.bind(("127.0.0.1", 0))
+                self.address = sock.getsockname(); self.token = secrets.token_hex(16)
+                with open(get_endpoint_file(), 'w', encoding='utf-8') as f: json.dump({"port": self.address[1], "token": self.token}, f)
+            sock.listen(8); sock.setblocking(False)
+        except OSError as e: print(f"Warning: Control API not available: {e}"); return False
+        self.listen_sock = sock; self.selector = selectors.DefaultSelector()
+        self.selector.register(sock, selectors.EVENT_READ, None)
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True, name="control"); self.thread.start()
+        print(f"Control API listening on {self.address}")
+        return True
+
+    def stop(self):
+        self.running = False
+        if self.thread: self.thread.join(timeout=1.0); self.thread = None
+
+    # --- Selector thread ---
+    def _serve(self):
+        try:
+            while self.running:
+                for key, mask in self.selector.select(SELECT_TIMEOUT_S):
+                    if key.data is None: self._accept(); continue
+                    if mask & selectors.EVENT_READ: self._read(key.data)
+                    if mask & selectors.EVENT_WRITE and key.data.sock.fileno() != -1: self._flush(key.data)
+                self._deliver_replies()
+        except Exception as e: print(f"Control API stopped after error: {e}")
+        finally: self._shutdown()
+
+    def _shutdown(self):
+        for key in list(self.selector.get_map().values()):
+            try: key.fileobj.close()
+            except OSError: pass
+        self.selector.close()
+        try:
+            if use_unix_socket(): os.unlink(self.address)
+            else: os.remove(get_endpoint_file())
+        except OSError: pass
+        print("Control API closed.")
+
+    def _accept(self):
+        try: sock, _peer = self.listen_sock.accept()
+        except OSError: return
+        sock.setblocking(False); conn = _Connection(sock); conn.authorized = self.token is None
+        self.selector.register(sock, selectors.EVENT_READ, conn)
+
+    def _close(self, conn):
+        try: self.selector.unregister(conn.sock)
+        except (KeyError, ValueError): pass
+        try: conn.sock.close()
+        except OSError: pass
+
+    def _read(self, conn):
+        try: data = conn.sock.recv(RECV_BYTES)
+        except BlockingIOError: return
+        except OSError: data = b""
+        if not data: self._close(conn); return
+        conn.inbox += data
+        while b"\n" in conn.inbox and conn.sock.fileno() != -1:
+            line, conn.inbox = conn.inbox.split(b"\n", 1)
+            if line.strip(): self._handle_line(conn, line)
+        if len(conn.inbox) > MAX_LINE_BYTES: self._send(conn, {"ok": False, "error": "request too large"}); conn.inbox = b""
+
+    def _handle_line(self, conn, line):
+        try:
+            request = json.loads(line.decode('utf-8'))
+            if not isinstance(request, dict): raise ValueError("request is not an object")
+        except ValueError as e: self._send(conn, {"ok": False, "error": f"invalid request: {e}"}); return
+        request_id = request.get("id")
+        def reply(result, conn=conn):
+            if request_id is not None: result = dict(result, id=request_id)
+            self.replies.put((conn, result))
+        if not conn.authorized:
+            if request.get("token") != self.token: self._send(conn, {"ok": False, "error": "invalid token"}); self._close(conn); return
+            conn.authorized = True
+        action = request.get("action")
+        if action == "push_begin":
+            conn.push = (IncrementalTokenizer(), request.get("title"), bool(request.get("append"))); reply({"ok": True}); return
+        if action == "push_chunk":
+            if conn.push is None: reply({"ok": False, "error": "push_chunk without push_begin"}); return
+            reply({"ok": True, "tokens": conn.push[0].feed(str(request.get("data", "")))}); return
+        if action in ("push_end", "push_text"):
+            if action == "push_text": tokenizer = IncrementalTokenizer(); tokenizer.feed(str(request.get("text", ""))); title = request.get("title"); append = bool(request.get("append"))
+            elif conn.push is None: reply({"ok": False, "error": "push_end without push_begin"}); return
+            else: (tokenizer, title, append), conn.push = conn.push, None
+            request = {"action": "push_text", "tokenized": tokenizer.finish(), "title": title, "append": append} # Tokenized here, not on the Tk thread
+        self.command_queue.put((request, reply))
+
+    def _send(self, conn, result):
+        if conn.sock.fileno() == -1: return
+        conn.outbox += json.dumps(result, ensure_ascii=False).encode('utf-8') + b"\n"
+        self._flush(conn)
+
+    def _flush(self, conn):
+        try: sent = conn.sock.send(conn.outbox); conn.outbox = conn.outbox[sent:]
+        except BlockingIOError: pass
+        except OSError: self._close(conn); return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbox else 0)
+        try: self.selector.modify(conn.sock, events, conn)
+        except (KeyError, ValueError): pass
+
+    def _deliver_replies(self):
+        while True:
+            try: conn, result = self.replies.get_nowait()
+            except queue.Empty: return
+            self._send(conn, result)
+
+class ControlClient:
+    """Blocking client for scripts and tests: sends one request per line and reads its reply line."""
+    def __init__(self, timeout=10.0):
+        self.token = None
+        if use_unix_socket():
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM); self.sock.settimeout(timeout); self.sock.connect(get_control_address())
+        else:
+            with open(get_endpoint_file(), encoding='utf-8') as f: endpoint = json.load(f)
+            self.token = endpoint["token"]
+            self.sock = socket.create_connection(("127.0.0.1", endpoint["port"]), timeout=timeout)
+        self.reader = self.sock.makefile('rb')
+
+    def request(self, action, **params):
+        """Sends a request and returns the reply dict (raises RuntimeError for {"ok": false})."""
+        message = dict(params, action=action)
+        if self.token: message["token"] = self.token
+        self.sock.sendall(json.dumps(message, ensure_ascii=False).encode('utf-8') + b"\n")
+        line = self.reader.readline()
+        if not line: raise ConnectionError("Control API closed the connection")
+        result = json.loads(line.decode('utf-8'))
+        if not result.get("ok"): raise RuntimeError(result.get("error", "request failed"))
+        return result
+
+    def push_text(self, text, title=None, append=False, chunk_chars=PUSH_CHUNK_CHARS):
+        """Pushes text to the reader; large texts are sent in chunks and tokenized as they arrive."""
+        if len(text) <= chunk_chars: return self.request("push_text", text=text, title=title, append=append)
+        self.request("push_begin", title=title, append=append)
+        for pos in range(0, len(text), chunk_chars): self.request("push_chunk", data=text[pos:pos + chunk_chars])
+        return self.request("push_end")
+
+    def close(self):
+        try: self.reader.close(); self.sock.close()
+        except OSError: pass
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
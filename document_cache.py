@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# Prepared document bundles (extracted text + everything precomputed per token) and the extraction cache built from them.
+# No Tk: used by the GUI and by the command line tools.
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+from array import array
+
+from config import get_appdata_path
+from utils import TokenizedText, tokenize_with_offsets, tokenize_parallel, tokens_from_offsets, compute_orp_indices, compute_structure_indices, map_headings_to_tokens
+from pacing import compute_token_weights
+
+# --- Bundle format ---
+# Header: magic, version, reserved, token count, sentence count, paragraph count, ORP position,
+#         text size (UTF-8 bytes), chapter index size, source file size, source mtime (ns)
+# Sections, each starting 4-byte aligned: UTF-8 text, uint32 token starts, uint32 token ends (character offsets),
+#   int32 ORP indices, float32 token weights, uint32 sentence starts, uint32 paragraph starts (token indices),
+#   then the chapter index as UTF-8 JSON ([[token index, level, title], ...]).
+# Loaded via mmap: the numeric arrays are memoryviews on the file (zero-copy). The text and the chapter index are
+# decoded and the token strings are sliced from the text, so opening is still linear in the document size.
+PREPARED_MAGIC = b"SRPD"; PREPARED_VERSION = 4
+HEADER_FORMAT = "<4sHHIIIfQIQQ"; HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+PREPARED_EXTENSION = ".srpd"
+CACHE_DIR_NAME = "cache"
+
+def _padded(size): return (size + 3) & ~3
+
+class PreparedDocument:
+    """
+    A tokenized document with its per-token data: ORP indices (for orp_position), complexity weights,
+    sentence and paragraph start indices, chapters (token index, level, title) and the stat of the file it was made from.
+    """
+    __slots__ = ("tokenized", "orp_indices", "orp_position", "weights", "sentence_starts", "paragraph_starts", "chapters", "source_size", "source_mtime_ns", "mm")
+    def __init__(self, tokenized, orp_indices, orp_position, weights, sentence_starts, paragraph_starts, chapters=(), source_size=0, source_mtime_ns=0, mm=None):
+        self.tokenized = tokenized; self.orp_indices = orp_indices; self.orp_position = orp_position; self.weights = weights
+        self.sentence_starts = sentence_starts; self.paragraph_starts = paragraph_starts; self.chapters = list(chapters)
+        self.source_size = source_size; self.source_mtime_ns = source_mtime_ns
+        self.mm = mm # Keeps the mapping of a loaded bundle alive as long as its arrays are in use
+
+    @property
+    def text(self): return self.tokenized.text
+
+def build_prepared_document(text, orp_position, frequency_lookup=None, headings=(), parallel=False):
+    """
+    Tokenizes a text and precomputes ORP indices, weights, the sentence/paragraph index and the chapters of the extractor's headings.
+    parallel: tokenize very large texts in worker processes (not from inside a pool worker).
+    """
+    tokenized = tokenize_parallel(text) if parallel else tokenize_with_offsets(text); tokens = tokenized.tokens
+    sentence_starts, paragraph_starts = compute_structure_indices(tokens)
+    return PreparedDocument(tokenized, compute_orp_indices(tokens, orp_position), orp_position,
+                            compute_token_weights(tokens, frequency_lookup), sentence_starts, paragraph_starts,
+                            map_headings_to_tokens(tokenized.starts, headings))
+
+def write_prepared(path, document):
+    """Writes a bundle (via a temporary file, so readers never see half a file)."""
+    tokenized = document.tokenized; count = len(tokenized.tokens); text_bytes = tokenized.text.encode('utf-8')
+    chapter_bytes = json.dumps([list(chapter) for chapter in document.chapters], ensure_ascii=False).encode('utf-8')
+    header = struct.pack(HEADER_FORMAT, PREPARED_MAGIC, PREPARED_VERSION, 0, count, len(document.sentence_starts), len(document.paragraph_starts),
+                         document.orp_position, len(text_bytes), len(chapter_bytes), document.source_size, document.source_mtime_ns)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header); f.write(text_bytes); f.write(b"\0" * (_padded(len(text_bytes)) - len(text_bytes)))
+        for typecode, values in (('I', tokenized.starts), ('I', tokenized.ends), ('i', document.orp_indices), ('f', document.weights),
+                                 ('I', document.sentence_starts), ('I', document.paragraph_starts)):
+            array(typecode, values).tofile(f)
+        f.write(chapter_bytes)
+    os.replace(temp_path, path)
+
+def open_prepared(path):
+    """
+    Maps a bundle. Arrays are zero-copy views on the file; the text is decoded and every token string is
+    sliced from it (tokens_from_offsets), which is O(n) but skips the tokenizer and the per-token computations.
+
+    Raises:
+        ValueError: Not a bundle of this version, or truncated.
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+        if size < HEADER_SIZE: raise ValueError(f"Not a prepared document: {path}")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, _reserved, count, sentence_count, paragraph_count, orp_position, text_size, chapter_size, source_size, source_mtime_ns = struct.unpack_from(HEADER_FORMAT, mm, 0)
+    if magic != PREPARED_MAGIC or version != PREPARED_VERSION: mm.close(); raise ValueError(f"Unsupported prepared document: {path}")
+    text_end = HEADER_SIZE + text_size; pos = HEADER_SIZE + _padded(text_size)
+    if size != pos + 4 * (4 * count + sentence_count + paragraph_count) + chapter_size: mm.close(); raise ValueError(f"Truncated prepared document: {path}")
+    view = memoryview(mm); sections = []
+    for typecode, length in (('I', count), ('I', count), ('i', count), ('f', count), ('I', sentence_count), ('I', paragraph_count)):
+        sections.append(view[pos:pos + 4 * length].cast(typecode)); pos += 4 * length
+    starts, ends, orp_indices, weights, sentence_starts, paragraph_starts = sections
+    text = str(view[HEADER_SIZE:text_end], 'utf-8')
+    chapters = [tuple(chapter) for chapter in json.loads(str(view[pos:pos + chapter_size], 'utf-8'))]
+    tokenized = TokenizedText(text, tokens_from_offsets(text, starts, ends), starts, ends)
+    return PreparedDocument(tokenized, orp_indices, orp_position, weights, sentence_starts, paragraph_starts, chapters, source_size, source_mtime_ns, mm)
+
+# --- Extraction cache ---
+def get_cache_dir():
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(get_appdata_path())), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def get_cache_key(filepath):
+    """Cache key of a source file: a hash of its absolute path (also used for names outside the cache)."""
+    return hashlib.sha1(os.path.normcase(os.path.abspath(filepath)).encode('utf-8')).hexdigest()[:24]
+
+def get_cache_path(filepath, stat):
+    """
+    Cache file of a source file in the version given by its stat. Each version gets its own name, so a new
+    bundle never replaces a file that an open reader still has mapped (which fails on Windows).
+    """
+    return os.path.join(get_cache_dir(), f"{get_cache_key(filepath)}-{stat.st_size:x}-{stat.st_mtime_ns:x}{PREPARED_EXTENSION}")
+
+def load_cached_document(filepath):
+    """Returns the cached PreparedDocument of a file, or None if there is none or the file changed since."""
+    try:
+        stat = os.stat(filepath); cache_path = get_cache_path(filepath, stat)
+        if not os.path.exists(cache_path): return None
+        document = open_prepared(cache_path)
+    except (OSError, ValueError) as e: print(f"Warning: Could not read cache for '{filepath}': {e}"); return None
+    if (document.source_size, document.source_mtime_ns) != (stat.st_size, stat.st_mtime_ns): return None
+    return document
+
+def store_cached_document(filepath, document):
+    """Stores a PreparedDocument made from filepath in the cache and removes older versions; returns the cache path."""
+    stat = os.stat(filepath); document.source_size = stat.st_size; document.source_mtime_ns = stat.st_mtime_ns
+    cache_path = get_cache_path(filepath, stat); write_prepared(cache_path, document)
+    prefix = get_cache_key(filepath) + "-"; cache_dir = os.path.dirname(cache_path)
+    for name in os.listdir(cache_dir):
+        if name.startswith(prefix) and name.endswith(PREPARED_EXTENSION) and name != os.path.basename(cache_path):
+            try: os.remove(os.path.join(cache_dir, name))
+            except OSError: pass # Still mapped by a reader (Windows); removed with the next version
+    return cache_path
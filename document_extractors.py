@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# DOCX and PDF extractors. Imported by the extractor registry on first use only.
+
+import re
+import zipfile
+import traceback
+import xml.etree.ElementTree as ET
+
+from extractors import ExtractionError, Heading
+from text_cleanup import clean_pdf_pages
+
+# --- Optional dependencies for DOCX and PDF ---
+try: import docx; HAS_DOCX = True
+except ImportError: HAS_DOCX = False; print("Warning: 'python-docx' not found."); print("Install with: pip install python-docx")
+try: from PyPDF2 import PdfReader; HAS_PYPDF2 = True
+except ImportError: HAS_PYPDF2 = False; print("Warning: 'PyPDF2' not found."); print("Install with: pip install PyPDF2")
+
+# --- WordprocessingML (DOCX) tags for the streaming parser ---
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P = W_NS + "p"; W_T = W_NS + "t"; W_TAB = W_NS + "tab"; W_BR = W_NS + "br"; W_CR = W_NS + "cr"
+W_PSTYLE = W_NS + "pStyle"; W_OUTLINE_LVL = W_NS + "outlineLvl"; W_VAL = W_NS + "val"
+W_STYLE = W_NS + "style"; W_STYLE_ID = W_NS + "styleId"; W_NAME = W_NS + "name"; W_BASED_ON = W_NS + "basedOn"
+# Elements whose finished children are cleared while parsing
+W_CONTAINERS = (W_NS + "body", W_NS + "hdr", W_NS + "footnotes", W_NS + "endnotes")
+DOCX_BODY_PART = "word/document.xml"
+DOCX_NOTE_PARTS = ("word/footnotes.xml", "word/endnotes.xml")
+DOCX_STYLES_PART = "word/styles.xml"
+HEADING_STYLE_NAME = re.compile(r"^heading\s*(\d)$", re.IGNORECASE) # Built-in names are English in every UI language
+MAX_OUTLINE_LEVEL = 9 # outlineLvl 9 is body text
+
+def _read_docx_heading_levels(archive):
+    """Maps paragraph style IDs to heading levels (1 = top): 'heading N'/'Title' names, outline levels, basedOn chains."""
+    styles = {}
+    with archive.open(DOCX_STYLES_PART) as part:
+        for style in ET.parse(part).getroot().iter(W_STYLE):
+            name = style.find(W_NAME); based_on = style.find(W_BASED_ON); outline = style.find(f"{W_NS}pPr/{W_OUTLINE_LVL}")
+            name = name.get(W_VAL, "") if name is not None else ""
+            match = HEADING_STYLE_NAME.match(name)
+            if match: level = int(match.group(1))
+            elif name.lower() == "title": level = 1
+            elif outline is not None and outline.get(W_VAL, "").isdigit() and int(outline.get(W_VAL)) < MAX_OUTLINE_LEVEL: level = int(outline.get(W_VAL)) + 1
+            else: level = None
+            styles[style.get(W_STYLE_ID)] = (level, based_on.get(W_VAL) if based_on is not None else None)
+    levels = {}
+    for style_id in styles:
+        level, parent = styles[style_id]; seen = {style_id}
+        while level is None and parent in styles and parent not in seen: seen.add(parent); level, parent = styles[parent]
+        if level is not None: levels[style_id] = level
+    return levels
+
+def _iter_wordml_paragraphs(xml_file, heading_levels=None):
+    """
+    Yields the paragraph texts of a WordprocessingML part in document order (tables included).
+    With heading_levels (style ID -> level), heading paragraphs are yielded as Heading.
+    Finished top-level elements are cleared behind the parser, so memory stays bounded.
+    """
+    parts = []; depth = 0; container = None; container_depth = 0; level = None
+    for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if container is None and elem.tag in W_CONTAINERS: container = elem; container_depth = depth
+            continue
+        depth -= 1; tag = elem.tag
+        if tag == W_T: parts.append(elem.text or "")
+        elif tag == W_TAB: parts.append("\t")
+        elif tag == W_BR or tag == W_CR: parts.append("\n")
+        elif tag == W_PSTYLE and heading_levels: level = heading_levels.get(elem.get(W_VAL), level)
+        elif tag == W_OUTLINE_LVL and heading_levels is not None and elem.get(W_VAL, "").isdigit() and int(elem.get(W_VAL)) < MAX_OUTLINE_LEVEL: level = int(elem.get(W_VAL)) + 1
+        elif tag == W_P:
+            text = "".join(parts).strip(); parts = []
+            if text: yield Heading(text, level) if level else text
+            level = None
+        if container is not None and depth == container_depth: container.clear() # Direct child of body/header/notes done
+
+def _iter_docx_xml_paragraphs(filepath):
+    """
+    Streams the paragraphs of a .docx straight from the zip: headers (each distinct line once),
+    then the body including tables, then footnotes and endnotes.
+    """
+    with zipfile.ZipFile(filepath) as archive:
+        names = set(archive.namelist())
+        if DOCX_BODY_PART not in names: raise KeyError(DOCX_BODY_PART)
+        seen_header_lines = set()
+        for name in sorted(n for n in names if n.startswith("word/header") and n.endswith(".xml")):
+            with archive.open(name) as part:
+                for text in _iter_wordml_paragraphs(part):
+                    if text not in seen_header_lines: seen_header_lines.add(text); yield text
+        try: heading_levels = _read_docx_heading_levels(archive) if DOCX_STYLES_PART in names else {}
+        except ET.ParseError as e: print(f"Warning: Could not read DOCX styles, no chapters: {e}"); heading_levels = {}
+        with archive.open(DOCX_BODY_PART) as part: yield from _iter_wordml_paragraphs(part, heading_levels)
+        for name in DOCX_NOTE_PARTS:
+            if name in names:
+                with archive.open(name) as part: yield from _iter_wordml_paragraphs(part)
+
+def iter_docx_paragraphs(filepath):
+    """Yields the paragraphs of a .docx file (streaming XML parser, python-docx as fallback)."""
+    emitted = 0
+    try:
+        for text in _iter_docx_xml_paragraphs(filepath): emitted += 1; yield text
+        return
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        if emitted: raise ExtractionError("DOCX Fehler", f"Fehler beim Lesen der DOCX-Datei:\n{e}")
+        print(f"Streaming DOCX parser failed ({e}), falling back to python-docx...")
+    if not HAS_DOCX: raise ExtractionError("Fehler", "'python-docx' ist nicht installiert.")
+    try: doc = docx.Document(filepath)
+    except Exception as e: print(traceback.format_exc()); raise ExtractionError("DOCX Fehler", f"Fehler beim Lesen der DOCX-Datei:\n{e}")
+    for para in doc.paragraphs:
+        match = HEADING_STYLE_NAME.match(para.style.name if para.style is not None else "")
+        yield Heading(para.text, int(match.group(1))) if match and para.text.strip() else para.text
+
+def _open_pdf(filepath):
+    if not HAS_PYPDF2: raise ExtractionError("Fehler", "'PyPDF2' ist nicht installiert.")
+    try:
+        reader = PdfReader(filepath)
+        # Check if encrypted and cannot be decrypted with empty password
+        if reader.is_encrypted:
+             try:
+                  reader.decrypt('') # Try empty password
+             except Exception as decrypt_err:
+                  print(f"PDF Decryption failed: {decrypt_err}")
+                  raise ExtractionError("PDF Fehler", "PDF ist verschlüsselt und konnte nicht geöffnet werden.")
+        pages = reader.pages
+    except ExtractionError: raise
+    except Exception as e:
+        print(traceback.format_exc())
+        raise ExtractionError("PDF Fehler", f"Fehler beim Lesen der PDF-Datei:\n{e}\n(Ist die Datei verschlüsselt?)")
+    return reader, pages
+
+def _iter_page_texts(pages):
+    """Yields the text of every page ('' for pages without text), so page numbers stay aligned."""
+    yielded = False
+    for page in pages:
+        try:
+            page_text = page.extract_text() or ""
+            if page_text: yielded = True # Count only pages where extraction was successful
+            yield page_text
+        except Exception as e_page:
+             print(f"Warning: Could not extract text from a PDF page: {e_page}")
+             yielded = True; yield "[Seite konnte nicht gelesen werden]"
+    if not yielded:
+        raise ExtractionError("PDF Inhalt", "Konnte keinen Text aus der PDF-Datei extrahieren.\nEnthält sie möglicherweise nur Bilder oder ist verschlüsselt?")
+
+def _read_pdf_outline(reader):
+    """Maps page index -> [(level, title)] from the PDF bookmarks, in outline order (empty if there are none)."""
+    page_headings = {}
+    try:
+        outline = reader.outline if hasattr(reader, "outline") else reader.outlines
+        page_number = getattr(reader, "get_destination_page_number", None) or reader.getDestinationPageNumber
+    except Exception as e: print(f"Warning: Could not read PDF outline: {e}"); return page_headings
+    pending = [iter(outline)] # One iterator per open level, walked in document order; nested lists hold the children of the entry before them
+    while pending:
+        entry = next(pending[-1], None)
+        if entry is None: pending.pop(); continue
+        if isinstance(entry, list): pending.append(iter(entry)); continue
+        try: page_idx = page_number(entry); title = str(entry.title)
+        except Exception: continue # Bookmarks without a page (external links, broken destinations)
+        if page_idx is not None and page_idx >= 0 and title.strip(): page_headings.setdefault(page_idx, []).append((len(pending), title))
+    return page_headings
+
+def iter_pdf_pages(filepath):
+    """Yields the text of each page of a .pdf file."""
+    yield from (text for text in _iter_page_texts(_open_pdf(filepath)[1]) if text)
+
+def iter_pdf_paragraphs(filepath):
+    """
+    Yields the paragraphs of a .pdf file, page by page, with headers/footers, page numbers and hyphenation cleaned up.
+    The first paragraphs of a page with bookmarks are yielded as Heading (one per bookmark, in outline order).
+    """
+    reader, pages = _open_pdf(filepath)
+    yield from clean_pdf_pages(_iter_page_texts(pages), _read_pdf_outline(reader))
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Runs extractors for untrusted document formats in a child process with a timeout and a memory cap.
+
+import os
+import time
+import multiprocessing
+
+try: import resource; HAS_RESOURCE = True # POSIX only
+except ImportError: HAS_RESOURCE = False
+
+from extractors import iter_paragraphs, extract_document, join_paragraphs, find_extractor, ExtractionError, PartialExtractionError
+from document_cache import load_cached_document
+
+# --- Constants ---
+ISOLATED_FORMATS = ("docx", "pdf")    # Extractors that run in a child process
+EXTRACTION_TIMEOUT_S = 60             # Wall-clock limit for one file
+EXTRACTION_MEMORY_LIMIT_MB = 1024     # Address space limit of the child (POSIX)
+BATCH_CHARS = 64 * 1024               # Paragraphs are sent over the pipe in batches of about this size...
+BATCH_INTERVAL_S = 0.1                # ...or when the last batch is older than this (keeps partial results fresh)
+CHILD_POLL_S = 0.25
+
+def _limit_memory(limit_mb):
+    if not HAS_RESOURCE or not limit_mb: return
+    limit_bytes = limit_mb * 1024 * 1024
+    try:
+        _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY: limit_bytes = min(limit_bytes, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, hard))
+    except (ValueError, OSError) as e: print(f"Warning: Could not set memory limit for extraction: {e}")
+
+def _extraction_child(conn, filepath, memory_limit_mb):
+    """Child process: extracts paragraphs and streams them in batches ('text', 'error', 'done' messages)."""
+    _limit_memory(memory_limit_mb)
+    batch = []; batch_chars = 0; last_send = 0.0
+    try:
+        for paragraph in iter_paragraphs(filepath):
+            batch.append(paragraph); batch_chars += len(paragraph)
+            if batch_chars >= BATCH_CHARS or time.monotonic() - last_send >= BATCH_INTERVAL_S:
+                conn.send(("text", batch)); batch = []; batch_chars = 0; last_send = time.monotonic()
+        if batch: conn.send(("text", batch))
+        conn.send(("done", None))
+    except MemoryError:
+        batch = None # Free the unsent batch before reporting
+        conn.send(("error", ("Speicherlimit", f"Die Datei benötigt mehr als {memory_limit_mb} MB Arbeitsspeicher.")))
+    except ExtractionError as e:
+        if batch: conn.send(("text", batch))
+        conn.send(("error", (e.title, e.message)))
+    except Exception as e:
+        if batch: conn.send(("text", batch))
+        conn.send(("error", ("Fehler Dateizugriff", f"Datei konnte nicht gelesen werden:\n{filepath}\n\nFehler: {e}")))
+    finally: conn.close()
+
+def _stop_child(process):
+    if process.is_alive():
+        process.terminate(); process.join(1.0)
+        if process.is_alive() and hasattr(process, "kill"): process.kill(); process.join(1.0)
+    else: process.join(0.1)
+
+def _crash_error(process):
+    process.join(0.5)
+    return ("Fehler Dateizugriff", f"Der Leseprozess wurde unerwartet beendet (Code {process.exitcode}).")
+
+def extract_document_isolated(filepath, timeout_s=EXTRACTION_TIMEOUT_S, memory_limit_mb=EXTRACTION_MEMORY_LIMIT_MB):
+    """
+    Extracts a file in a separate process, so a hanging or exploding parser cannot take down the app.
+
+    Returns:
+        tuple: (text, headings) as returned by join_paragraphs.
+
+    Raises:
+        PartialExtractionError: The child failed after some paragraphs; .text/.headings hold what was read.
+        ExtractionError: Nothing could be extracted (error, timeout, memory limit or crash).
+    """
+    context = multiprocessing.get_context("spawn") # No fork: the parent runs Tk and several threads
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_extraction_child, args=(sender, filepath, memory_limit_mb), daemon=True, name="extract")
+    process.start(); sender.close()
+    paragraphs = []; error = None; deadline = time.monotonic() + timeout_s
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: error = ("Zeitüberschreitung", f"Das Lesen der Datei dauerte länger als {timeout_s} Sekunden und wurde abgebrochen."); break
+            if not receiver.poll(min(remaining, CHILD_POLL_S)):
+                if not process.is_alive() and not receiver.poll(): error = _crash_error(process); break
+                continue
+            try: kind, payload = receiver.recv()
+            except EOFError: error = _crash_error(process); break
+            if kind == "text": paragraphs.extend(payload)
+            elif kind == "error": error = payload; break
+            else: break
+    finally:
+        receiver.close(); _stop_child(process)
+    if error is None: return join_paragraphs(paragraphs)
+    title, message = error
+    print(f"Isolated extraction of '{os.path.basename(filepath)}' failed: {message}")
+    if paragraphs: raise PartialExtractionError(title, message, *join_paragraphs(paragraphs))
+    raise ExtractionError(title, message)
+
+def extract_text_isolated(filepath, timeout_s=EXTRACTION_TIMEOUT_S, memory_limit_mb=EXTRACTION_MEMORY_LIMIT_MB):
+    """Text-only variant of extract_document_isolated."""
+    return extract_document_isolated(filepath, timeout_s, memory_limit_mb)[0]
+
+def extract_document_safe(filepath, use_cache=True):
+    """
+    Extracts a file with its chapter headings; prepared files come from the cache, formats in ISOLATED_FORMATS
+    run in a child process, the rest in-process.
+
+    Returns:
+        tuple: (text, headings) as returned by join_paragraphs.
+    """
+    cached = load_cached_document(filepath) if use_cache else None
+    if cached is not None:
+        print(f"Using prepared text of '{os.path.basename(filepath)}' from cache.")
+        return cached.text, [(cached.tokenized.starts[token_idx], level, title) for token_idx, level, title in cached.chapters]
+    if find_extractor(filepath).name in ISOLATED_FORMATS: return extract_document_isolated(filepath)
+    return extract_document(filepath)
+
+def extract_text_safe(filepath, use_cache=True):
+    """Extracts a file (see extract_document_safe) and returns only its text."""
+    return extract_document_safe(filepath, use_cache)[0]
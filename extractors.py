@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+import os
+import importlib
+import traceback
+
+from text_stream import detect_encoding, ENCODING_SAMPLE_BYTES, STREAMING_THRESHOLD_BYTES
+
+MAGIC_SAMPLE_BYTES = 512 # Bytes read from the start of a file to recognize its format
+
+class ExtractionError(Exception):
+    """Raised when a file cannot be turned into text. Carries a dialog title for the UI."""
+    def __init__(self, title, message):
+        super().__init__(message)
+        self.title = title; self.message = message
+
+class PartialExtractionError(ExtractionError):
+    """Extraction failed part-way; 'text' (and 'headings') hold everything read up to the failure."""
+    def __init__(self, title, message, text, headings=()):
+        super().__init__(title, message)
+        self.text = text; self.headings = list(headings)
+
+class Heading(str):
+    """
+    A paragraph that starts a chapter. Extractors yield it in place of a plain str, so consumers that
+    only join paragraphs are unaffected. 'title' is the chapter name (the text itself unless a PDF bookmark names it).
+    """
+    def __new__(cls, text, level=1, title=None):
+        heading = super().__new__(cls, text)
+        heading.level = level; heading.title = " ".join((title if title is not None else text).split())
+        return heading
+
+    def __reduce__(self): return (Heading, (str(self), self.level, self.title)) # Crosses the sandbox pipe
+
+# --- Extractor registry ---
+class Extractor:
+    """
+    A registered file format. 'target' is the paragraph generator, either a callable or a
+    "module:function" string that is imported on first use, so startup does not pay for it.
+    'magic' is an optional predicate on the first bytes of the file.
+    """
+    def __init__(self, name, label, extensions, target, magic=None):
+        self.name = name; self.label = label; self.extensions = tuple(extensions)
+        self.target = target; self.magic = magic
+        self._func = target if callable(target) else None
+
+    def matches_magic(self, head):
+        return self.magic is not None and bool(head) and self.magic(head)
+
+    def iter_paragraphs(self, filepath):
+        if self._func is None:
+            module_name, func_name = self.target.split(":")
+            self._func = getattr(importlib.import_module(module_name), func_name)
+        return self._func(filepath)
+
+EXTRACTORS = [] # In registration order; the first extractor whose magic matches wins
+_extractors_by_extension = {}
+
+def register_extractor(name, label, extensions, target, magic=None):
+    """Registers a format. Later registrations override earlier ones for the same extension."""
+    extractor = Extractor(name, label, extensions, target, magic)
+    EXTRACTORS.append(extractor)
+    for extension in extractor.extensions: _extractors_by_extension[extension.lower()] = extractor
+    return extractor
+
+def get_supported_extensions():
+    return tuple(_extractors_by_extension)
+
+def get_file_dialog_types():
+    """File type filters for the open dialog, derived from the registry."""
+    patterns = lambda exts: " ".join(f"*{ext}" for ext in exts)
+    return ([("Unterstützte Dateien", patterns(get_supported_extensions()))] +
+            [(e.label, patterns(e.extensions)) for e in EXTRACTORS] + [("Alle Dateien", "*.*")])
+
+def _read_head(filepath):
+    try:
+        with open(filepath, 'rb') as f: return f.read(MAGIC_SAMPLE_BYTES)
+    except OSError: return b""
+
+def find_extractor(filepath):
+    """Picks the extractor by magic bytes, then by extension; unknown files are read as plain text."""
+    head = _read_head(filepath)
+    for extractor in EXTRACTORS:
+        if extractor.matches_magic(head): return extractor
+    return _extractors_by_extension.get(os.path.splitext(filepath)[1].lower(), TEXT_EXTRACTOR)
+
+# --- Plain text (no Tk, safe to run in worker threads) ---
+def read_text_file(filepath):
+    """Reads a plain text file; the encoding is detected from a sample (BOM, UTF-8, else cp1252)."""
+    with open(filepath, 'rb') as f: data = f.read()
+    encoding, bom_length = detect_encoding(data[:ENCODING_SAMPLE_BYTES])
+    if encoding == 'utf-8' and not bom_length:
+        try: return data.decode('utf-8')
+        except UnicodeDecodeError: print("UTF-8 failed after sample, trying cp1252..."); encoding = 'cp1252'
+    return data[bom_length:].decode(encoding, errors='replace')
+
+def iter_text_paragraphs(filepath):
+    """Plain text is passed on as one piece; the tokenizer finds the paragraph breaks itself."""
+    yield read_text_file(filepath)
+
+# --- Magic byte checks ---
+def _is_pdf(head): return head.startswith(b"%PDF-")
+def _is_docx(head): return head.startswith(b"PK\x03\x04") and (b"[Content_Types].xml" in head or b"word/" in head)
+def _is_epub(head): return head.startswith(b"PK\x03\x04") and head[30:58] == b"mimetypeapplication/epub+zip"
+def _is_rtf(head): return head.startswith(b"{\\rtf")
+def _is_html(head):
+    start = head.lstrip(b"\xef\xbb\xbf \t\r\n")[:15].lower()
+    return start.startswith(b"<!doctype html") or start.startswith(b"<html")
+
+TEXT_EXTRACTOR = register_extractor("text", "Textdateien", (".txt",), iter_text_paragraphs)
+register_extractor("docx", "Word-Dokumente", (".docx",), "document_extractors:iter_docx_paragraphs", _is_docx)
+register_extractor("pdf", "PDF-Dateien", (".pdf",), "document_extractors:iter_pdf_paragraphs", _is_pdf)
+register_extractor("epub", "E-Books (EPUB)", (".epub",), "markup_extractors:iter_epub_paragraphs", _is_epub)
+register_extractor("html", "Webseiten", (".html", ".htm", ".xhtml"), "markup_extractors:iter_html_paragraphs", _is_html)
+register_extractor("markdown", "Markdown", (".md", ".markdown"), "markup_extractors:iter_markdown_paragraphs")
+register_extractor("rtf", "RTF-Dokumente", (".rtf",), "markup_extractors:iter_rtf_paragraphs", _is_rtf)
+SUPPORTED_EXTENSIONS = get_supported_extensions()
+
+# --- Public API ---
+def iter_paragraphs(filepath):
+    """
+    Yields the paragraphs of a file as they are extracted, using the registered extractor.
+
+    Raises:
+        ExtractionError: With a user-facing title and message.
+    """
+    extractor = find_extractor(filepath)
+    print(f"Extracting '{os.path.basename(filepath)}' as {extractor.name}...")
+    try: yield from extractor.iter_paragraphs(filepath)
+    except (ExtractionError, MemoryError): raise
+    except Exception as e: print(traceback.format_exc()); raise ExtractionError("Fehler Dateizugriff", f"Datei konnte nicht gelesen werden:\n{filepath}\n\nFehler: {e}")
+
+def join_paragraphs(paragraphs):
+    """
+    Joins paragraphs with a blank line and records where the Heading paragraphs start.
+
+    Returns:
+        tuple: (text, headings) with headings as (character offset, level, title) in text order.
+    """
+    parts = []; headings = []; offset = 0
+    for paragraph in paragraphs:
+        if parts: offset += 2
+        if isinstance(paragraph, Heading): headings.append((offset, paragraph.level, paragraph.title))
+        parts.append(paragraph); offset += len(paragraph)
+    return '\n\n'.join(parts), headings
+
+def extract_document(filepath):
+    """
+    Like extract_text, plus the chapter headings the extractor found (PDF bookmarks, DOCX/Markdown headings).
+
+    Returns:
+        tuple: (text, headings) as returned by join_paragraphs.
+    """
+    return join_paragraphs(iter_paragraphs(filepath))
+
+def extract_text(filepath):
+    """
+    Extracts the text of a file; paragraphs are joined with a blank line, which the tokenizer turns into paragraph pauses.
+
+    Raises:
+        ExtractionError: With a user-facing title and message.
+    """
+    return '\n\n'.join(iter_paragraphs(filepath))
+
+def is_streamable_text_file(filepath):
+    """True for plain text files large enough to be read through a StreamingTextSource."""
+    try: return find_extractor(filepath) is TEXT_EXTRACTOR and os.path.getsize(filepath) > STREAMING_THRESHOLD_BYTES
+    except OSError: return False
+
+def list_supported_files(folder):
+    """Returns the supported files of a folder (not recursive), sorted by name."""
+    return sorted((os.path.join(folder, name) for name in os.listdir(folder)
+                   if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS and os.path.isfile(os.path.join(folder, name))),
+                  key=lambda path: os.path.basename(path).lower())
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+import tkinter as tk
+from tkinter import font
+from collections import OrderedDict
+
+# --- Constants ---
+MAX_CACHED_FONTS = 32 # Upper bound for cached Font objects (least recently used are evicted)
+CHAR_WIDTH_SAMPLE = "Der schnelle braune Fuchs springt über den faulen Hund. The quick brown fox jumps over the lazy dog, 1234."
+
+# --- Process-wide font registry ---
+_font_cache = OrderedDict() # (family, size, weight) -> font.Font
+_font_families = None       # Sorted tuple of font families, loaded once
+_char_widths = {}           # font name -> average character width in pixels
+
+def get_font(family, size, weight="normal"):
+    """
+    Returns a cached font.Font for (family, size, weight), creating it on first use.
+
+    Raises:
+        tk.TclError: If Tk cannot create the font (e.g. no root window).
+    """
+    key = (family, int(size), weight)
+    cached_font = _font_cache.get(key)
+    if cached_font is not None:
+        _font_cache.move_to_end(key)
+        return cached_font
+    new_font = font.Font(family=family, size=int(size), weight=weight)
+    _font_cache[key] = new_font
+    # Evict least recently used fonts; widgets still using them keep their own reference
+    while len(_font_cache) > MAX_CACHED_FONTS: _font_cache.popitem(last=False)
+    return new_font
+
+def get_average_char_width(font_obj):
+    """Average pixel width of a character of running text in this font, measured once per font."""
+    key = str(font_obj)
+    width = _char_widths.get(key)
+    if width is None:
+        width = max(1.0, font_obj.measure(CHAR_WIDTH_SAMPLE) / len(CHAR_WIDTH_SAMPLE))
+        _char_widths[key] = width
+    return width
+
+def get_font_families():
+    """Returns the sorted font family list, loading it on first use if the warm-up has not run yet."""
+    global _font_families
+    if _font_families is None:
+        try: _font_families = tuple(sorted(font.families()))
+        except tk.TclError as e: print(f"Error loading font families: {e}"); return ()
+    return _font_families
+
+def warm_up_font_families(widget):
+    """Schedules loading of the font family list when Tk is idle, so the settings window opens instantly."""
+    if _font_families is not None: return
+    try: widget.after_idle(get_font_families)
+    except tk.TclError as e: print(f"Could not schedule font warm-up: {e}")
+
+def clear_font_cache():
+    """Drops all cached fonts (e.g. before the Tk root is destroyed)."""
+    global _font_families
+    _font_cache.clear(); _char_widths.clear(); _font_families = None
@@ -1,107 +1,68 @@
 # -*- coding: utf-8 -*-
 
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import threading
-import time
-import json
-import os
 import sys
-import traceback # For detailed error messages
-import webbrowser # Für das Öffnen von Links
+import multiprocessing
+
+# --- Single instance: a second launch forwards its request before Tk, PIL etc. are imported ---
+if __name__ == "__main__":
+    multiprocessing.freeze_support() # Extraction child processes in the frozen executable (must not reach the handoff)
+    from single_instance import InstanceServer, build_launch_request, send_to_running_instance
+    LAUNCH_REQUEST = build_launch_request(sys.argv[1:])
+    if send_to_running_instance(LAUNCH_REQUEST): print("Request forwarded to the running instance."); sys.exit(0)
 
 # --- App Konstanten ---
 APP_VERSION = "1.1" # Versionsnummer definieren
 GITHUB_REPO_URL = "https://github.com/leofleischmann/Windows-Speed-Reader-RSVP"
-
-# --- Dependency Imports ---
-try: from pynput import keyboard; HAS_PYNPUT = True
-except ImportError: HAS_PYNPUT = False; print("FATAL ERROR: 'pynput' not found."); # sys.exit("pynput required.")
-try: import pyperclip; HAS_PYPERCLIP = True
-except ImportError: HAS_PYPERCLIP = False; print("Warning: 'pyperclip' not found.")
-try: import pystray; from PIL import Image; HAS_PYSTRAY = True
-except ImportError: HAS_PYSTRAY = False; # Pillow check in utils
-
-# --- Imports für DOCX und PDF ---
-try: import docx; HAS_DOCX = True
-except ImportError: HAS_DOCX = False; print("Warning: 'python-docx' not found."); print("Install with: pip install python-docx")
-try: from PyPDF2 import PdfReader; HAS_PYPDF2 = True
-except ImportError: HAS_PYPDF2 = False; print("Warning: 'PyPDF2' not found."); print("Install with: pip install PyPDF2")
-
-# --- NEU: Import für PID Check ---
-try:
-    import psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
-    print("Warning: 'psutil' not found. Stale lock file detection might not work.")
-    print("Install with: pip install psutil")
-# --- Ende NEU ---
-
-
-# --- Local Module Imports ---
-try:
-    from config import ConfigManager, DEFAULT_SETTINGS
-    from utils import create_default_icon, DEFAULT_ICON_NAME, HAS_PILLOW, preprocess_text
-    from system_utils import resource_path
-    # Import startup functions if on Windows
-    if sys.platform == 'win32':
-         from system_utils import add_to_startup, remove_from_startup, is_in_startup
-    else:
-         # Dummy functions on separate indented lines
-         def add_to_startup(p): return False
-         def remove_from_startup(): return False
-         def is_in_startup(): return False
-    from settings_window import SettingsWindow
-    from reading_window import ReadingWindow
-except ImportError as e:
-     print(f"FATAL ERROR: Could not import local modules: {e}")
-     # Use default tk for error message if ttk fails
-     root_err = tk.Tk(); root_err.withdraw(); messagebox.showerror("Import Fehler", f"Modulimport fehlgeschlagen: {e}"); root_err.destroy(); sys.exit(f"Import Error: {e}")
-
-
-# --- Helper functions for text extraction ---
-def extract_text_from_docx(filepath):
-    """Extracts text from a .docx file."""
-    if not HAS_DOCX: messagebox.showerror("Fehler", "'python-docx' ist nicht installiert."); return None
+READING_QUEUE_POLL_MS = 100 # Poll interval for background file extraction results
+COMMAND_POLL_MS = 50 # Poll interval for commands from other processes (instance handoff, control API)
+
+# --- App imports: spawned extraction children re-import this file as __mp_main__ and skip Tk, pynput, pystray/PIL and the windows ---
+if __name__ != "__mp_main__":
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog
+    import threading
+    import queue
+    import time
+    import json
+    import os
+    import traceback # For detailed error messages
+    import webbrowser # Für das Öffnen von Links
+
+    # --- Dependency Imports ---
+    try: from pynput import keyboard; HAS_PYNPUT = True
+    except ImportError: HAS_PYNPUT = False; print("FATAL ERROR: 'pynput' not found."); # sys.exit("pynput required.")
+    try: import pyperclip; HAS_PYPERCLIP = True
+    except ImportError: HAS_PYPERCLIP = False; print("Warning: 'pyperclip' not found.")
+    try: import pystray; from PIL import Image; HAS_PYSTRAY = True
+    except ImportError: HAS_PYSTRAY = False; # Pillow check in utils
+
+    # --- Local Module Imports ---
     try:
-        doc = docx.Document(filepath); full_text = [para.text for para in doc.paragraphs]
-        return '\n\n'.join(full_text) # Join paragraphs with double newline
-    except Exception as e: messagebox.showerror("DOCX Fehler", f"Fehler beim Lesen der DOCX-Datei:\n{e}"); print(traceback.format_exc()); return None
-
-def extract_text_from_pdf(filepath):
-    """Extracts text from a .pdf file."""
-    if not HAS_PYPDF2: messagebox.showerror("Fehler", "'PyPDF2' ist nicht installiert."); return None
-    try:
-        full_text = []; reader = PdfReader(filepath)
-        # Check if encrypted and cannot be decrypted with empty password
-        if reader.is_encrypted:
-             try:
-                  reader.decrypt('') # Try empty password
-             except Exception as decrypt_err:
-                  print(f"PDF Decryption failed: {decrypt_err}")
-                  messagebox.showerror("PDF Fehler", "PDF ist verschlüsselt und konnte nicht geöffnet werden.")
-                  return None
-
-        for page in reader.pages:
-            try:
-                page_text = page.extract_text()
-                if page_text: # Add text only if extraction was successful
-                     full_text.append(page_text)
-            except Exception as e_page:
-                 print(f"Warning: Could not extract text from a PDF page: {e_page}")
-                 # Optionally add a placeholder or skip the page
-                 full_text.append("[Seite konnte nicht gelesen werden]")
-        if not full_text:
-             messagebox.showwarning("PDF Inhalt", "Konnte keinen Text aus der PDF-Datei extrahieren.\nEnthält sie möglicherweise nur Bilder oder ist verschlüsselt?")
-             return None
-        # Join pages with double newline to simulate paragraphs between pages
-        return '\n\n'.join(full_text)
-    except Exception as e:
-        messagebox.showerror("PDF Fehler", f"Fehler beim Lesen der PDF-Datei:\n{e}\n(Ist die Datei verschlüsselt?)")
-        print(traceback.format_exc())
-        return None
-# --- Ende Helper functions ---
+        from config import ConfigManager, DEFAULT_SETTINGS
+        from utils import create_default_icon, DEFAULT_ICON_NAME, HAS_PILLOW
+        from system_utils import resource_path
+        from font_registry import warm_up_font_families, clear_font_cache
+        from extractors import ExtractionError, PartialExtractionError, list_supported_files, get_file_dialog_types, is_streamable_text_file, find_extractor, SUPPORTED_EXTENSIONS
+        from reading_queue import ReadingQueue
+        from extraction_sandbox import extract_document_safe, ISOLATED_FORMATS
+        from text_stream import StreamingTextSource
+        from control_api import ControlServer
+        from document_cache import load_cached_document, build_prepared_document, store_cached_document
+        from word_frequency import get_frequency_lookup
+        # Import startup functions if on Windows
+        if sys.platform == 'win32':
+             from system_utils import add_to_startup, remove_from_startup, is_in_startup
+        else:
+             # Dummy functions on separate indented lines
+             def add_to_startup(p): return False
+             def remove_from_startup(): return False
+             def is_in_startup(): return False
+        from settings_window import SettingsWindow
+        from reading_window import ReadingWindow
+    except ImportError as e:
+         print(f"FATAL ERROR: Could not import local modules: {e}")
+         # Use default tk for error message if ttk fails
+         root_err = tk.Tk(); root_err.withdraw(); messagebox.showerror("Import Fehler", f"Modulimport fehlgeschlagen: {e}"); root_err.destroy(); sys.exit(f"Import Error: {e}")
 
 
 # --- Main Application Class ---
@@ -113,7 +74,10 @@ class SpeedReaderApp:
         self.hotkey_listener = None; self.listener_thread = None
         self.reading_window_instance = None; self.settings_window_instance = None
         self.tray_icon = None; self.tray_thread = None
+        self.reading_queue = None; self.reading_queue_job = None; self.reading_queue_errors = []; self.reading_queue_started = False
         self.is_shutting_down = False # Flag to prevent double quit
+        self.command_queue = queue.Queue() # (request, reply or None) from the instance endpoint and the control API threads
+        self.command_job = None; self.control_server = None
 
         if self.hide_main_window_flag:
             print("Hiding main window."); self.root.withdraw(); self.status_label = None; self.menu_bar = None
@@ -122,6 +86,7 @@ class SpeedReaderApp:
             self.menu_bar = tk.Menu(root); root.config(menu=self.menu_bar)
             file_menu = tk.Menu(self.menu_bar, tearoff=0); self.menu_bar.add_cascade(label="Datei", menu=file_menu)
             file_menu.add_command(label="Datei lesen...", command=self.read_from_file)
+            file_menu.add_command(label="Ordner lesen...", command=self.read_from_folder)
             cb_state = "normal" if HAS_PYPERCLIP else "disabled"; file_menu.add_command(label="Aus Zwischenablage lesen", command=self.read_from_clipboard, state=cb_state)
             file_menu.add_separator(); file_menu.add_command(label="Beenden", command=self.quit_app)
             settings_menu = tk.Menu(self.menu_bar, tearoff=0); self.menu_bar.add_cascade(label="Optionen", menu=settings_menu)
@@ -143,6 +108,8 @@ class SpeedReaderApp:
              self.update_status_label(f"Tray deaktiviert: {msg}")
 
         self.update_status_label()
+        self.update_control_server(); self._poll_command_queue()
+        warm_up_font_families(self.root) # Load font list in idle time, not when settings open
 
     def update_status_label(self, message=None):
         # Updates status label only if it exists and window is valid
@@ -181,6 +148,7 @@ class SpeedReaderApp:
             menu_items.append(pystray.MenuItem('Lesen aus Zwischenablage', self.on_tray_read_clipboard, enabled=cb_state))
             menu_items.extend([
                 pystray.MenuItem('Datei lesen...', self.on_tray_read_file),
+                pystray.MenuItem('Ordner lesen...', self.on_tray_read_folder),
                 pystray.MenuItem('Einstellungen...', self.on_tray_open_settings),
                 pystray.Menu.SEPARATOR,
                 pystray.MenuItem('Infobereich', info_submenu),
@@ -229,6 +197,11 @@ class SpeedReaderApp:
         print("Tray action: Read file")
         self.root.after(0, self.read_from_file)
 
+    def on_tray_read_folder(self, icon=None, item=None):
+        """Callback for tray menu: Read all files of a folder."""
+        print("Tray action: Read folder")
+        self.root.after(0, self.read_from_folder)
+
     def on_tray_open_settings(self, icon=None, item=None):
         """Callback for tray menu: Open settings."""
         print("Tray action: Open settings")
@@ -290,6 +263,7 @@ class SpeedReaderApp:
         def settings_closed_callback():
             print("Settings window closed."); self.settings_window_instance = None; print("Restarting hotkey listener...");
             if HAS_PYNPUT: self.start_hotkey_listener()
+            self.update_control_server()
             if self.reading_window_instance and self.reading_window_instance.winfo_exists(): print("Applying settings to reading window..."); self.reading_window_instance.update_display_settings()
             # Update tray menu in case hotkey changed
             if self.tray_icon: print("Updating tray icon menu..."); self.setup_tray_icon()
@@ -305,10 +279,11 @@ class SpeedReaderApp:
         finally:
             if root_was_hidden: print("Re-withdrawing root..."); self.root.withdraw()
 
-    def _initiate_reading(self, text):
-        """Helper function to create and start the reading window."""
+    def _initiate_reading(self, text, title=None, stream_source=None, headings=None, source_path=None):
+        """Helper function to create and start the reading window (from text or a StreamingTextSource); source_path enables resuming."""
         parent_window = self.root
-        if not text: messagebox.showwarning("Kein Text", "Kein Text zum Lesen bereitgestellt.", parent=parent_window); return
+        if not text and stream_source is None: messagebox.showwarning("Kein Text", "Kein Text zum Lesen bereitgestellt.", parent=parent_window); return
+        self.cancel_reading_queue()
         if self.reading_window_instance and self.reading_window_instance.winfo_exists(): print("Closing existing reading window."); self.reading_window_instance.close_window(); self.reading_window_instance = None
         print("Initiating new reading window...")
         root_was_hidden_read = False
@@ -318,7 +293,9 @@ class SpeedReaderApp:
             self.root.update_idletasks()
             if self.reading_window_instance.winfo_exists():
                  self.reading_window_instance.deiconify(); self.reading_window_instance.lift()
-                 self.reading_window_instance.start_reading(text); print("ReadingWindow instance created and reading started.")
+                 if stream_source is not None: self.reading_window_instance.start_reading_stream(stream_source, title)
+                 else: self.reading_window_instance.start_reading(text, title, headings, source_path)
+                 print("ReadingWindow instance created and reading started.")
             else: print("Reading window instance invalid after creation."); self.reading_window_instance = None
         except Exception as e: print("!!! Error creating/starting ReadingWindow !!!"); traceback.print_exc(); messagebox.showerror("Fenster Fehler", f"Lesefenster konnte nicht erstellt/gestartet werden:\n{e}"); self.reading_window_instance = None
         finally:
@@ -340,38 +317,173 @@ class SpeedReaderApp:
             print(error_msg); traceback.print_exc(); messagebox.showerror("Fehler", error_msg)
 
     def read_from_file(self):
-        """Opens file dialog, reads text from txt, docx, pdf and starts reading."""
+        """Opens file dialog (multi-selection), reads text from any registered format and starts reading."""
         print("Opening file dialog...")
-        filepath = None; root_visible = self.root.state() != 'withdrawn'
+        filepaths = (); root_visible = self.root.state() != 'withdrawn'
         parent = self.root if root_visible else None
-        supported_filetypes = [ ("Unterstützte Dateien", "*.txt *.docx *.pdf"), ("Textdateien", "*.txt"), ("Word-Dokumente", "*.docx"), ("PDF-Dateien", "*.pdf"), ("Alle Dateien", "*.*") ]
-        try: filepath = filedialog.askopenfilename(title="Datei öffnen", filetypes=supported_filetypes, parent=parent)
+        supported_filetypes = get_file_dialog_types()
+        try: filepaths = filedialog.askopenfilenames(title="Datei(en) öffnen", filetypes=supported_filetypes, parent=parent)
         except tk.TclError as e:
              print(f"TclError opening file dialog: {e}");
-             try: filepath = filedialog.askopenfilename(title="Datei öffnen", filetypes=supported_filetypes)
+             try: filepaths = filedialog.askopenfilenames(title="Datei(en) öffnen", filetypes=supported_filetypes)
              except Exception as e_fallback: print(f"Error opening file dialog w/o parent: {e_fallback}"); messagebox.showerror("Dialog Fehler", f"Dateidialog Fehler:\n{e_fallback}"); return
-        if not filepath: print("File selection cancelled."); return
+        if not filepaths: print("File selection cancelled."); return
+        if len(filepaths) > 1: self.read_files(filepaths); return
+        self.read_file(filepaths[0])
 
+    def read_file(self, filepath):
+        """Reads a single file (streamed if it is a huge text file, else extracted) and starts reading."""
         print(f"Reading from file: {filepath}")
-        text = None
-        try:
-            file_ext = os.path.splitext(filepath)[1].lower()
-            if file_ext == ".txt":
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f: text = f.read()
-                except UnicodeDecodeError: print("UTF-8 failed, trying default encoding...");
-                with open(filepath, 'r', encoding=sys.getdefaultencoding()) as f: text = f.read()
-            elif file_ext == ".docx": text = extract_text_from_docx(filepath)
-            elif file_ext == ".pdf": text = extract_text_from_pdf(filepath)
-            else:
-                 messagebox.showwarning("Unbekannter Dateityp", f"Dateityp '{file_ext}' nicht direkt unterstützt. Versuch als Text...")
-                 try:
-                      with open(filepath, 'r', encoding='utf-8') as f: text = f.read()
-                 except UnicodeDecodeError:
-                      with open(filepath, 'r', encoding=sys.getdefaultencoding()) as f: text = f.read()
-                 except Exception: messagebox.showerror("Fehler", "Konnte Datei auch nicht als Text lesen."); return
-            if text is not None: self._initiate_reading(text)
-        except Exception as e: error_msg = f"Datei konnte nicht gelesen werden:\n{filepath}\n\nFehler: {e}"; print(error_msg); traceback.print_exc(); messagebox.showerror("Fehler Dateizugriff", error_msg)
+        prepared = load_cached_document(filepath)
+        if prepared is not None: print("Opening prepared bundle from cache."); self._initiate_reading(prepared, os.path.basename(filepath), source_path=filepath); return
+        file_ext = os.path.splitext(filepath)[1].lower()
+        if file_ext not in SUPPORTED_EXTENSIONS: messagebox.showwarning("Unbekannter Dateityp", f"Dateityp '{file_ext}' nicht direkt unterstützt. Versuch als Text...")
+        if is_streamable_text_file(filepath):
+            try: source = StreamingTextSource(filepath)
+            except (OSError, ValueError) as e: messagebox.showerror("Fehler Dateizugriff", f"Datei konnte nicht gelesen werden:\n{filepath}\n\nFehler: {e}"); return
+            self._initiate_reading(None, os.path.basename(filepath), stream_source=source); return
+        try: text, headings = extract_document_safe(filepath)
+        except PartialExtractionError as e:
+            print(e.message); messagebox.showwarning(e.title, f"{e.message}\n\nDer bis dahin gelesene Teil wird angezeigt."); text = e.text; headings = e.headings
+        except ExtractionError as e: print(e.message); messagebox.showerror(e.title, e.message); return
+        else:
+            if find_extractor(filepath).name in ISOLATED_FORMATS: self._cache_prepared_async(filepath, text, headings)
+        if text is not None: self._initiate_reading(text, os.path.basename(filepath), headings=headings, source_path=filepath)
+
+    def _cache_prepared_async(self, filepath, text, headings=()):
+        """Builds the bundle of an expensively extracted file in the background, so the next open maps it instead."""
+        orp_position = self.config.get("orp_position")
+        def worker():
+            try: print(f"Cached prepared bundle: {store_cached_document(filepath, build_prepared_document(text, orp_position, get_frequency_lookup(), headings))}")
+            except (OSError, ValueError) as e: print(f"Warning: Could not cache '{filepath}': {e}")
+        threading.Thread(target=worker, daemon=True, name="cache").start()
+
+    # --- Commands from other processes ---
+    def update_control_server(self):
+        """Starts or stops the local control API according to the settings."""
+        enabled = self.config.get("control_api") and not self.is_shutting_down
+        if enabled and self.control_server is None:
+            server = ControlServer(self.command_queue)
+            if server.start(): self.control_server = server
+        elif not enabled and self.control_server is not None: self.control_server.stop(); self.control_server = None
+
+    def _poll_command_queue(self):
+        """Executes queued commands on the Tk thread and hands the results back to the requesting thread."""
+        self.command_job = None
+        while not self.is_shutting_down:
+            try: request, reply = self.command_queue.get_nowait()
+            except queue.Empty: break
+            try: result = self.handle_command(request)
+            except Exception as e: print(f"Error executing command {request.get('action')}: {e}"); traceback.print_exc(); result = {"ok": False, "error": str(e)}
+            if reply is not None: reply(result)
+        if not self.is_shutting_down: self.command_job = self.root.after(COMMAND_POLL_MS, self._poll_command_queue)
+
+    def _get_active_reader(self):
+        if self.reading_window_instance and self.reading_window_instance.winfo_exists(): return self.reading_window_instance
+        return None
+
+    def handle_command(self, request):
+        """
+        Executes a command: forwarded by a later launch, from our own command line or from the control API.
+        Runs on the Tk thread.
+
+        Returns:
+            dict: Reply for the control API ({"ok": bool, ...}).
+        """
+        if self.is_shutting_down: return {"ok": False, "error": "shutting down"}
+        action = request.get("action"); print(f"Command: {action}")
+        reader = self._get_active_reader()
+        if action in ("pause", "resume", "seek") and reader is None: return {"ok": False, "error": "no text is being read"}
+        if action == "push_text":
+            tokenized = request.get("tokenized"); title = request.get("title") or "Text"
+            if tokenized is None or not tokenized.tokens: return {"ok": False, "error": "no words in text"}
+            if request.get("append") and reader is not None and reader.append_text(tokenized, title): return {"ok": True, "tokens": len(tokenized.tokens), "appended": True}
+            self._initiate_reading(tokenized, title)
+            return {"ok": self._get_active_reader() is not None, "tokens": len(tokenized.tokens)}
+        if action == "pause": reader.pause()
+        elif action == "resume": reader.resume()
+        elif action == "seek":
+            try: reader.seek_to_word(int(request.get("word", 0)))
+            except (TypeError, ValueError): return {"ok": False, "error": "'word' must be a number"}
+        elif action == "set_wpm":
+            try: wpm = int(request.get("wpm"))
+            except (TypeError, ValueError): return {"ok": False, "error": "'wpm' must be a number"}
+            if reader is not None: reader.set_speed(wpm)
+            else: self.config.set("wpm", max(10, wpm))
+        elif action == "status":
+            if reader is None: return {"ok": True, "state": "idle", "wpm": self.config.get("wpm")}
+        elif action == "read_clipboard": self.read_from_clipboard()
+        elif action == "read_files":
+            filepaths = []
+            for path in request.get("paths") or []:
+                if not isinstance(path, str): continue
+                if os.path.isdir(path):
+                    try: filepaths.extend(list_supported_files(path))
+                    except OSError as e: print(f"Could not list folder {path}: {e}")
+                elif os.path.isfile(path): filepaths.append(path)
+                else: print(f"File not found: {path}")
+            if not filepaths: messagebox.showwarning("Keine Dateien", "Keine lesbaren Dateien übergeben."); return {"ok": False, "error": "no readable files"}
+            if len(filepaths) == 1: self.read_file(filepaths[0])
+            else: self.read_files(filepaths)
+        elif action == "activate":
+            if self.reading_window_instance and self.reading_window_instance.winfo_exists(): self.reading_window_instance.lift(); self.reading_window_instance.focus_force()
+            elif not self.hide_main_window_flag: self.root.deiconify(); self.root.lift()
+            elif self.tray_icon:
+                try: self.tray_icon.notify("Speed Reader läuft bereits im Infobereich.", "Speed Reader")
+                except Exception as e_notify: print(f"Could not send tray notification: {e_notify}")
+        else: print(f"Unknown command: {action}"); return {"ok": False, "error": f"unknown action: {action}"}
+        reader = self._get_active_reader()
+        return dict(reader.get_status(), ok=True) if reader is not None else {"ok": True}
+
+    def read_from_folder(self):
+        """Opens a folder dialog and reads all supported files of the folder back-to-back."""
+        root_visible = self.root.state() != 'withdrawn'; parent = self.root if root_visible else None
+        try: folder = filedialog.askdirectory(title="Ordner öffnen", parent=parent)
+        except tk.TclError as e: print(f"Error opening folder dialog: {e}"); messagebox.showerror("Dialog Fehler", f"Ordnerdialog Fehler:\n{e}"); return
+        if not folder: print("Folder selection cancelled."); return
+        try: filepaths = list_supported_files(folder)
+        except OSError as e: messagebox.showerror("Fehler Dateizugriff", f"Ordner konnte nicht gelesen werden:\n{folder}\n\nFehler: {e}"); return
+        if not filepaths: messagebox.showinfo("Keine Dateien", f"Keine unterstützten Dateien ({', '.join(SUPPORTED_EXTENSIONS)}) im Ordner gefunden."); return
+        self.read_files(filepaths)
+
+    def read_files(self, filepaths):
+        """Extracts several files in a bounded worker pool and reads them in one session, in order."""
+        self.cancel_reading_queue()
+        print(f"Queueing {len(filepaths)} files for reading...")
+        self.reading_queue = ReadingQueue(filepaths); self.reading_queue_errors = []
+        self.reading_queue_started = False
+        self._poll_reading_queue()
+
+    def _poll_reading_queue(self):
+        """Moves finished extractions (in order) into the reading window; runs on the Tk thread."""
+        self.reading_queue_job = None
+        queue = self.reading_queue
+        if queue is None: return
+        for file_index, filepath, text, headings, error in queue.poll():
+            title = ReadingQueue.title_for(filepath)
+            if error is not None:
+                print(f"{'Partially read' if text else 'Skipping'} '{title}': {error.message}")
+                self.reading_queue_errors.append(f"{title} (unvollständig)" if text else title)
+                if not text: continue
+            if not self.reading_queue_started:
+                self._initiate_reading_from_queue(text, title, headings)
+            elif self.reading_window_instance and self.reading_window_instance.winfo_exists():
+                self.reading_window_instance.append_text(text, title, headings)
+            else: print("Reading window closed, cancelling queue."); self.cancel_reading_queue(); return
+        if queue.is_done():
+            self.reading_queue = None
+            if self.reading_queue_errors: messagebox.showwarning("Dateien übersprungen", "Folgende Dateien konnten nicht (vollständig) gelesen werden:\n" + "\n".join(self.reading_queue_errors))
+            return
+        self.reading_queue_job = self.root.after(READING_QUEUE_POLL_MS, self._poll_reading_queue)
+
+    def _initiate_reading_from_queue(self, text, title, headings=None):
+        queue = self.reading_queue; self.reading_queue = None # Keep the queue alive across _initiate_reading
+        self._initiate_reading(text, title, headings=headings)
+        self.reading_queue = queue; self.reading_queue_started = self.reading_window_instance is not None
+
+    def cancel_reading_queue(self):
+        if self.reading_queue_job: self.root.after_cancel(self.reading_queue_job); self.reading_queue_job = None
+        if self.reading_queue: self.reading_queue.cancel(); self.reading_queue = None
 
     def quit_app(self):
         """Cleans up resources and closes the application."""
@@ -380,6 +492,9 @@ class SpeedReaderApp:
         print("Quit requested. Cleaning up...")
 
         self.stop_hotkey_listener()
+        self.cancel_reading_queue()
+        if self.command_job: self.root.after_cancel(self.command_job); self.command_job = None
+        if self.control_server: self.control_server.stop(); self.control_server = None
         if self.tray_icon: print("Stopping tray icon..."); self.tray_icon.stop()
         if self.tray_thread and self.tray_thread.is_alive(): print("Waiting for tray thread..."); self.tray_thread.join(timeout=0.5)
 
@@ -392,9 +507,9 @@ class SpeedReaderApp:
              except tk.TclError:
                   pass # Ignore error if already destroyed
         if self.reading_window_instance and self.reading_window_instance.winfo_exists():
-             print("Destroying reading window...")
+             print("Closing reading window...")
              try:
-                  self.reading_window_instance.destroy()
+                  self.reading_window_instance.close_window() # Also remembers the reading position
              except tk.TclError:
                   pass # Ignore error if already destroyed
         if self.root.winfo_exists():
@@ -407,6 +522,7 @@ class SpeedReaderApp:
                        except tk.TclError:
                             pass # Ignore error if already destroyed
 
+        clear_font_cache()
         print("Destroying Tkinter root...")
         try:
             if self.root.winfo_exists(): self.root.destroy(); print("Tkinter root destroyed.")
@@ -416,38 +532,11 @@ class SpeedReaderApp:
 
 # --- Application Entry Point ---
 if __name__ == "__main__":
-    # --- Robust Lock File Handling with PID ---
-    lock_file_path = os.path.join(os.getenv('TEMP', os.getenv('TMP', '/tmp')), 'speedreader_instance.lock')
-    lock_file_handle = None; current_pid = os.getpid(); app_already_running = False
-    try:
-        lock_file_handle = os.open(lock_file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        try: os.write(lock_file_handle, str(current_pid).encode()); print(f"Lock file created: {lock_file_path} with PID: {current_pid}")
-        except OSError as e_write: print(f"Warning: Could not write PID to lock file: {e_write}")
-    except FileExistsError:
-        print(f"Lock file {lock_file_path} exists. Checking PID...")
-        old_pid = None
-        try:
-            with open(lock_file_path, 'r') as f_lock: pid_str = f_lock.read().strip();
-            if pid_str: old_pid = int(pid_str)
-        except (IOError, ValueError) as e_read: print(f"Warning: Could not read PID from lock file: {e_read}. Assuming stale.")
-        if old_pid is not None and HAS_PSUTIL:
-            try:
-                if psutil.pid_exists(old_pid):
-                    try:
-                         proc = psutil.Process(old_pid)
-                         if 'python' in proc.name().lower() or 'speedreader' in proc.name().lower(): print(f"Another instance is running (PID {old_pid} exists). Exiting."); app_already_running = True
-                         else: print(f"PID {old_pid} exists but not SpeedReader. Assuming stale."); old_pid = None
-                    except (psutil.NoSuchProcess, psutil.AccessDenied): print(f"PID {old_pid} not found/access denied. Assuming stale."); old_pid = None
-                else: print(f"PID {old_pid} not found. Assuming stale."); old_pid = None
-            except Exception as e_psutil: print(f"Error checking PID {old_pid}: {e_psutil}. Assuming stale."); old_pid = None
-        elif old_pid is not None and not HAS_PSUTIL: print("Warning: psutil not found. Assuming another instance is running."); app_already_running = True
-        if not app_already_running:
-            try: print("Attempting to remove stale lock file..."); os.remove(lock_file_path); lock_file_handle = os.open(lock_file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY); os.write(lock_file_handle, str(current_pid).encode()); print(f"Recreated lock file with new PID: {current_pid}")
-            except Exception as e_recreate: print(f"Error recreating lock file: {e_recreate}. Exiting."); app_already_running = True
-    except Exception as e_lock_init: print(f"Unexpected error during lock file handling: {e_lock_init}"); app_already_running = True
-
-    if app_already_running: root_check = tk.Tk(); root_check.withdraw(); messagebox.showerror("SpeedReader", "Eine andere Instanz läuft bereits oder Lock-Datei-Problem."); root_check.destroy(); sys.exit(1)
-    # --- End Lock File Handling ---
+    # --- Single instance: bind the IPC endpoint, or hand the request over if another instance won the race ---
+    instance_server = InstanceServer()
+    if not instance_server.start():
+        if send_to_running_instance(LAUNCH_REQUEST): print("Request forwarded to the running instance."); sys.exit(0)
+        root_check = tk.Tk(); root_check.withdraw(); messagebox.showerror("SpeedReader", "Eine andere Instanz läuft bereits, reagiert aber nicht."); root_check.destroy(); sys.exit(1)
 
     print("Starting Speed Reader Application...")
     if not HAS_PYNPUT: root_check = tk.Tk(); root_check.withdraw(); messagebox.showerror("Kritischer Fehler", "'pynput' fehlt.\nInstallieren: pip install pynput"); root_check.destroy(); sys.exit("Fehler: pynput nicht gefunden.")
@@ -455,7 +544,10 @@ if __name__ == "__main__":
     app = None; root = tk.Tk()
     try:
         # --- Main application execution ---
-        app = SpeedReaderApp(root); print("Starting Tkinter main loop..."); root.mainloop(); print("Mainloop finished normally.")
+        app = SpeedReaderApp(root)
+        instance_server.serve(lambda request: app.command_queue.put((request, None))) # Called from the listener thread
+        if LAUNCH_REQUEST["action"] != "activate": app.command_queue.put((LAUNCH_REQUEST, None)) # Files/clipboard from our own command line
+        print("Starting Tkinter main loop..."); root.mainloop(); print("Mainloop finished normally.")
     except KeyboardInterrupt:
         # --- Handle Ctrl+C --- KORRIGIERT ---
         print("\nKeyboardInterrupt. Shutting down...")
@@ -480,18 +572,7 @@ if __name__ == "__main__":
     finally:
         # --- Code that *always* runs after try/except/KeyboardInterrupt ---
         print("Entering final cleanup stage...")
-        if lock_file_handle is not None:
-              try:
-                   os.close(lock_file_handle)
-                   if os.path.exists(lock_file_path):
-                        pid_in_file = -1
-                        try:
-                             with open(lock_file_path, 'r') as f_final: pid_in_file = int(f_final.read().strip())
-                        except Exception: pass
-                        if pid_in_file == current_pid: os.remove(lock_file_path); print("Lock file removed.")
-                        else: print(f"Lock file PID ({pid_in_file}) != current PID ({current_pid}). Not removing.")
-                   else: print("Lock file already removed.")
-              except Exception as e_lock: print(f"Error closing/removing lock file: {e_lock}")
+        instance_server.close()
 
         # Final check if quit_app wasn't called or root still exists
         app_exists = 'app' in locals() and app is not None
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+# EPUB, HTML, Markdown and RTF extractors (standard library only). Imported by the extractor registry on first use only.
+
+import re
+import codecs
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+from extractors import ExtractionError, Heading, read_text_file
+from text_stream import detect_encoding, ENCODING_SAMPLE_BYTES
+
+HTML_READ_CHUNK = 64 * 1024 # Bytes fed to the parser at a time
+HTML_CONTENT_LOOKAHEAD = 256 * 1024 # Characters during which paragraphs outside <article>/<main> are held back
+# Content of these elements is never read (scripts, navigation, page chrome)
+HTML_SKIP_TAGS = frozenset(("script", "style", "noscript", "template", "svg", "head", "nav", "header", "footer", "aside", "form", "button", "select", "iframe"))
+# Elements that end the current paragraph
+HTML_BLOCK_TAGS = frozenset(("p", "div", "br", "li", "dt", "dd", "tr", "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre",
+                             "section", "article", "main", "ul", "ol", "dl", "table", "figure", "figcaption", "hr", "body"))
+HTML_CONTENT_TAGS = frozenset(("article", "main")) # If present, only their paragraphs are read
+HTML_VOID_TAGS = frozenset(("br", "hr", "img", "meta", "link", "input", "area", "base", "col", "embed", "source", "track", "wbr"))
+
+class _ParagraphHTMLParser(HTMLParser):
+    """Collects the visible paragraphs of an (X)HTML document, skipping boilerplate elements."""
+    def __init__(self, skip_tags=HTML_SKIP_TAGS):
+        super().__init__(convert_charrefs=True)
+        self.skip_tags = skip_tags
+        self.paragraphs = [] # (text, inside_content_element)
+        self.parts = []; self.content_depth = 0
+        self.skip_stack = [] # Open skipped elements; only their own tags are tracked, so omitted </li>/</p> inside do not matter
+        self.seen_content = False # An <article>/<main> element was opened
+
+    def _flush(self):
+        text = " ".join("".join(self.parts).split()); self.parts = []
+        if text: self.paragraphs.append((text, self.content_depth > 0))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in HTML_VOID_TAGS:
+            if tag in HTML_BLOCK_TAGS and not self.skip_stack: self._flush()
+            return
+        if tag in self.skip_tags: self.skip_stack.append(tag); return
+        if self.skip_stack: return
+        if tag in HTML_BLOCK_TAGS: self._flush()
+        if tag in HTML_CONTENT_TAGS: self.content_depth += 1; self.seen_content = True
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in HTML_BLOCK_TAGS and not self.skip_stack: self._flush()
+
+    def handle_endtag(self, tag):
+        if tag in HTML_VOID_TAGS: return
+        if self.skip_stack:
+            if tag in self.skip_stack: del self.skip_stack[len(self.skip_stack) - 1 - self.skip_stack[::-1].index(tag):] # Also closes skipped elements left open inside
+            return
+        if tag in HTML_BLOCK_TAGS: self._flush()
+        if tag in HTML_CONTENT_TAGS and self.content_depth: self.content_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_stack: self.parts.append(data)
+
+    def take_paragraphs(self):
+        """Returns the paragraphs parsed so far and forgets them."""
+        paragraphs = self.paragraphs; self.paragraphs = []
+        return paragraphs
+
+    def close(self):
+        super().close(); self._flush()
+
+# --- HTML ---
+def _iter_decoded_chunks(filepath, chunk_bytes=HTML_READ_CHUNK):
+    """Reads and decodes a text file piece by piece; the encoding is detected from its start like in read_text_file."""
+    with open(filepath, 'rb') as f:
+        data = f.read(max(chunk_bytes, ENCODING_SAMPLE_BYTES))
+        encoding, bom_length = detect_encoding(data[:ENCODING_SAMPLE_BYTES])
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace'); data = data[bom_length:]
+        while data: yield decoder.decode(data); data = f.read(chunk_bytes)
+        yield decoder.decode(b"", final=True)
+
+def iter_html_paragraphs(filepath):
+    """
+    Yields the paragraphs of an HTML file as they are parsed, without scripts, navigation, headers/footers and asides.
+    If the page marks its content with <article> or <main>, only that content is read: paragraphs before it are
+    held back until it appears, for at most HTML_CONTENT_LOOKAHEAD characters; without one by then, all is read.
+    """
+    parser = _ParagraphHTMLParser(); held = []; content_only = None; read_chars = 0 # content_only: None = not decided yet
+    for chunk in _iter_decoded_chunks(filepath):
+        parser.feed(chunk); read_chars += len(chunk)
+        if content_only is None and parser.seen_content: content_only = True; held.clear()
+        for paragraph, in_content in parser.take_paragraphs():
+            if content_only is None: held.append(paragraph)
+            elif in_content or not content_only: yield paragraph
+        if content_only is None and read_chars >= HTML_CONTENT_LOOKAHEAD: content_only = False; yield from held; held.clear()
+    parser.close()
+    if content_only is None: content_only = parser.seen_content; held = [] if content_only else held
+    yield from held
+    for paragraph, in_content in parser.take_paragraphs():
+        if in_content or not content_only: yield paragraph
+
+# --- EPUB ---
+OPF_NS = "{http://www.idpf.org/2007/opf}"
+CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+EPUB_DOCUMENT_TYPES = ("application/xhtml+xml", "text/html")
+
+def _epub_spine(archive):
+    """Returns the archive paths of the EPUB content documents in reading order."""
+    container = ET.fromstring(archive.read("META-INF/container.xml"))
+    rootfile = container.find(f".//{CONTAINER_NS}rootfile")
+    if rootfile is None: raise ExtractionError("EPUB Fehler", "EPUB enthält keine Paketbeschreibung (OPF).")
+    opf_path = rootfile.get("full-path"); opf_dir = posixpath.dirname(opf_path)
+    package = ET.fromstring(archive.read(opf_path))
+    manifest = {item.get("id"): item for item in package.iter(f"{OPF_NS}item")}
+    spine = []
+    for itemref in package.iter(f"{OPF_NS}itemref"):
+        item = manifest.get(itemref.get("idref"))
+        if item is None or item.get("media-type") not in EPUB_DOCUMENT_TYPES or itemref.get("linear") == "no": continue
+        spine.append(posixpath.normpath(posixpath.join(opf_dir, unquote(item.get("href")))))
+    return spine
+
+def iter_epub_paragraphs(filepath):
+    """Yields the paragraphs of an EPUB, one chapter (spine document) at a time."""
+    try:
+        with zipfile.ZipFile(filepath) as archive:
+            for chapter_path in _epub_spine(archive):
+                parser = _ParagraphHTMLParser(skip_tags=HTML_SKIP_TAGS - {"header", "footer", "aside"}) # Books use these for content
+                try: parser.feed(archive.read(chapter_path).decode("utf-8", errors="replace")); parser.close()
+                except KeyError: print(f"Warning: EPUB chapter missing: {chapter_path}"); continue
+                for paragraph, _ in parser.take_paragraphs(): yield paragraph
+    except ExtractionError: raise
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e: raise ExtractionError("EPUB Fehler", f"Fehler beim Lesen der EPUB-Datei:\n{e}")
+
+# --- Markdown ---
+MD_FENCE = re.compile(r"^\s*(```|~~~)")
+MD_HEADING = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$")
+MD_SETEXT_UNDERLINE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+MD_RULE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+MD_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(?:\[[ xX]\]\s+)?")
+MD_QUOTE = re.compile(r"^\s{0,3}>\s?")
+MD_TABLE_SEPARATOR = re.compile(r"^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+MD_INLINE_RULES = (
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),       # Images -> alt text
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),        # Links -> link text
+    (re.compile(r"\[([^\]]+)\]\[[^\]]*\]"), r"\1"),       # Reference links
+    (re.compile(r"<[^>\n]+>"), ""),                       # Inline HTML / autolinks
+    (re.compile(r"`+([^`]*)`+"), r"\1"),                  # Inline code
+    (re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1"), r"\2"), # Bold
+    (re.compile(r"(?<!\w)([*_])(?=\S)(.+?)(?<=\S)\1(?!\w)"), r"\2"), # Italic
+    (re.compile(r"~~(.+?)~~"), r"\1"),                    # Strikethrough
+)
+
+def _strip_markdown_inline(line):
+    for pattern, replacement in MD_INLINE_RULES: line = pattern.sub(replacement, line)
+    return line
+
+def iter_markdown_paragraphs(filepath):
+    """Yields the paragraphs of a Markdown file as plain text; headings (as Heading) and list items are paragraphs of their own."""
+    paragraph = []; in_fence = False
+    def flush():
+        text = " ".join(" ".join(paragraph).split()); paragraph.clear()
+        return text
+    for line in read_text_file(filepath).splitlines():
+        if MD_FENCE.match(line): in_fence = not in_fence; continue
+        if in_fence: continue # Code blocks are not read
+        if not line.strip() or MD_RULE.match(line) or MD_TABLE_SEPARATOR.match(line):
+            text = flush()
+            if text: yield text
+            continue
+        setext = MD_SETEXT_UNDERLINE.match(line) if paragraph else None
+        if setext: text = flush(); yield Heading(text, 1 if setext.group(1)[0] == "=" else 2); continue # Previous line was a heading
+        heading = MD_HEADING.match(line)
+        if heading or MD_LIST_ITEM.match(line):
+            text = flush()
+            if text: yield text
+            if heading:
+                text = _strip_markdown_inline(heading.group(2)).strip()
+                if text: yield Heading(text, len(heading.group(1)))
+                continue
+            line = MD_LIST_ITEM.sub("", line, count=1)
+        line = MD_QUOTE.sub("", line)
+        if "|" in line and line.strip().startswith("|"): line = " ".join(cell.strip() for cell in line.strip().strip("|").split("|"))
+        paragraph.append(_strip_markdown_inline(line))
+    text = flush()
+    if text: yield text
+
+# --- RTF ---
+RTF_TOKEN = re.compile(r"\\([a-zA-Z]+)(-?\d+)? ?|\\'([0-9a-fA-F]{2})|\\([^a-zA-Z])|([{}])|[\r\n]+|([^\\{}\r\n]+)")
+# Destinations whose content is not text
+RTF_SKIP_DESTINATIONS = frozenset(("fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "header", "footer", "headerl", "headerr",
+                                   "footerl", "footerr", "footnote", "fldinst", "themedata", "colorschememapping", "datastore",
+                                   "latentstyles", "listtable", "listoverridetable", "rsidtbl", "generator", "xmlnstbl", "mmathPr"))
+RTF_SPECIAL_CHARS = {"par": "\n\n", "line": "\n", "tab": "\t", "emdash": "—", "endash": "–", "lquote": "‘", "rquote": "’",
+                     "ldblquote": "“", "rdblquote": "”", "bullet": "•", "emspace": " ", "enspace": " ", "qmspace": " ", "cell": " ", "row": "\n"}
+
+def iter_rtf_paragraphs(filepath):
+    """Yields the paragraphs of an RTF file (plain text only; tables, pictures and fields are flattened or skipped)."""
+    with open(filepath, 'rb') as f: data = f.read().decode('latin-1') # RTF is 7-bit; \'hh escapes are decoded below
+    if not data.startswith("{\\rtf"): raise ExtractionError("RTF Fehler", "Die Datei ist keine gültige RTF-Datei.")
+    codepage = "cp1252"; unicode_skip = 1; skip_chars = 0
+    stack = []; skipping = False; next_is_ignorable = False
+    out = []; pending_bytes = bytearray()
+    def flush_bytes():
+        if pending_bytes: out.append(pending_bytes.decode(codepage, errors="replace")); pending_bytes.clear()
+    for match in RTF_TOKEN.finditer(data):
+        word, param, hex_code, symbol, brace, text = match.groups()
+        if brace == "{": stack.append((skipping, unicode_skip)); continue
+        if brace == "}":
+            if stack: skipping, unicode_skip = stack.pop()
+            continue
+        if skip_chars and (hex_code or text): # Fallback characters after \uN
+            if text: skip_count = min(skip_chars, len(text)); skip_chars -= skip_count; text = text[skip_count:]
+            else: skip_chars -= 1; continue
+            if not text: continue
+        if symbol:
+            if symbol == "*": next_is_ignorable = True
+            elif not skipping and symbol in "\\{}": flush_bytes(); out.append(symbol)
+            elif not skipping and symbol == "~": flush_bytes(); out.append("\u00a0")
+            continue
+        if word:
+            if next_is_ignorable or word in RTF_SKIP_DESTINATIONS: skipping = True
+            next_is_ignorable = False
+            if word == "ansicpg" and param:
+                try: codecs.lookup(f"cp{param}"); codepage = f"cp{param}"
+                except LookupError: print(f"Warning: Unknown RTF code page {param}, using cp1252.")
+            elif word == "uc" and param: unicode_skip = int(param)
+            elif skipping: continue
+            elif word == "u" and param:
+                flush_bytes(); out.append(chr(int(param) % 0x10000)); skip_chars = unicode_skip
+            elif word in RTF_SPECIAL_CHARS: flush_bytes(); out.append(RTF_SPECIAL_CHARS[word])
+            continue
+        if skipping: continue
+        if hex_code: pending_bytes.append(int(hex_code, 16)); continue
+        if text: flush_bytes(); out.append(text)
+    flush_bytes()
+    for paragraph in "".join(out).split("\n\n"):
+        paragraph = paragraph.strip()
+        if paragraph: yield paragraph
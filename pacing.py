@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+
+from utils import calculate_delay, is_abbreviation, MARKER_TOKENS
+
+# --- Pacing constants ---
+SENTENCE_END_CHARS = ('.', '!', '?', ':', ';') # Trailing characters that trigger the punctuation pause
+MIN_TOKEN_WEIGHT = 0.5; MAX_TOKEN_WEIGHT = 2.5 # Clamp range for per-token complexity weights
+MIN_ITEM_DELAY_MS = 10
+OPENING_BRACKETS = "([{"; CLOSING_BRACKETS = ")]}"
+
+def compute_token_weights(words, frequency_lookup=None):
+    """
+    Computes a complexity weight per token in one pass over the token list.
+
+    A weight of 1.0 means "one regular word". Inputs: character length, digits/numbers,
+    capitalization (German nouns, acronyms), word frequency and parenthetical depth.
+
+    Args:
+        words (list): Tokens as returned by tokenize_with_offsets.
+        frequency_lookup (callable, optional): word -> quantized frequency (0 = not listed, neutral;
+                                               255 = very frequent). Skipped if None.
+
+    Returns:
+        array: One weight per token ('f' typecode); 0.0 for paragraph/file markers.
+    """
+    weights = array('f', bytes(4 * len(words)))
+    depth = 0; sentence_start = True
+    for i, word in enumerate(words):
+        if word in MARKER_TOKENS: sentence_start = True; depth = 0; continue
+        depth += sum(1 for c in word if c in OPENING_BRACKETS) # Opening bracket counts for its own word
+        core = word.strip(".,;:!?\"'()[]{}«»„“”‚‘’-")
+        n = len(core); weight = 1.0
+        if n <= 3: weight -= 0.1 # Short function words
+        elif n > 8: weight += 0.02 * (n - 8)
+        if any(c.isdigit() for c in core): weight += 0.3 # Numbers need to be read exactly
+        if n > 1 and core.isupper(): weight += 0.2 # Acronyms
+        elif core[:1].isupper() and not sentence_start: weight += 0.1 # Capitalized content words (German nouns)
+        if frequency_lookup is not None and n > 3:
+            frequency = frequency_lookup(core.lower())
+            if frequency: weight -= 0.2 * (frequency / 255.0) # Listed (frequent) words get faster; unlisted words stay neutral
+        if depth > 0: weight += 0.1 * min(depth, 3)
+        weights[i] = max(MIN_TOKEN_WEIGHT, min(MAX_TOKEN_WEIGHT, weight))
+        depth = max(0, depth - sum(1 for c in word if c in CLOSING_BRACKETS))
+        sentence_start = word.endswith(SENTENCE_END_CHARS) and not is_abbreviation(word)
+    return weights
+
+class DelayTimeline:
+    """
+    Per-item timing, independent of WPM: word units scale with the base delay,
+    pauses (seconds) and length bonuses (ms) are fixed. Changing WPM needs no rebuild.
+    """
+    def __init__(self, word_units, pause_s, length_ms):
+        self.word_units = word_units; self.pause_s = pause_s; self.length_ms = length_ms
+        # Prefix sums for remaining/total time estimates
+        self.cum_units = array('d', [0.0]); self.cum_fixed_ms = array('d', [0.0])
+        units_total = 0.0; fixed_total = 0.0
+        for units, pause, length in zip(word_units, pause_s, length_ms):
+            units_total += units; fixed_total += pause * 1000 + length
+            self.cum_units.append(units_total); self.cum_fixed_ms.append(fixed_total)
+
+    def __len__(self): return len(self.word_units)
+
+    def delay_ms(self, item_index, wpm):
+        """Display duration of one item in ms at the given WPM."""
+        if item_index < 0 or item_index >= len(self.word_units): return MIN_ITEM_DELAY_MS
+        total_delay_s = self.word_units[item_index] * calculate_delay(wpm) + self.pause_s[item_index]
+        return max(MIN_ITEM_DELAY_MS, int(total_delay_s * 1000)) + self.length_ms[item_index]
+
+    def duration_s(self, item_index, wpm):
+        """Unclamped display duration of one item in seconds (frame-clock playback)."""
+        if item_index < 0 or item_index >= len(self.word_units): return 0.0
+        return self.word_units[item_index] * calculate_delay(wpm) + self.pause_s[item_index] + self.length_ms[item_index] / 1000.0
+
+    def remaining_ms(self, item_index, wpm):
+        """Estimated time in ms from item_index (inclusive) to the end."""
+        n = len(self.word_units); item_index = max(0, min(item_index, n))
+        units = self.cum_units[n] - self.cum_units[item_index]
+        fixed_ms = self.cum_fixed_ms[n] - self.cum_fixed_ms[item_index]
+        return int(units * calculate_delay(wpm) * 1000 + fixed_ms)
+
+    def total_ms(self, wpm): return self.remaining_ms(0, wpm)
+
+def build_delay_timeline(words, display_items, item_to_word_indices, settings, token_weights=None):
+    """
+    Builds the DelayTimeline for all display items in one pass.
+
+    Args:
+        settings: Object with a get(key) method (e.g. ConfigManager).
+        token_weights (array, optional): Per-token weights from compute_token_weights;
+                                         without them every word counts as 1.0.
+    """
+    pause_punct_s = settings.get("pause_punctuation"); pause_comma_s = settings.get("pause_comma"); pause_para_s = settings.get("pause_paragraph")
+    length_threshold = settings.get("word_length_threshold"); extra_ms_per_char = settings.get("extra_ms_per_char")
+    n = len(display_items)
+    word_units = array('f', bytes(4 * n)); pause_s = array('f', bytes(4 * n)); length_ms = array('I', bytes(4 * n))
+    for item_index, item in enumerate(display_items):
+        if item in MARKER_TOKENS: pause_s[item_index] = pause_para_s; continue
+        start, end = item_to_word_indices.get(item_index, (0, 0))
+        if token_weights is not None and end > start: word_units[item_index] = sum(token_weights[start:end])
+        else: word_units[item_index] = end - start
+        visible_item = item.rstrip(); last_visible_char = visible_item[-1] if visible_item else ''
+        if last_visible_char in SENTENCE_END_CHARS:
+            if end <= start or not is_abbreviation(words[end - 1]): pause_s[item_index] = pause_punct_s # 'z.B.' gets no sentence pause
+        elif last_visible_char == ',': pause_s[item_index] = pause_comma_s
+        char_count = len(item) - item.count(" ")
+        if char_count > length_threshold: length_ms[item_index] = (char_count - length_threshold) * extra_ms_per_char
+    return DelayTimeline(word_units, pause_s, length_ms)
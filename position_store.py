@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Reading positions of files, kept across sessions. A position is stored with content-defined anchors
+# (rolling hashes of token shingles around it), so it survives edits of the file: on reopen the anchors
+# are looked up in the new tokens and vote for the equivalent spot. No Tk.
+
+import os
+import json
+import time
+import zlib
+from collections import Counter
+
+from config import get_appdata_path
+from text_search import normalize_search_token
+
+# --- Constants ---
+POSITIONS_FILE = "reading_positions.json"
+MAX_FILES = 200                # Least recently read files are forgotten first
+SHINGLE_TOKENS = 4             # Tokens per anchor shingle
+ANCHOR_RADIUS = 64             # Anchors are taken from this many tokens before and after the position
+MIN_ANCHOR_VOTES = 3           # Fewer agreeing anchors than this count as "not found"
+HASH_MODULUS = (1 << 61) - 1; HASH_BASE = 1000003
+
+def _token_hashes(tokens):
+    """Stable per-token hashes (normalized like the search, so case and punctuation edits do not break anchors)."""
+    cache = {}; hashes = []
+    for token in tokens:
+        token_hash = cache.get(token)
+        if token_hash is None: token_hash = cache[token] = zlib.crc32((normalize_search_token(token) or token).encode('utf-8'))
+        hashes.append(token_hash)
+    return hashes
+
+def _shingle_hash(token_hashes, start):
+    shingle_hash = 0
+    for token_hash in token_hashes[start:start + SHINGLE_TOKENS]: shingle_hash = (shingle_hash * HASH_BASE + token_hash) % HASH_MODULUS
+    return shingle_hash
+
+def compute_anchors(tokens, word_index):
+    """
+    Anchors of a position: the shingles starting within ANCHOR_RADIUS tokens of it.
+
+    Returns:
+        list: [offset of the shingle start relative to word_index, first token hash, shingle hash] per anchor.
+    """
+    first = max(0, word_index - ANCHOR_RADIUS); last = min(len(tokens) - SHINGLE_TOKENS, word_index + ANCHOR_RADIUS)
+    if last < first: return []
+    token_hashes = _token_hashes(tokens[first:last + SHINGLE_TOKENS])
+    return [[first + i - word_index, token_hashes[i], _shingle_hash(token_hashes, i)] for i in range(last - first + 1)]
+
+def locate_anchors(tokens, anchors, near=0):
+    """
+    Finds the position the anchors were taken around in (possibly edited) tokens. One pass over the tokens:
+    the first token hashes of the anchors form the index, only candidate starts get their shingle hashed.
+
+    Args:
+        near (int): Preferred position when several spots get the same number of votes (the stored index).
+
+    Returns:
+        int or None: Token index, or None if too few anchors were found.
+    """
+    if not anchors: return None
+    offsets_by_shingle = {}
+    for offset, _first_hash, shingle_hash in anchors: offsets_by_shingle.setdefault(shingle_hash, []).append(offset)
+    first_hashes = {first_hash for _offset, first_hash, _shingle in anchors}
+    token_hashes = _token_hashes(tokens); votes = Counter()
+    for i in range(len(token_hashes) - SHINGLE_TOKENS + 1):
+        if token_hashes[i] not in first_hashes: continue
+        for offset in offsets_by_shingle.get(_shingle_hash(token_hashes, i), ()):
+            position = i - offset
+            if 0 <= position < len(tokens): votes[position] += 1
+    if not votes: return None
+    best_votes = max(votes.values())
+    if best_votes < min(MIN_ANCHOR_VOTES, len(anchors)): return None
+    return min((position for position, count in votes.items() if count == best_votes), key=lambda position: abs(position - near))
+
+# --- Store ---
+def _position_key(filepath): return os.path.normcase(os.path.abspath(filepath))
+
+def load_positions():
+    try:
+        with open(get_appdata_path(POSITIONS_FILE), encoding='utf-8') as f: positions = json.load(f)
+        return positions if isinstance(positions, dict) else {}
+    except FileNotFoundError: return {}
+    except (OSError, ValueError) as e: print(f"Warning: Could not read reading positions: {e}"); return {}
+
+def _write_positions(positions):
+    path = get_appdata_path(POSITIONS_FILE); temp_path = path + ".tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f: json.dump(positions, f)
+        os.replace(temp_path, path)
+    except OSError as e: print(f"Warning: Could not save reading positions: {e}")
+
+def save_reading_position(filepath, tokens, word_index):
+    """Remembers the position in a file with its anchors; a position at the start (or past the end) forgets the file."""
+    positions = load_positions(); key = _position_key(filepath)
+    positions.pop(key, None)
+    if 0 < word_index < len(tokens):
+        positions[key] = {"word": word_index, "tokens": len(tokens), "anchors": compute_anchors(tokens, word_index), "time": int(time.time())}
+        for old_key in sorted(positions, key=lambda k: positions[k].get("time", 0))[:max(0, len(positions) - MAX_FILES)]: del positions[old_key]
+    _write_positions(positions)
+
+def find_reading_position(filepath, tokens):
+    """Token index to resume a file at (remapped if the file was edited since), or 0."""
+    entry = load_positions().get(_position_key(filepath))
+    if not entry: return 0
+    word_index = entry.get("word", 0)
+    if entry.get("tokens") == len(tokens) and compute_anchors(tokens, word_index) == entry.get("anchors"): return word_index # Unchanged
+    position = locate_anchors(tokens, entry.get("anchors", []), near=word_index)
+    print(f"Reading position {'remapped from word ' + str(word_index) + ' to ' + str(position) if position is not None else 'lost after edits'}.")
+    return position or 0
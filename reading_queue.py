@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from extractors import ExtractionError, PartialExtractionError
+from extraction_sandbox import extract_document_safe
+
+# --- Constants ---
+MAX_EXTRACTION_WORKERS = 2 # Bounded worker pool for file extraction
+PREFETCH_FILES = 2         # Files extracted ahead of the one being read
+
+class ReadingQueue:
+    """
+    Extracts a list of files in a bounded worker pool and releases the results in order.
+    Only PREFETCH_FILES extractions are in flight at once; the next one is submitted
+    whenever a result is taken, so the following file is ready before it is needed.
+    """
+    def __init__(self, filepaths, extract_func=extract_document_safe, max_workers=MAX_EXTRACTION_WORKERS, prefetch=PREFETCH_FILES):
+        self.filepaths = list(filepaths)
+        self.extract_func = extract_func
+        self.prefetch = max(1, prefetch)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="extract")
+        self.futures = {} # file index -> Future
+        self.next_to_submit = 0; self.next_to_release = 0
+        self.cancelled = False
+        self._fill()
+
+    def _fill(self):
+        while not self.cancelled and self.next_to_submit < len(self.filepaths) and self.next_to_submit - self.next_to_release < self.prefetch:
+            filepath = self.filepaths[self.next_to_submit]
+            self.futures[self.next_to_submit] = self.executor.submit(self.extract_func, filepath)
+            self.next_to_submit += 1
+
+    def poll(self):
+        """
+        Returns the finished results that are next in order (never blocks).
+
+        Returns:
+            list: (file_index, filepath, text, headings, error) tuples; text is None if extraction failed,
+                  for a partial extraction both text and error are set.
+        """
+        results = []
+        while not self.cancelled and self.next_to_release < len(self.filepaths):
+            future = self.futures.get(self.next_to_release)
+            if future is None or not future.done(): break
+            filepath = self.filepaths[self.next_to_release]; text = None; headings = (); error = None
+            try: text, headings = future.result()
+            except PartialExtractionError as e: text = e.text; headings = e.headings; error = e
+            except ExtractionError as e: error = e
+            except Exception as e: error = ExtractionError("Fehler Dateizugriff", f"Datei konnte nicht gelesen werden:\n{filepath}\n\nFehler: {e}")
+            results.append((self.next_to_release, filepath, text, headings, error))
+            del self.futures[self.next_to_release]; self.next_to_release += 1
+            self._fill()
+        if self.is_done(): self.executor.shutdown(wait=False)
+        return results
+
+    def is_done(self):
+        return self.cancelled or self.next_to_release >= len(self.filepaths)
+
+    def cancel(self):
+        """Stops submitting new files; running extractions finish in the background."""
+        self.cancelled = True
+        for future in self.futures.values(): future.cancel()
+        self.futures.clear(); self.executor.shutdown(wait=False)
+
+    @staticmethod
+    def title_for(filepath):
+        return os.path.basename(filepath)
@@ -2,10 +2,24 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox, font
+import re
 import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 import traceback # For detailed error logging
-
-from utils import preprocess_text, calculate_delay, calculate_orp_index
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import TokenizedText, tokenize_with_offsets, map_headings_to_tokens, map_char_ranges_to_tokens, format_duration, compute_orp_indices, group_display_items, compute_item_orp_indices, is_sentence_end, FILE_MARKER, MARKER_TOKENS
+from font_registry import get_font, get_average_char_width
+from pacing import compute_token_weights, build_delay_timeline
+from word_frequency import get_frequency_lookup
+from text_stream import RESIDENT_WINDOWS
+from document_cache import PreparedDocument
+from text_search import build_search_index, next_match
+from skim import score_document, select_sentences, build_skip_table
+from text_cleanup import find_repeated_paragraphs
+from position_store import find_reading_position, save_reading_position
 
 # --- Dark Mode Colors ---
 DARK_BG = "#2b2b2b"; DARK_FG = "#bbbbbb"; DARK_HIGHLIGHT = "#FF5555"
@@ -14,8 +28,45 @@ DARK_PROGRESS_TROUGH = "#3c3f41"; DARK_PROGRESS_BAR = "#4e7cbf"
 CONTEXT_FG_LIGHT = "#a0a0a0"; CONTEXT_FG_DARK = "#606060" # Context colors
 
 # --- Constants ---
-CONTEXT_SNIPPET_WORDS = 7 # Number of words before/after current word/chunk start for snippet
-MAX_SNIPPET_LEN = 130 # Max character length for context snippet label
+SNIPPET_LINES = 2 # Lines of source text shown in the context snippet label
+SNIPPET_LEAD_SHARE = 0.4 # Share of the snippet before the current item (paused)
+LIVE_SNIPPET_LEAD_SHARE = 0.1 # Same during playback; the live snippet is only re-rendered when reading runs past it
+PARAGRAPH_BREAK = re.compile(r"\r?\n\s*\n")
+LOOKAHEAD_ITEMS = 8 # Number of upcoming items whose layout is precomputed during idle time
+FRAME_CLOCK_MIN_WPM = 1200 # From this speed on, playback runs on the frame clock instead of one timer per item
+FRAME_PERIOD_MS = 16 # One callback per display refresh (~60 Hz); the frame clock never sleeps shorter
+STATUS_REFRESH_MS = 150 # Progress bar and status bar are refreshed at most this often during playback (~7 Hz)
+SEARCH_POLL_MS = 100 # Retry interval of a search (or skim mode, repeat detection) that waits for its worker result
+TIMELINE_SETTING_KEYS = ("adaptive_pacing", "pause_punctuation", "pause_comma", "pause_paragraph", "word_length_threshold", "extra_ms_per_char")
+STREAM_SETTING_KEYS = ("chunk_size", "orp_position", "chunk_orp_mode") + TIMELINE_SETTING_KEYS # Settings the display state of streamed windows depends on
+
+def _find_repeated_token_ranges(text, token_starts):
+    """Worker: token ranges of the repeated paragraphs of the session text (see find_repeated_paragraphs)."""
+    return map_char_ranges_to_tokens(token_starts, find_repeated_paragraphs(text))
+
+def _build_stream_state(windows, settings, frequency_lookup):
+    """
+    Tokens, display items, ORP indices and delay timeline of a list of resident (window_idx, TokenizedText).
+    No Tk and no window state, so it also runs on the worker thread; settings is a snapshot of STREAM_SETTING_KEYS.
+    """
+    words = []; starts = array('I'); ends = array('I'); text_base = 0
+    for _, window in windows: # Windows are contiguous in the file, so their texts simply concatenate
+        words.extend(window.tokens)
+        starts.extend(start + text_base for start in window.starts); ends.extend(end + text_base for end in window.ends)
+        text_base += len(window.text)
+    display_items, item_to_word_indices = group_display_items(words, settings["chunk_size"])
+    item_word_starts = array('I', (item_to_word_indices[item_idx][0] for item_idx in range(len(display_items))))
+    word_orp_indices = compute_orp_indices(words, settings["orp_position"])
+    item_orp_indices = compute_item_orp_indices(words, word_orp_indices, display_items, item_to_word_indices, settings["orp_position"], settings["chunk_orp_mode"])
+    token_weights = compute_token_weights(words, frequency_lookup) if settings["adaptive_pacing"] else None
+    timeline = build_delay_timeline(words, display_items, item_to_word_indices, settings, token_weights)
+    return (words, "".join(window.text for _, window in windows), starts, ends, display_items, item_to_word_indices,
+            item_word_starts, word_orp_indices, item_orp_indices, token_weights, timeline, settings)
+
+def _prepare_stream_shift(windows, window_idx, window_future, settings, frequency_lookup):
+    """Worker: waits for the next tokenized window and builds the display state of the resident windows after the shift."""
+    windows = (windows + [(window_idx, window_future.result())])[-RESIDENT_WINDOWS:]
+    return windows, _build_stream_state(windows, settings, frequency_lookup)
 
 class ReadingWindow(tk.Toplevel):
     """
@@ -26,18 +77,62 @@ class ReadingWindow(tk.Toplevel):
         self.parent = parent
         self.config = config_manager
         self.raw_words = []
+        self.source_text = "" # Text the tokens came from (concatenated for multi-file sessions)
+        self.token_starts = array('I'); self.token_ends = array('I') # Character span of each raw word in source_text
+        self.live_snippet_end = -1 # Character offset where the live snippet ends (-1 = not shown)
+        self.live_snippet = False # Snippet also shown during playback (show_continuous_context + context_snippet_live)
         self.display_items = []
         # Mapping: item_idx -> (start_raw_word_idx, end_raw_word_idx) - end is exclusive
         self.item_to_word_indices = {}
+        self.item_word_starts = array('I') # First raw word index of each display item (ascending, for bisect)
+        self.word_orp_indices = array('i') # ORP index per raw word (-1 for markers)
+        self.item_orp_indices = array('i') # Fixation index per display item (-1 = no ORP)
+        self.orp_settings_key = None
+        self.token_weights = None # Per-token complexity weights (adaptive pacing)
+        self.prepared = None # PreparedDocument the session was opened from (precomputed ORP indices and weights)
+        self.source_path = None # File of a single-file session; its reading position is remembered on close
+        self.timeline = None # DelayTimeline for display_items
+        self.timeline_settings_key = None
+        self.file_word_starts = [0] # Raw word index where each file of the session starts (sorted)
+        self.file_titles = [""]
+        self.chapters = [] # (raw word index, level, title) in text order; files are level 0 in multi-file sessions
+        self.chapter_word_starts = array('I')
+        self.chapter_dialog = None
+        self.stream_source = None # StreamingTextSource for huge text files (None = whole text in memory)
+        self.stream_windows = [] # Resident (window_idx, TokenizedText) around the reading position, in order
+        self.stream_word_offset = 0 # Global token index of raw_words[0] while streaming
+        self.stream_prefetch = None # (window_idx, Future of (windows, display state)) of the shift prepared ahead on the worker
+        self.progress_maximum = None
+        self.progress_shown = None # Last value set on the progress bar
+        self.status_texts = (None, None) # Last (left, right) status bar texts
+        self.status_due = 0.0 # perf_counter time of the next throttled status refresh
         self.current_item_index = 0
         self.paused = False
         self.reading_job = None
+        self.frame_deadline = None # Frame clock: perf_counter time at which the shown item is replaced (None = not running)
         self.widget_font = None
         self.at_end = False
         self.font_color = "#000000"
         self.highlight_color = "#FF0000"
         self.context_font_color = "#a0a0a0"
         self.context_snippet_font = None # Font for the snippet label
+        self.layout_ring = [None] * LOOKAHEAD_ITEMS # Ring buffer: slot -> (item_idx, canvas_size, layout)
+        self.lookahead_job = None
+        self.canvas_text_ids = [] # Pooled canvas text items reused by _apply_layout
+        self.worker_executor = None # Single worker thread for the search index, skim scores and repeat detection
+        self.search_future = None # Future of the SearchIndex of the current session (None = search unavailable)
+        self.search_index = None
+        self.search_query = None; self.search_matches = array('I') # Last query and the token index of each match
+        self.search_wait_job = None
+        self.skim_active = False # Skim mode (Ctrl+S): only the best-scoring sentences are played
+        self.skim_future = None # Future of (sentence_starts, scores) for the current tokens
+        self.skim_sentences = None # (sentence_starts, scores) once scored
+        self.repeat_future = None # Future of the token ranges of repeated paragraphs (quoted replies, signatures)
+        self.repeat_ranges = None # Sorted (start, end) token ranges once detected
+        self.repeats_shown = False # Ctrl+D: play the repeated paragraphs after all
+        self.skip_table = None # Next item to show per item (None = every item is played)
+        self.skim_percent_applied = None
+        self.analysis_wait_job = None
 
         self.title("Speed Reader")
 
@@ -86,19 +181,42 @@ class ReadingWindow(tk.Toplevel):
         left_status_frame = ttk.Frame(self.status_bar_frame); left_status_frame.pack(side="left", padx=10)
         self.restart_button = ttk.Button(left_status_frame, text="Neustart", command=self.restart_reading, width=8); self.restart_button.pack(side="left", padx=(0, 10))
         self.status_label_left = ttk.Label(left_status_frame, text="", anchor="w"); self.status_label_left.pack(side="left")
+        self.skim_label = ttk.Label(left_status_frame, text="", anchor="w"); self.skim_label.pack(side="left", padx=(10, 0)) # "Skipped" indicator
         self.status_label_right = ttk.Label(self.status_bar_frame, text="", anchor="e"); self.status_label_right.pack(side="right", padx=10)
 
+        # --- Search Bar (Ctrl+F, packed above the status bar while open) ---
+        self.search_frame = ttk.Frame(self); self.search_var = tk.StringVar()
+        ttk.Label(self.search_frame, text="Suchen:").pack(side="left", padx=(10, 5))
+        self.search_entry = ttk.Entry(self.search_frame, textvariable=self.search_var, width=40); self.search_entry.pack(side="left")
+        self.search_entry.bindtags((self.search_entry, "TEntry", "all")) # Typing must not trigger the reader's shortcuts
+        ttk.Button(self.search_frame, text="<", width=3, command=self.search_previous).pack(side="left", padx=(5, 0))
+        ttk.Button(self.search_frame, text=">", width=3, command=self.search_next).pack(side="left")
+        self.search_status_label = ttk.Label(self.search_frame, text=""); self.search_status_label.pack(side="left", padx=10)
+        self.search_entry.bind("<Return>", self.search_next); self.search_entry.bind("<KP_Enter>", self.search_next)
+        self.search_entry.bind("<Shift-Return>", self.search_previous); self.search_entry.bind("<Escape>", self.close_search)
+
         # --- Keyboard Bindings ---
         self.bind("<space>", self.toggle_pause)
         self.bind("<Escape>", self.close_window)
         self.bind("<Left>", self.rewind_to_sentence_start)
         self.bind("<Right>", self.skip_to_next_sentence_start)
+        self.bind("<Next>", self.skip_to_next_file) # Page Down
+        self.bind("<Prior>", self.rewind_to_file_start) # Page Up
         self.bind("<plus>", self.increase_speed)
         self.bind("<KP_Add>", self.increase_speed)
         self.bind("<minus>", self.decrease_speed)
         self.bind("<KP_Subtract>", self.decrease_speed)
         self.bind("<Return>", self.close_on_enter_at_end)
         self.bind("<KP_Enter>", self.close_on_enter_at_end)
+        self.protocol("WM_DELETE_WINDOW", self.close_window)
+        self.bind("<Control-f>", self.open_search)
+        self.bind("<F3>", self.search_next)
+        self.bind("<Shift-F3>", self.search_previous)
+        self.bind("<Control-k>", self.open_chapter_list)
+        self.bind("<Control-s>", self.toggle_skim)
+        self.bind("<Control-d>", self.toggle_repeats)
+        self.bind("<Control-Next>", self.skip_to_next_chapter)
+        self.bind("<Control-Prior>", self.rewind_to_chapter_start)
 
         # --- Initial Setup ---
         self.update_display_settings(); self.update_status_bar()
@@ -118,15 +236,16 @@ class ReadingWindow(tk.Toplevel):
 
         self.configure(bg=bg_color); self.main_frame.configure(bg=bg_color); self.word_display_canvas.configure(bg=bg_color)
         try:
-            self.widget_font = font.Font(family=font_family, size=font_size)
+            self.widget_font = get_font(font_family, font_size)
             context_font_size = max(8, int(font_size * 0.6))
-            self.context_snippet_font = font.Font(family=font_family, size=context_font_size)
+            self.context_snippet_font = get_font(font_family, context_font_size)
         except tk.TclError as e:
             print(f"Error setting font: {e}. Using default.")
             self.widget_font = font.nametofont("TkDefaultFont")
             self.context_snippet_font = font.nametofont("TkDefaultFont")
 
         self.context_snippet_label.configure(font=self.context_snippet_font, fg=self.context_font_color, bg=bg_color)
+        self.live_snippet = bool(self.config.get("show_continuous_context") and self.config.get("context_snippet_live")); self.live_snippet_end = -1
         try: self.context_snippet_label.configure(wraplength=self.winfo_width() - 120)
         except tk.TclError: pass
 
@@ -134,79 +253,93 @@ class ReadingWindow(tk.Toplevel):
         status_style_name = "Status.TLabel"; status_frame_style = "Status.TFrame"
         self.progress_style.configure(status_style_name, background=status_bg, foreground=status_fg)
         self.progress_style.configure(status_frame_style, background=status_bg)
-        self.status_label_left.configure(style=status_style_name); self.status_label_right.configure(style=status_style_name)
+        self.status_label_left.configure(style=status_style_name); self.status_label_right.configure(style=status_style_name); self.skim_label.configure(style=status_style_name)
         try: self.status_label_left.master.configure(style=status_frame_style)
         except tk.TclError: pass
         self.progress_style.configure("custom.Horizontal.TProgressbar", troughcolor=prog_trough, background=prog_bar)
 
+        self._invalidate_lookahead() # Fonts/colors changed, precomputed layouts are stale
+        if self.display_items and self.orp_settings_key != (self.config.get("orp_position"), self.config.get("chunk_orp_mode")):
+            self._compute_orp_arrays()
+        if self.display_items and self.timeline_settings_key != self._get_timeline_settings_key():
+            self._build_timeline()
+        if self.config.get("hide_repeats") != (self.repeat_ranges is not None or self.repeat_future is not None): self._request_repeat_ranges()
+        if self.skim_active and self.skim_percent_applied != self.config.get("skim_percent"): self._update_skip_table()
         # Don't display item here directly, wait for start sequence
         self.update_status_bar()
 
     def _generate_display_items(self):
-        """Groups raw words into chunks and creates index mapping."""
-        self.display_items = []; self.item_to_word_indices = {}
-        chunk_size = self.config.get("chunk_size");
-        if chunk_size < 1: chunk_size = 1
-        current_chunk_words = []; start_idx_for_current_chunk = 0; word_idx = 0
-        while word_idx < len(self.raw_words):
-            word = self.raw_words[word_idx]
-            if word == "__PARAGRAPH__":
-                if current_chunk_words:
-                    item_index = len(self.display_items); self.display_items.append(" ".join(current_chunk_words))
-                    self.item_to_word_indices[item_index] = (start_idx_for_current_chunk, word_idx)
-                    current_chunk_words = []
-                item_index = len(self.display_items); self.display_items.append(word)
-                self.item_to_word_indices[item_index] = (word_idx, word_idx + 1)
-                word_idx += 1; start_idx_for_current_chunk = word_idx
-            else:
-                if not current_chunk_words: start_idx_for_current_chunk = word_idx
-                current_chunk_words.append(word); word_idx += 1
-                if len(current_chunk_words) >= chunk_size or word_idx >= len(self.raw_words):
-                    item_index = len(self.display_items); self.display_items.append(" ".join(current_chunk_words))
-                    self.item_to_word_indices[item_index] = (start_idx_for_current_chunk, word_idx)
-                    current_chunk_words = []
+        """Groups raw words into chunks, creates index mapping and precomputes ORP indices."""
+        self._invalidate_lookahead()
+        self.display_items, self.item_to_word_indices = group_display_items(self.raw_words, self.config.get("chunk_size"))
+        self.item_word_starts = array('I', (self.item_to_word_indices[item_idx][0] for item_idx in range(len(self.display_items))))
+        self._compute_orp_arrays()
+        self._build_timeline()
+        self._update_skip_table()
+
+    def _compute_orp_arrays(self):
+        """Batch pass: ORP index per token, then the fixation index per display item."""
+        orp_position = self.config.get("orp_position"); chunk_orp_mode = self.config.get("chunk_orp_mode")
+        if self.prepared is not None and abs(self.prepared.orp_position - orp_position) < 1e-6: self.word_orp_indices = self.prepared.orp_indices
+        else: self.word_orp_indices = compute_orp_indices(self.raw_words, orp_position)
+        self.item_orp_indices = compute_item_orp_indices(self.raw_words, self.word_orp_indices, self.display_items, self.item_to_word_indices, orp_position, chunk_orp_mode)
+        self.orp_settings_key = (orp_position, chunk_orp_mode)
+
+    def _build_timeline(self):
+        """Computes per-token weights (if adaptive pacing is on) and the item delay timeline in one pass."""
+        if not self.config.get("adaptive_pacing"): self.token_weights = None
+        elif self.prepared is not None: self.token_weights = self.prepared.weights
+        else: self.token_weights = compute_token_weights(self.raw_words, get_frequency_lookup())
+        self.timeline = build_delay_timeline(self.raw_words, self.display_items, self.item_to_word_indices, self.config, self.token_weights)
+        self.timeline_settings_key = self._get_timeline_settings_key()
+
+    def _get_timeline_settings_key(self):
+        return tuple(self.config.get(key) for key in TIMELINE_SETTING_KEYS)
 
     def _calculate_delay_ms_for_item(self, item_index):
-        """Calculates the display duration in ms for the item, adding extra time for longer items."""
-        if item_index < 0 or item_index >= len(self.display_items): return 10
-        item = self.display_items[item_index]
-        base_delay_s = calculate_delay(self.config.get("wpm")); extra_pause_s = 0.0
-        pause_punct_s = self.config.get("pause_punctuation"); pause_comma_s = self.config.get("pause_comma"); pause_para_s = self.config.get("pause_paragraph")
-
-        if item == "__PARAGRAPH__":
-            extra_pause_s = pause_para_s; total_delay_s = extra_pause_s
-            char_count = 0
-        else:
-            words_in_item = len(item.split())
-            visible_item = item.rstrip(); last_visible_char = visible_item[-1] if visible_item else ''
-            if last_visible_char in ('.', '!', '?', ':', ';'): extra_pause_s = pause_punct_s
-            elif last_visible_char == ',': extra_pause_s = pause_comma_s
-            total_delay_s = (words_in_item * base_delay_s) + extra_pause_s
-            char_count = len(item.replace(" ", ""))
-
-        base_delay_ms = max(10, int(total_delay_s * 1000))
-        extra_length_ms = 0
-        length_threshold = self.config.get("word_length_threshold")
-        extra_ms_per_char = self.config.get("extra_ms_per_char")
-        if char_count > length_threshold:
-             extra_length_ms = (char_count - length_threshold) * extra_ms_per_char
-        final_delay_ms = base_delay_ms + extra_length_ms
-        return final_delay_ms
-
-    def start_reading(self, text):
-        """Processes text, generates items, then starts reading sequence after delay."""
-        self.raw_words = preprocess_text(text)
+        """Returns the display duration in ms for the item from the precomputed timeline."""
+        if self.timeline is None: return 10
+        return self.timeline.delay_ms(item_index, self.config.get("wpm"))
+
+    def start_reading(self, text, title=None, headings=None, source_path=None):
+        """
+        Processes text (or a TokenizedText / PreparedDocument), generates items, then starts reading sequence after delay.
+        headings: the extractor's (character offset, level, title) chapter starts; a PreparedDocument brings its own.
+        source_path: the file the text came from; reading resumes where it was left (also if the file was edited since).
+        """
+        self._close_stream(); self.source_path = source_path
+        if isinstance(text, PreparedDocument): self._start_session(text.tokenized, title, prepared=text, chapters=text.chapters); return
+        if not isinstance(text, TokenizedText): text = tokenize_with_offsets(text if isinstance(text, str) else "")
+        self._start_session(text, title, chapters=map_headings_to_tokens(text.starts, headings or ()))
+
+    def start_reading_stream(self, source, title=None):
+        """Reads a StreamingTextSource: only a few tokenized windows around the position are kept in memory."""
+        self._close_stream(); self.source_path = None
+        self.stream_source = source; self.stream_windows = [(0, source.load_window(0))]; self.stream_word_offset = 0
+        self._start_session(self.stream_windows[0][1], title or source.title)
+
+    def _set_source(self, tokenized, prepared=None):
+        self.raw_words = tokenized.tokens; self.source_text = tokenized.text; self.prepared = prepared
+        self.token_starts = tokenized.starts; self.token_ends = tokenized.ends; self.live_snippet_end = -1
+
+    def _start_session(self, tokenized, title, prepared=None, chapters=()):
+        self._set_source(tokenized, prepared)
+        self.file_word_starts = [0]; self.file_titles = [title or ""]; self._set_chapters(list(chapters))
         if not self.raw_words: messagebox.showinfo("Leerer Text", "Kein Text zum Lesen gefunden.", parent=self); self.close_window(); return
         self._generate_display_items()
         if not self.display_items: messagebox.showinfo("Leerer Text", "Keine anzeigbaren Wörter nach Verarbeitung gefunden.", parent=self); self.close_window(); return
+        self._start_background_analysis()
+
+        resume_word = find_reading_position(self.source_path, self.raw_words) if self.source_path and self.config.get("remember_position") else 0
 
         self.restart_reading(update_ui=False) # Reset state
         self.update_display_settings() # Apply theme/fonts
-        self.current_item_index = 0 # Ensure we start at index 0
+        self.current_item_index = self._find_item_index_for_word_index(resume_word) # 0 unless resumed
+        if resume_word: self.skim_label.config(text=f"Fortgesetzt bei Wort {resume_word + 1} (Neustart: von vorn)")
         self.update_progress() # Show initial progress (0)
         self.update_status_bar() # Show initial status (e.g., "Block 1 / ...")
         # Clear canvas and context snippet initially
-        self.word_display_canvas.delete("all")
+        self._clear_canvas()
         try:
             if self.context_snippet_label.winfo_exists(): self.context_snippet_label.config(text="") # KORRIGIERT: Snippet initial leeren
         except tk.TclError: pass
@@ -218,17 +351,129 @@ class ReadingWindow(tk.Toplevel):
         self.update_idletasks()
         self.reading_job = self.after(initial_delay, self.schedule_next_item)
 
+    def append_text(self, text, title=None, headings=None):
+        """
+        Appends the next file of a reading queue to the running session, separated by a file marker.
+        The file (and its headings, if given) is added to the chapter list.
+        Existing items keep their indices, so the current position is not affected.
+
+        Returns:
+            bool: False if the text contained no words.
+        """
+        if self.stream_source: print(f"Cannot append '{title}' to a streamed file session."); return False
+        tokenized = text if isinstance(text, TokenizedText) else tokenize_with_offsets(text)
+        text = tokenized.text; new_words = tokenized.tokens
+        if not new_words: print(f"Skipping empty file: {title}"); return False
+        if self.prepared is not None: # Opened from a bundle: its per-token arrays are read-only views and cover the first file only
+            self.prepared = None; self.raw_words = list(self.raw_words); self.word_orp_indices = array('i')
+            self.token_starts = array('I', self.token_starts); self.token_ends = array('I', self.token_ends)
+        self.file_word_starts.append(len(self.raw_words)); self.file_titles.append(title or f"Datei {len(self.file_titles) + 1}")
+        self.source_path = None # Several files: no single position to remember
+        # The file marker's span is the title line of the separator, so snippets show it in the source text
+        separator = f"\n\n§ {self.file_titles[-1]}\n\n"; base = len(self.source_text); text_base = base + len(separator)
+        self.token_starts.append(base + 2); self.token_ends.append(text_base - 2)
+        self.token_starts.extend(start + text_base for start in tokenized.starts); self.token_ends.extend(end + text_base for end in tokenized.ends)
+        self.source_text += separator + text
+        file_word_start = len(self.raw_words)
+        self.raw_words.append(FILE_MARKER); self.raw_words.extend(new_words)
+        chapters = self.chapters if len(self.file_titles) > 2 else [(0, 0, self.file_titles[0])] + self.chapters # First append: the first file becomes an entry too
+        chapters.append((file_word_start, 0, self.file_titles[-1]))
+        chapters.extend((file_word_start + 1 + token_idx, level, chapter_title) for token_idx, level, chapter_title in map_headings_to_tokens(tokenized.starts, headings or ()))
+        self._set_chapters(chapters)
+        self._start_background_analysis(); self._generate_display_items()
+        print(f"Appended '{title}' ({len(new_words)} words) to reading session.")
+        if self.at_end and not self.paused: self.schedule_next_item() # Reader already finished: continue seamlessly
+        else: self.update_progress(); self.update_status_bar()
+        return True
+
+    def _get_file_index_for_word(self, word_idx):
+        return max(0, bisect_right(self.file_word_starts, word_idx) - 1)
+
+    def _get_file_index_for_item(self, item_idx):
+        safe_idx = max(0, min(item_idx, len(self.display_items) - 1))
+        return self._get_file_index_for_word(self.item_to_word_indices.get(safe_idx, (0, 0))[0])
+
+    # --- Streamed files: bounded neighbourhood of tokenized windows ---
+    def _current_word_index(self):
+        if self.current_item_index >= len(self.display_items): return len(self.raw_words)
+        return self.item_to_word_indices.get(max(0, self.current_item_index), (0, 0))[0]
+
+    def _check_stream_window(self, block=False):
+        """
+        Keeps the resident windows around the reading position. Entering the last resident window
+        tokenizes the next one and builds the display state of the shifted windows on the worker thread,
+        then swaps it in once it is ready (or right away if block); entering the first one loads the
+        previous window (already indexed) and rebuilds synchronously.
+        """
+        if not self.stream_source or not self.stream_windows: return
+        word_idx = self._current_word_index()
+        last_window_idx, last_window = self.stream_windows[-1]
+        if word_idx >= len(self.raw_words) - len(last_window.tokens) and self.stream_source.has_window(last_window_idx + 1):
+            if self.stream_prefetch is None or self.stream_prefetch[0] != last_window_idx + 1:
+                if block: self._shift_stream_windows(append=(last_window_idx + 1, self.stream_source.load_window(last_window_idx + 1))); return
+                window_future = self.stream_source.load_window_async(last_window_idx + 1)
+                self.stream_prefetch = (last_window_idx + 1, self._get_worker().submit(_prepare_stream_shift, list(self.stream_windows), last_window_idx + 1, window_future, self._get_stream_settings(), get_frequency_lookup()))
+                return
+            window_idx, future = self.stream_prefetch
+            if not block and not future.done(): return
+            self.stream_prefetch = None
+            try: windows, state = future.result()
+            except Exception as e: print(f"Error loading text window {window_idx}: {e}"); traceback.print_exc(); return
+            global_word_idx = self.stream_word_offset + self._current_word_index()
+            self.stream_windows = windows; self._set_stream_state(state, global_word_idx)
+            print(f"Text windows resident: {[idx for idx, _ in self.stream_windows]} ({len(self.raw_words)} tokens)")
+        elif word_idx < len(self.stream_windows[0][1].tokens) and self.stream_windows[0][0] > 0:
+            first_window_idx = self.stream_windows[0][0]
+            self._shift_stream_windows(prepend=(first_window_idx - 1, self.stream_source.load_window(first_window_idx - 1)))
+
+    def _shift_stream_windows(self, append=None, prepend=None):
+        """Adds a window at one end, drops the farthest one beyond RESIDENT_WINDOWS and keeps the position."""
+        global_word_idx = self.stream_word_offset + self._current_word_index()
+        if append:
+            self.stream_windows.append(append)
+            if len(self.stream_windows) > RESIDENT_WINDOWS: self.stream_windows.pop(0)
+        if prepend:
+            self.stream_windows.insert(0, prepend); self.stream_prefetch = None
+            if len(self.stream_windows) > RESIDENT_WINDOWS: self.stream_windows.pop()
+        self._rebuild_stream_words(global_word_idx)
+        print(f"Text windows resident: {[idx for idx, _ in self.stream_windows]} ({len(self.raw_words)} tokens)")
+
+    def _get_stream_settings(self):
+        return {key: self.config.get(key) for key in STREAM_SETTING_KEYS}
+
+    def _rebuild_stream_words(self, global_word_idx):
+        self._set_stream_state(_build_stream_state(self.stream_windows, self._get_stream_settings(), get_frequency_lookup()), global_word_idx)
+
+    def _set_stream_state(self, state, global_word_idx):
+        """Swaps in the display state of the resident windows (see _build_stream_state) and keeps the position."""
+        (self.raw_words, self.source_text, self.token_starts, self.token_ends, self.display_items, self.item_to_word_indices,
+         self.item_word_starts, self.word_orp_indices, self.item_orp_indices, self.token_weights, self.timeline, settings) = state
+        self.live_snippet_end = -1; self._invalidate_lookahead()
+        self.stream_word_offset = self.stream_source.window_token_starts[self.stream_windows[0][0]]
+        self.orp_settings_key = (settings["orp_position"], settings["chunk_orp_mode"]); self.timeline_settings_key = tuple(settings[key] for key in TIMELINE_SETTING_KEYS)
+        if settings != self._get_stream_settings(): self._generate_display_items() # Settings changed while the state was built on the worker
+        else: self._update_skip_table()
+        local_word_idx = global_word_idx - self.stream_word_offset
+        if local_word_idx >= len(self.raw_words): self.current_item_index = len(self.display_items)
+        else: self.current_item_index = self._find_item_index_for_word_index(local_word_idx)
+
+    def _close_stream(self):
+        if self.stream_source: self.stream_source.close()
+        self.stream_source = None; self.stream_windows = []; self.stream_word_offset = 0; self.stream_prefetch = None
+
     def restart_reading(self, event=None, update_ui=True):
         """Resets reading to the beginning."""
         print("Restarting reading..."); self.current_item_index = 0; self.paused = False; self.at_end = False
-        self.progress_var.set(0.0)
+        self.progress_var.set(0.0); self.progress_shown = 0.0
         if self.reading_job: self.after_cancel(self.reading_job); self.reading_job = None
+        if self.stream_source and self.stream_windows and self.stream_windows[0][0] != 0:
+            self.stream_windows = [(0, self.stream_source.load_window(0))]; self.stream_prefetch = None; self._rebuild_stream_words(0)
         if not self.display_items: return
-        self.progress_bar.config(maximum=len(self.display_items))
+        self.update_progress()
 
         if update_ui:
             # Clear canvas and context snippet
-            self.word_display_canvas.delete("all")
+            self._clear_canvas()
             try:
                 if self.context_snippet_label.winfo_exists(): self.context_snippet_label.config(text="") # KORRIGIERT: Snippet initial leeren
             except tk.TclError: pass
@@ -244,57 +489,127 @@ class ReadingWindow(tk.Toplevel):
         """Displays current item, calculates its delay, and schedules the next call."""
         if self.reading_job: self.after_cancel(self.reading_job); self.reading_job = None
         if self.paused: self.update_status_bar(); return
+        if self.stream_source: self._check_stream_window(block=self.current_item_index >= len(self.display_items))
+        if self.skip_table is not None: self._skip_hidden_items()
         if self.current_item_index >= len(self.display_items):
-            self.display_item("--- Ende ---"); self.progress_var.set(len(self.display_items)); self.update_status_bar(); self.at_end = True; return
+            self.at_end = True; self.display_item("--- Ende ---"); self.update_progress(); self.update_status_bar(); return
+        if self.config.get("wpm") >= FRAME_CLOCK_MIN_WPM: self.frame_deadline = None; self._run_frame_clock(); return
 
-        self.at_end = False
-        self.display_item(); self.update_progress(); self.update_status_bar()
+        tick_start = time.perf_counter(); self.at_end = False
+        self.display_item(); self._refresh_status_throttled(tick_start)
+        if self.live_snippet: self._update_live_snippet(self.current_item_index)
         actual_delay_ms = self._calculate_delay_ms_for_item(self.current_item_index)
         self.current_item_index += 1
-        self.reading_job = self.after(actual_delay_ms, self.schedule_next_item)
+        # The time spent rendering this tick (incl. status refresh) is part of the item's display time
+        elapsed_ms = int((time.perf_counter() - tick_start) * 1000)
+        self.reading_job = self.after(max(1, actual_delay_ms - elapsed_ms), self.schedule_next_item)
+        self._schedule_lookahead() # Precompute upcoming layouts while this item is shown
+
+    def _run_frame_clock(self):
+        """
+        High-WPM playback: one callback per display frame. The monotonic clock decides which item
+        should be visible now; items whose whole duration fell between two frames are skipped,
+        so the perceived speed matches the configured WPM up to the refresh rate.
+        """
+        self.reading_job = None
+        if self.paused: self.frame_deadline = None; return
+        wpm = self.config.get("wpm")
+        if wpm < FRAME_CLOCK_MIN_WPM: self.frame_deadline = None; self.schedule_next_item(); return # Slowed down: back to per-item timers
+        now = time.perf_counter()
+        if self.frame_deadline is None: self.frame_deadline = now
+        advanced = False
+        while now >= self.frame_deadline:
+            if self.stream_source: self._check_stream_window(block=self.current_item_index >= len(self.display_items))
+            if self.skip_table is not None: self._skip_hidden_items()
+            if self.current_item_index >= len(self.display_items):
+                self.frame_deadline = None; self.at_end = True
+                self.display_item("--- Ende ---"); self.update_progress(); self.update_status_bar(); return
+            self.frame_deadline += self.timeline.duration_s(self.current_item_index, wpm) if self.timeline else FRAME_PERIOD_MS / 1000.0
+            self.current_item_index += 1; advanced = True
+        if advanced:
+            self.at_end = False; self.current_item_index -= 1 # Render only the item visible at 'now'
+            self.display_item(); self._refresh_status_throttled(now)
+            if self.live_snippet: self._update_live_snippet(self.current_item_index)
+            self.current_item_index += 1
+            self._schedule_lookahead()
+        wait_ms = max(FRAME_PERIOD_MS, int((self.frame_deadline - time.perf_counter()) * 1000))
+        self.reading_job = self.after(wait_ms, self._run_frame_clock)
+
+    def _get_snippet_char_budget(self):
+        """Characters that fit into the snippet label, from its pixel width and the cached average char width of its font."""
+        try: width_px = self.context_snippet_label.winfo_width() - 2 * int(self.context_snippet_label.cget("padx"))
+        except tk.TclError: width_px = 0
+        if width_px <= 1: width_px = max(200, self.winfo_width() - 120) # Not mapped yet
+        try: char_width = get_average_char_width(self.context_snippet_font) if self.context_snippet_font else 8.0
+        except tk.TclError: char_width = 8.0
+        return max(20, int(width_px * SNIPPET_LINES / char_width))
+
+    def _render_snippet(self, item_idx, lead_share, markers):
+        """
+        Cuts the snippet around an item straight from the source text via the token offset index.
+
+        Returns:
+            tuple: (snippet text, source character offset where the snippet ends), or ("", -1).
+        """
+        safe_idx = max(0, min(item_idx, len(self.display_items) - 1))
+        start_word, end_word = self.item_to_word_indices.get(safe_idx, (0, 0))
+        if not self.source_text or end_word <= start_word or end_word > len(self.token_starts): return "", -1
+        focus_start = self.token_starts[start_word]; focus_end = self.token_ends[end_word - 1]
+        budget = self._get_snippet_char_budget()
+        lead = int(budget * lead_share); trail = max(0, budget - lead - (focus_end - focus_start))
+        # Snap to whole tokens: first token starting after the lead limit, last token ending before the trail limit
+        first_word = min(start_word, bisect_left(self.token_starts, max(0, focus_start - lead)))
+        last_word = max(end_word - 1, bisect_right(self.token_ends, focus_end + trail) - 1)
+        snippet_start = self.token_starts[first_word]; snippet_end = self.token_ends[last_word]
+        source = self.source_text
+        if markers: snippet = source[snippet_start:focus_start] + "▶" + source[focus_start:focus_end] + "◀" + source[focus_end:snippet_end]
+        else: snippet = source[snippet_start:snippet_end]
+        snippet = " ".join(PARAGRAPH_BREAK.sub(" ¶ ", snippet).split())
+        if snippet_start > 0: snippet = "... " + snippet
+        if snippet_end < len(source): snippet += " ..."
+        return snippet, snippet_end
 
     def _get_context_snippet(self, current_item_idx):
-        """Generates a text snippet around the current reading position."""
-        safe_idx = max(0, min(current_item_idx, len(self.display_items) - 1))
-        if not self.raw_words or not self.item_to_word_indices or safe_idx not in self.item_to_word_indices: return ""
-        word_indices = self.item_to_word_indices.get(safe_idx);
-        if not word_indices: return ""
-        current_start_word_idx, current_end_word_idx = word_indices
-        center_focus_idx = current_start_word_idx
-        words_before = CONTEXT_SNIPPET_WORDS; words_after = CONTEXT_SNIPPET_WORDS
-        snippet_start_idx = max(0, center_focus_idx - words_before)
-        snippet_end_idx = min(len(self.raw_words), center_focus_idx + words_after + (current_end_word_idx - current_start_word_idx))
-        snippet_words = self.raw_words[snippet_start_idx:snippet_end_idx]
-        processed_snippet = []
-        for i, word in enumerate(snippet_words):
-            actual_word_idx = snippet_start_idx + i
-            is_current = (current_start_word_idx <= actual_word_idx < current_end_word_idx)
-            display_word = "¶" if word == "__PARAGRAPH__" else word
-            if is_current: processed_snippet.append(f"▶{display_word}◀")
-            else: processed_snippet.append(display_word)
-
-        snippet_text = " ".join(processed_snippet)
-
-        if len(snippet_text) > MAX_SNIPPET_LEN:
-            break_point = snippet_text.rfind(" ", 0, MAX_SNIPPET_LEN - 3)
-            if break_point == -1: snippet_text = snippet_text[:MAX_SNIPPET_LEN - 3] + "..."
-            else: snippet_text = snippet_text[:break_point] + " ..."
-        return snippet_text
+        """Generates a text snippet around the current reading position, marking the current item."""
+        return self._render_snippet(current_item_idx, SNIPPET_LEAD_SHARE, markers=True)[0]
+
+    def _update_live_snippet(self, item_idx):
+        """Live snippet during playback: only re-rendered when the reading position has run past the shown text."""
+        start_word = self.item_to_word_indices.get(item_idx, (0, 0))[0]
+        if start_word >= len(self.token_starts) or 0 <= self.token_starts[start_word] < self.live_snippet_end: return
+        snippet, self.live_snippet_end = self._render_snippet(item_idx, LIVE_SNIPPET_LEAD_SHARE, markers=False)
+        try: self.context_snippet_label.config(text=snippet)
+        except tk.TclError: pass
 
+    def _clear_canvas(self):
+        """Removes all canvas items and forgets the pooled text item ids."""
+        self.word_display_canvas.delete("all"); self.canvas_text_ids = []
 
-    def display_item(self, item=None):
-        """Displays item on Canvas, optionally with context, maintaining ORP fixed point."""
+    def _invalidate_lookahead(self):
+        """Drops all precomputed layouts (after font/color/layout or text changes)."""
+        self.layout_ring = [None] * LOOKAHEAD_ITEMS
+
+    def _get_canvas_size(self):
+        try: return (self.word_display_canvas.winfo_width(), self.word_display_canvas.winfo_height())
+        except tk.TclError: return None
+
+    def _compute_item_layout(self, item_index, canvas_size, item=None):
+        """
+        Computes the canvas layout for an item without touching the canvas.
+
+        Returns:
+            tuple: (x, y, text, anchor, fill) specs for every text item to draw.
+        """
         item_to_display = ""; is_special_message = item is not None
         prev_item_context = ""; next_item_context = ""
-        # context_snippet = "" # Snippet wird nur noch bei Pause aktualisiert
-
-        safe_current_idx = max(0, min(self.current_item_index, len(self.display_items) - 1))
-        if self.at_end and len(self.display_items) > 0: safe_current_idx = len(self.display_items) - 1
+        safe_current_idx = max(0, min(item_index, len(self.display_items) - 1))
 
         if not is_special_message:
-            if 0 <= self.current_item_index < len(self.display_items):
-                 item_to_display = self.display_items[self.current_item_index]
+            if 0 <= item_index < len(self.display_items):
+                 item_to_display = self.display_items[item_index]
                  if item_to_display == "__PARAGRAPH__": item_to_display = ""
+                 elif item_to_display == FILE_MARKER: # Chapter separator between files
+                      item_to_display = f"— {self.file_titles[self._get_file_index_for_item(item_index)]} —"; is_special_message = True
             else: item_to_display = ""
 
             # --- Get Context Items for Vertical/Horizontal Display ---
@@ -302,90 +617,151 @@ class ReadingWindow(tk.Toplevel):
                 prev_idx = safe_current_idx - 1
                 if 0 <= prev_idx < len(self.display_items):
                      prev_item_context = self.display_items[prev_idx]
-                     if prev_item_context == "__PARAGRAPH__": prev_item_context = ""
+                     if prev_item_context in MARKER_TOKENS: prev_item_context = ""
                 next_idx = safe_current_idx + 1
-                if self.current_item_index < len(self.display_items) -1 and 0 <= next_idx < len(self.display_items):
+                if item_index < len(self.display_items) -1 and 0 <= next_idx < len(self.display_items):
                      next_item_context = self.display_items[next_idx]
-                     if next_item_context == "__PARAGRAPH__": next_item_context = ""
+                     if next_item_context in MARKER_TOKENS: next_item_context = ""
         else: item_to_display = item
 
-        canvas = self.word_display_canvas; canvas.delete("all")
         if not self.widget_font: self.update_display_settings();
         if not self.widget_font: self.widget_font = font.nametofont("TkDefaultFont")
-        try: canvas_width = canvas.winfo_width(); canvas_height = canvas.winfo_height(); center_x = canvas_width / 2; center_y = canvas_height / 2
-        except tk.TclError: return
-
-        # --- Update Continuous Context Label - REMOVED from here ---
-        # (wird nur noch in toggle_pause bei self.paused=True gesetzt)
+        canvas_width, canvas_height = canvas_size; center_x = canvas_width / 2; center_y = canvas_height / 2
 
         show_context_vh = self.config.get("show_context")
         context_layout = self.config.get("context_layout")
         main_word_start_x = center_x; main_word_end_x = center_x; main_word_width_total = 0
+        specs = []
 
-        # --- Draw Main Item (potentially with ORP) ---
+        # --- Main Item (potentially with ORP) ---
         if item_to_display:
-            apply_orp = (self.config.get("enable_orp") and self.config.get("chunk_size") == 1 and not is_special_message)
+            apply_orp = (self.config.get("enable_orp") and not is_special_message and item_index < len(self.item_orp_indices))
             if apply_orp:
-                word_len = len(item_to_display); orp_pos_float = self.config.get("orp_position")
-                orp_index = calculate_orp_index(item_to_display, orp_pos_float)
-                if orp_index != -1:
+                orp_index = self.item_orp_indices[item_index] # Precomputed in _compute_orp_arrays
+                if 0 <= orp_index < len(item_to_display):
                     part1 = item_to_display[:orp_index]; orp_char = item_to_display[orp_index]; part2 = item_to_display[orp_index+1:]
                     try:
                         width_before = self.widget_font.measure(part1); width_orp = self.widget_font.measure(orp_char); width_after = self.widget_font.measure(part2)
                         x_orp_start = center_x - (width_orp / 2); x_part1_start = x_orp_start - width_before; x_part2_start = x_orp_start + width_orp
-                        if part1: canvas.create_text(x_part1_start, center_y, text=part1, anchor='w', font=self.widget_font, fill=self.font_color)
-                        canvas.create_text(x_orp_start, center_y, text=orp_char, anchor='w', font=self.widget_font, fill=self.highlight_color)
-                        if part2: canvas.create_text(x_part2_start, center_y, text=part2, anchor='w', font=self.widget_font, fill=self.font_color)
+                        if part1: specs.append((x_part1_start, center_y, part1, 'w', self.font_color))
+                        specs.append((x_orp_start, center_y, orp_char, 'w', self.highlight_color))
+                        if part2: specs.append((x_part2_start, center_y, part2, 'w', self.font_color))
                         main_word_start_x = x_part1_start if part1 else x_orp_start
                         main_word_end_x = x_part2_start + width_after if part2 else x_orp_start + width_orp
                         main_word_width_total = main_word_end_x - main_word_start_x
-                    except tk.TclError as e: print(f"Error measuring/drawing ORP: {e}"); apply_orp = False
-                    except Exception as e: print(f"Unexpected error: {e}"); traceback.print_exc(); apply_orp = False
+                    except tk.TclError as e: print(f"Error measuring ORP: {e}"); apply_orp = False; specs = []
+                    except Exception as e: print(f"Unexpected error: {e}"); traceback.print_exc(); apply_orp = False; specs = []
                 else: apply_orp = False
             if not apply_orp:
-                 canvas.create_text(center_x, center_y, text=item_to_display, anchor='center', font=self.widget_font, fill=self.font_color)
+                 specs.append((center_x, center_y, item_to_display, 'center', self.font_color))
                  try: main_word_width_total = self.widget_font.measure(item_to_display)
                  except tk.TclError: main_word_width_total = 0
                  main_word_start_x = center_x - main_word_width_total / 2
                  main_word_end_x = center_x + main_word_width_total / 2
 
-        # --- Draw Vertical/Horizontal Context ---
+        # --- Vertical/Horizontal Context ---
         if show_context_vh and not is_special_message:
             try:
                 line_height = self.widget_font.metrics('linespace') * 1.1
                 if context_layout == "vertical":
                     y_prev = center_y - line_height; y_next = center_y + line_height
-                    if prev_item_context: canvas.create_text(center_x, y_prev, text=prev_item_context, anchor='center', font=self.widget_font, fill=self.context_font_color)
-                    if next_item_context: canvas.create_text(center_x, y_next, text=next_item_context, anchor='center', font=self.widget_font, fill=self.context_font_color)
+                    if prev_item_context: specs.append((center_x, y_prev, prev_item_context, 'center', self.context_font_color))
+                    if next_item_context: specs.append((center_x, y_next, next_item_context, 'center', self.context_font_color))
                 elif context_layout == "horizontal":
                     w_space2 = self.widget_font.measure("  ")
                     if prev_item_context:
                         w_prev = self.widget_font.measure(prev_item_context)
                         x_prev = main_word_start_x - w_space2 - w_prev
-                        canvas.create_text(x_prev, center_y, text=prev_item_context, anchor='w', font=self.widget_font, fill=self.context_font_color)
+                        specs.append((x_prev, center_y, prev_item_context, 'w', self.context_font_color))
                     if next_item_context:
                         x_next = main_word_end_x + w_space2
-                        canvas.create_text(x_next, center_y, text=next_item_context, anchor='w', font=self.widget_font, fill=self.context_font_color)
-            except Exception as e: print(f"Error drawing context: {e}")
+                        specs.append((x_next, center_y, next_item_context, 'w', self.context_font_color))
+            except Exception as e: print(f"Error laying out context: {e}")
+        return tuple(specs)
+
+    def _get_item_layout(self, item_index, canvas_size):
+        """Returns the precomputed layout from the lookahead ring, computing it on a miss."""
+        slot = item_index % LOOKAHEAD_ITEMS; entry = self.layout_ring[slot]
+        if entry is not None and entry[0] == item_index and entry[1] == canvas_size: return entry[2]
+        layout = self._compute_item_layout(item_index, canvas_size)
+        self.layout_ring[slot] = (item_index, canvas_size, layout)
+        return layout
+
+    def _prefill_lookahead(self):
+        """Idle callback: precomputes layouts for the next LOOKAHEAD_ITEMS items into the ring buffer."""
+        self.lookahead_job = None
+        canvas_size = self._get_canvas_size()
+        if not canvas_size or not self.display_items: return
+        end_idx = min(len(self.display_items), self.current_item_index + LOOKAHEAD_ITEMS)
+        try:
+            for item_index in range(self.current_item_index, end_idx): self._get_item_layout(item_index, canvas_size)
+        except tk.TclError: pass
 
+    def _schedule_lookahead(self):
+        if self.lookahead_job is None: self.lookahead_job = self.after_idle(self._prefill_lookahead)
+
+    def _apply_layout(self, layout):
+        """Applies a layout to the pooled canvas text items (no per-word create/delete)."""
+        canvas = self.word_display_canvas
+        while len(self.canvas_text_ids) < len(layout):
+            self.canvas_text_ids.append(canvas.create_text(0, 0, text="", font=self.widget_font))
+        for slot, text_id in enumerate(self.canvas_text_ids):
+            if slot < len(layout):
+                x, y, text, anchor, fill = layout[slot]
+                canvas.coords(text_id, x, y)
+                canvas.itemconfigure(text_id, text=text, anchor=anchor, fill=fill, font=self.widget_font, state='normal')
+            else: canvas.itemconfigure(text_id, state='hidden')
+
+    def display_item(self, item=None):
+        """Displays item on Canvas, optionally with context, maintaining ORP fixed point."""
+        canvas_size = self._get_canvas_size()
+        if not canvas_size: return
+        try:
+            if item is not None: layout = self._compute_item_layout(self.current_item_index, canvas_size, item)
+            else: layout = self._get_item_layout(self.current_item_index, canvas_size)
+            self._apply_layout(layout)
+        except tk.TclError as e: print(f"Error drawing item: {e}")
+
+
+    def _get_progress(self):
+        """Returns (position, total) for the progress bar; streamed files count global tokens against the estimated total."""
+        if not self.stream_source: return (len(self.display_items) if self.at_end else self.current_item_index), len(self.display_items)
+        safe_idx = max(0, min(self.current_item_index, len(self.display_items) - 1))
+        total = max(self.stream_source.estimated_total_tokens(), self.stream_word_offset + len(self.raw_words))
+        if self.at_end: return total, total
+        return self.stream_word_offset + self.item_to_word_indices.get(safe_idx, (0, 0))[0], total
+
+    def _get_remaining_ms(self, item_idx):
+        """Reading time left from item_idx at the current WPM; for streamed files the unread rest is extrapolated."""
+        if self.timeline is None or self.at_end: return 0
+        wpm = self.config.get("wpm"); remaining_ms = self.timeline.remaining_ms(item_idx, wpm)
+        if self.stream_source and self.raw_words:
+            unread_words = self._get_progress()[1] - self.stream_word_offset - len(self.raw_words)
+            if unread_words > 0: remaining_ms += int(unread_words * self.timeline.total_ms(wpm) / len(self.raw_words))
+        return remaining_ms
+
+    def _refresh_status_throttled(self, now):
+        """Refreshes progress and status bar from the playback tick at most every STATUS_REFRESH_MS."""
+        if now < self.status_due: return
+        self.status_due = now + STATUS_REFRESH_MS / 1000.0
+        self.update_progress(); self.update_status_bar()
 
     def update_progress(self):
-        """Updates the progress bar."""
+        """Updates the progress bar (Tk is only touched if the value changed)."""
+        progress_value = 0.0
         if self.display_items:
-            progress_value = self.current_item_index
-            if self.at_end: progress_value = len(self.display_items)
-            try: max_val = self.progress_bar.cget("maximum")
-            except tk.TclError: max_val = len(self.display_items)
-            self.progress_var.set(min(progress_value, max_val))
-        else: self.progress_var.set(0.0)
+            progress_value, max_val = self._get_progress()
+            if max_val != self.progress_maximum:
+                try: self.progress_bar.config(maximum=max(1, max_val)); self.progress_maximum = max_val
+                except tk.TclError: pass
+            progress_value = min(progress_value, max_val)
+        if progress_value != self.progress_shown: self.progress_var.set(progress_value); self.progress_shown = progress_value
 
     def update_status_bar(self):
         """Updates the status bar labels."""
         wpm = self.config.get("wpm"); status_text = f"{wpm} WPM"
+        if self.skim_active: status_text += f" · Überfliegen {self.config.get('skim_percent')} %" + ("" if self.skim_sentences is not None else " (wird berechnet)")
         if self.paused: status_text += " (Pausiert)"
-        try:
-             if self.status_label_left.winfo_exists(): self.status_label_left.config(text=status_text)
-        except tk.TclError: pass
         position_text = ""
         if self.display_items:
             current_display_idx = self.current_item_index
@@ -395,8 +771,17 @@ class ReadingWindow(tk.Toplevel):
             total_items = len(self.display_items)
             if self.at_end: current_display_pos = total_items
             position_text = f"Block {current_display_pos} / {total_items}"
+            if self.stream_source:
+                word_pos, total_words = self._get_progress()
+                position_text = f"Wort {min(word_pos + 1, total_words)} / {'' if self.stream_source.complete else '~'}{total_words}"
+            if len(self.file_titles) > 1: position_text = f"Datei {self._get_file_index_for_item(current_display_idx) + 1} / {len(self.file_titles)} · " + position_text
+            remaining_s = self._get_remaining_ms(current_display_idx) // 1000
+            if remaining_s > 0: position_text += f" · noch {format_duration(remaining_s)}"
+        if (status_text, position_text) == self.status_texts: return # Nothing visible changed
         try:
+            if self.status_label_left.winfo_exists(): self.status_label_left.config(text=status_text)
             if self.status_label_right.winfo_exists(): self.status_label_right.config(text=position_text)
+            self.status_texts = (status_text, position_text)
         except tk.TclError: pass
 
     def toggle_pause(self, event=None):
@@ -405,7 +790,8 @@ class ReadingWindow(tk.Toplevel):
         try:
             if not self.paused:
                 self.at_end = False
-                # --- KORRIGIERT: Snippet leeren beim Fortsetzen ---
+                # --- KORRIGIERT: Snippet leeren beim Fortsetzen (live snippet is re-rendered by the next tick) ---
+                self.live_snippet_end = -1
                 if self.context_snippet_label.winfo_exists():
                      self.context_snippet_label.config(text="")
                 self.schedule_next_item() # Schedule based on current index
@@ -422,7 +808,7 @@ class ReadingWindow(tk.Toplevel):
         except tk.TclError: pass
         except Exception as e: print(f"Error in toggle_pause: {e}"); traceback.print_exc()
 
-        self.update_status_bar()
+        self.update_progress(); self.update_status_bar() # Exact position (playback refreshes are throttled)
 
     # ... (Rest der Methoden: change_speed, close_window, close_on_enter_at_end, _find_item_index_for_word_index, rewind_to_sentence_start, skip_to_next_sentence_start, increase_speed, decrease_speed bleiben unverändert) ...
 
@@ -431,7 +817,15 @@ class ReadingWindow(tk.Toplevel):
         self.config.set("wpm", new_wpm); self.update_status_bar()
 
     def close_window(self, event=None):
+        if self.source_path and self.display_items and self.config.get("remember_position"):
+            word_idx = self.item_word_starts[self.current_item_index] if self.current_item_index < len(self.display_items) else len(self.raw_words)
+            save_reading_position(self.source_path, self.raw_words, word_idx); self.source_path = None
         if self.reading_job: self.after_cancel(self.reading_job); self.reading_job = None
+        if self.lookahead_job: self.after_cancel(self.lookahead_job); self.lookahead_job = None
+        if self.search_wait_job: self.after_cancel(self.search_wait_job); self.search_wait_job = None
+        if self.analysis_wait_job: self.after_cancel(self.analysis_wait_job); self.analysis_wait_job = None
+        if self.worker_executor: self.worker_executor.shutdown(wait=False); self.worker_executor = None
+        self._close_stream()
         try: self.grab_release()
         except tk.TclError: pass
         self.destroy()
@@ -440,20 +834,9 @@ class ReadingWindow(tk.Toplevel):
         if self.at_end: print("Closing window on Enter after end."); self.close_window()
 
     def _find_item_index_for_word_index(self, target_word_index):
-        """Finds the display_item index containing the target raw_word index."""
-        if not self.item_to_word_indices: return 0
-        if target_word_index <= 0: return 0
-        target_item_index = 0
-        sorted_map_items = sorted(self.item_to_word_indices.items(), key=lambda item: item[1][0])
-        for i, (item_idx, (item_start_word, item_end_word)) in enumerate(sorted_map_items):
-            if item_start_word <= target_word_index < item_end_word:
-                 target_item_index = item_idx; break
-            elif item_start_word > target_word_index:
-                 if i > 0: target_item_index = sorted_map_items[i-1][0]
-                 else: target_item_index = 0
-                 break
-            elif i == len(sorted_map_items) - 1: target_item_index = item_idx
-        return max(0, min(target_item_index, len(self.display_items) - 1))
+        """Finds the display_item index containing the target raw_word index (binary search over the item starts)."""
+        if not self.display_items or target_word_index <= 0: return 0
+        return max(0, min(bisect_right(self.item_word_starts, target_word_index) - 1, len(self.display_items) - 1))
 
     def rewind_to_sentence_start(self, event=None):
         """Finds the start of the current/previous sentence and jumps there."""
@@ -467,7 +850,7 @@ class ReadingWindow(tk.Toplevel):
         if start_word_idx_of_current_item == 0: search_idx = -1
         while search_idx >= 0:
             word = self.raw_words[search_idx]
-            if word.endswith(('.', '!', '?', ':')): sentence_start_word_idx = search_idx + 1; break
+            if is_sentence_end(word): sentence_start_word_idx = search_idx + 1; break
             search_idx -= 1
 
         current_sentence_start_item_idx = self._find_item_index_for_word_index(sentence_start_word_idx)
@@ -479,23 +862,13 @@ class ReadingWindow(tk.Toplevel):
             prev_sentence_start_word_idx = 0; search_idx = sentence_start_word_idx - 2
             while search_idx >= 0:
                 word = self.raw_words[search_idx]
-                if word.endswith(('.', '!', '?', ':')): prev_sentence_start_word_idx = search_idx + 1; break
+                if is_sentence_end(word): prev_sentence_start_word_idx = search_idx + 1; break
                 search_idx -= 1
             print(f"Found previous sentence start word index: {prev_sentence_start_word_idx}")
             target_item_index = self._find_item_index_for_word_index(prev_sentence_start_word_idx)
 
         print(f"Rewind: Jumping to item index {target_item_index}")
-        self.paused = True
-        if self.reading_job: self.after_cancel(self.reading_job); self.reading_job = None
-        self.current_item_index = target_item_index
-        self.at_end = False
-        self.display_item(); self.update_progress(); self.update_status_bar()
-        # Update context snippet after jump when pausing
-        if self.config.get("show_continuous_context"):
-            snippet = self._get_context_snippet(self.current_item_index)
-            try:
-                if self.context_snippet_label.winfo_exists(): self.context_snippet_label.config(text=snippet)
-            except tk.TclError: pass
+        self._jump_to_item(target_item_index)
 
 
     def skip_to_next_sentence_start(self, event=None):
@@ -508,7 +881,7 @@ class ReadingWindow(tk.Toplevel):
         next_sentence_start_word_idx = len(self.raw_words)
         search_start_idx = start_word_idx_of_current_item
         if safe_current_idx < len(self.display_items):
-            current_item_is_marker = self.display_items[safe_current_idx] == "__PARAGRAPH__"
+            current_item_is_marker = self.display_items[safe_current_idx] in MARKER_TOKENS
             if current_item_is_marker: search_start_idx = start_word_idx_of_current_item + 1
             else: search_start_idx = self.item_to_word_indices.get(safe_current_idx, (0,0))[1]
         else: search_start_idx = start_word_idx_of_current_item
@@ -516,7 +889,7 @@ class ReadingWindow(tk.Toplevel):
         search_idx = search_start_idx
         while search_idx < len(self.raw_words):
             word = self.raw_words[search_idx]
-            if word.endswith(('.', '!', '?', ':')): next_sentence_start_word_idx = search_idx + 1; break
+            if is_sentence_end(word): next_sentence_start_word_idx = search_idx + 1; break
             search_idx += 1
 
         print(f"Skip Forward: Current item index {self.current_item_index}, search start word {search_start_idx}. Found next sentence start word: {next_sentence_start_word_idx}")
@@ -525,9 +898,14 @@ class ReadingWindow(tk.Toplevel):
         if target_item_index <= self.current_item_index and self.current_item_index < len(self.display_items): target_item_index = self.current_item_index + 1
 
         print(f"Skip Forward: Jumping to item index {target_item_index}")
+        self._jump_to_item(target_item_index)
+
+    def _jump_to_item(self, target_item_index):
+        """Seek path shared by all navigation: pauses, moves to the item and refreshes display, progress, status and snippet."""
         self.paused = True
         if self.reading_job: self.after_cancel(self.reading_job); self.reading_job = None
-        self.current_item_index = target_item_index
+        self.current_item_index = max(0, min(target_item_index, len(self.display_items)))
+        if self.stream_source: self._check_stream_window(block=True)
 
         self.at_end = self.current_item_index >= len(self.display_items)
         self.display_item(); self.update_progress(); self.update_status_bar()
@@ -539,7 +917,232 @@ class ReadingWindow(tk.Toplevel):
                 if self.context_snippet_label.winfo_exists(): self.context_snippet_label.config(text=snippet)
             except tk.TclError: pass
 
+    def skip_to_next_file(self, event=None):
+        """Jumps to the separator of the next file in the session."""
+        if len(self.file_word_starts) < 2 or not self.display_items: return
+        file_idx = self._get_file_index_for_item(self.current_item_index)
+        if file_idx + 1 >= len(self.file_word_starts): print("Already in last file."); return
+        self._jump_to_item(self._find_item_index_for_word_index(self.file_word_starts[file_idx + 1]))
+
+    def rewind_to_file_start(self, event=None):
+        """Jumps to the start of the current file, or to the previous file if already there."""
+        if len(self.file_word_starts) < 2 or not self.display_items: return
+        file_idx = self._get_file_index_for_item(self.current_item_index)
+        target_item_index = self._find_item_index_for_word_index(self.file_word_starts[file_idx])
+        if self.current_item_index <= target_item_index + 1 and file_idx > 0:
+            target_item_index = self._find_item_index_for_word_index(self.file_word_starts[file_idx - 1])
+        self._jump_to_item(target_item_index)
+
+
+    # --- Chapters (Ctrl+K list, Ctrl+Page Down/Up) ---
+    def _set_chapters(self, chapters):
+        self.chapters = chapters; self.chapter_word_starts = array('I', (word_idx for word_idx, _, _ in chapters))
+
+    def _current_chapter_index(self):
+        """Index into chapters of the chapter containing the current item (-1 before the first one)."""
+        item_idx = max(0, min(self.current_item_index, len(self.display_items) - 1))
+        return bisect_right(self.chapter_word_starts, self.item_word_starts[item_idx] if self.item_word_starts else 0) - 1
+
+    def jump_to_chapter(self, chapter_idx):
+        if 0 <= chapter_idx < len(self.chapters): self._jump_to_item(self._find_item_index_for_word_index(self.chapter_word_starts[chapter_idx]))
+
+    def skip_to_next_chapter(self, event=None):
+        if not self.chapters or not self.display_items: return
+        chapter_idx = self._current_chapter_index() + 1
+        if chapter_idx >= len(self.chapters): print("Already in last chapter."); return
+        self.jump_to_chapter(chapter_idx)
+
+    def rewind_to_chapter_start(self, event=None):
+        """Jumps to the start of the current chapter, or to the previous chapter if already there."""
+        if not self.chapters or not self.display_items: return
+        chapter_idx = self._current_chapter_index()
+        if chapter_idx > 0 and self.current_item_index <= self._find_item_index_for_word_index(self.chapter_word_starts[chapter_idx]) + 1: chapter_idx -= 1
+        if chapter_idx >= 0: self.jump_to_chapter(chapter_idx)
+
+    def open_chapter_list(self, event=None):
+        """Shows the chapters in a list; Enter or double click jumps to the selected one."""
+        if not self.chapters: messagebox.showinfo("Kapitel", "Für diesen Text ist kein Inhaltsverzeichnis vorhanden.", parent=self); return
+        if self.chapter_dialog is not None and self.chapter_dialog.winfo_exists(): self.chapter_dialog.lift(); return
+        if not self.paused: self.toggle_pause()
+        dialog = tk.Toplevel(self); dialog.title("Kapitel"); dialog.transient(self); self.chapter_dialog = dialog
+        listbox = tk.Listbox(dialog, width=60, height=min(25, len(self.chapters)), activestyle="dotbox")
+        scrollbar = ttk.Scrollbar(dialog, orient="vertical", command=listbox.yview); listbox.config(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y"); listbox.pack(side="left", fill="both", expand=True)
+        listbox.insert("end", *(("    " * max(0, level - 1)) + (f"§ {title}" if level == 0 else title) for _, level, title in self.chapters))
+        current = max(0, self._current_chapter_index()); listbox.selection_set(current); listbox.activate(current); listbox.see(current)
+        def close(event=None):
+            self.chapter_dialog = None; dialog.destroy()
+            try: self.grab_set(); self.focus_set()
+            except tk.TclError: pass
+        def jump(event=None):
+            selection = listbox.curselection()
+            if selection: chapter_idx = selection[0]; close(); self.jump_to_chapter(chapter_idx)
+        listbox.bind("<Double-Button-1>", jump); listbox.bind("<Return>", jump); dialog.bind("<Escape>", close)
+        dialog.protocol("WM_DELETE_WINDOW", close)
+        dialog.grab_set(); listbox.focus_set()
+
+    # --- Skim mode (Ctrl+S) ---
+    def toggle_skim(self, event=None):
+        if self.stream_source: messagebox.showinfo("Überfliegen", "Das Überfliegen ist bei gestreamten Dateien nicht verfügbar.", parent=self); return
+        self.skim_active = not self.skim_active; self.skim_label.config(text="")
+        print(f"Skim mode {'on' if self.skim_active else 'off'}.")
+        self._update_skip_table()
+        if self.skim_active: self._request_skim_scores()
+        self.update_status_bar()
+
+    def _request_skim_scores(self):
+        """Scores the sentences on the worker thread (once per session text); playback goes on unskimmed meanwhile."""
+        if self.skim_sentences is None and self.skim_future is None:
+            sentence_starts = self.prepared.sentence_starts if self.prepared is not None else None
+            self.skim_future = self._get_worker().submit(score_document, list(self.raw_words), sentence_starts, get_frequency_lookup())
+        self._poll_analysis()
+
+    # --- Repeated paragraphs (Ctrl+D) ---
+    def toggle_repeats(self, event=None):
+        """Shows or collapses again the repeated paragraphs (quoted replies, signatures) found in the session text."""
+        if self.repeat_ranges is None:
+            reason = "werden noch gesucht" if self.repeat_future is not None else "sind ausgeschaltet (Einstellungen) oder bei gestreamten Dateien nicht verfügbar"
+            self.skim_label.config(text=f"Wiederholte Absätze {reason}"); return
+        if not self.repeat_ranges: self.skim_label.config(text="Keine wiederholten Absätze gefunden"); return
+        self.repeats_shown = not self.repeats_shown
+        self.skim_label.config(text=f"{len(self.repeat_ranges)} wiederholte Abschnitte {'eingeblendet' if self.repeats_shown else 'ausgeblendet'}")
+        print(f"Repeated paragraphs {'shown' if self.repeats_shown else 'collapsed'}.")
+        self._update_skip_table()
+
+    def _request_repeat_ranges(self):
+        """Starts the repeat detection on the worker thread if hidden in the settings, else drops the detected ranges."""
+        self.repeat_ranges = None; self.repeat_future = None
+        if self.config.get("hide_repeats") and not self.stream_source and self.raw_words:
+            self.repeat_future = self._get_worker().submit(_find_repeated_token_ranges, self.source_text, array('I', self.token_starts))
+        self._update_skip_table(); self._poll_analysis()
+
+    # --- Skip table (skim mode and collapsed repeats) ---
+    def _poll_analysis(self):
+        """Takes over finished skim scores and repeat ranges from the worker; polls again while one is outstanding."""
+        if self.analysis_wait_job: self.after_cancel(self.analysis_wait_job)
+        self.analysis_wait_job = None; changed = False
+        if self.skim_future is not None and self.skim_future.done():
+            self.skim_sentences = self.skim_future.result(); self.skim_future = None; changed = self.skim_active
+        if self.repeat_future is not None and self.repeat_future.done():
+            self.repeat_ranges = self.repeat_future.result(); self.repeat_future = None; changed = changed or bool(self.repeat_ranges)
+            if self.repeat_ranges:
+                print(f"Collapsing {len(self.repeat_ranges)} runs of repeated paragraphs.")
+                if not self.repeats_shown: self.skim_label.config(text=f"{len(self.repeat_ranges)} wiederholte Abschnitte werden ausgeblendet (Strg+D zeigt sie)")
+        if changed: self._update_skip_table(); self.update_status_bar()
+        if (self.skim_active and self.skim_future is not None) or self.repeat_future is not None:
+            self.analysis_wait_job = self.after(SEARCH_POLL_MS, self._poll_analysis)
+
+    def _update_skip_table(self):
+        """Rebuilds the skip table from skim selection and collapsed repeats (None if nothing is hidden)."""
+        skim = self.skim_active and self.skim_sentences is not None
+        hidden_ranges = self.repeat_ranges if self.repeat_ranges and not self.repeats_shown else ()
+        if not skim and not hidden_ranges: self.skip_table = None; return
+        selected = sentence_starts = None
+        if skim:
+            sentence_starts, scores = self.skim_sentences; percent = self.config.get("skim_percent")
+            selected = select_sentences(scores, percent); self.skim_percent_applied = percent
+        self.skip_table = build_skip_table(self.item_word_starts, selected, sentence_starts, hidden_ranges)
+
+    def _skip_hidden_items(self):
+        """Moves the position past hidden items and shows how many sentences (or repeated paragraphs) were skipped."""
+        item_idx = self.current_item_index
+        if item_idx >= len(self.skip_table): return
+        target_idx = self.skip_table[item_idx]
+        if target_idx == item_idx: return
+        from_word = self.item_word_starts[item_idx]
+        to_word = self.item_word_starts[target_idx] if target_idx < len(self.item_word_starts) else len(self.raw_words)
+        self.current_item_index = target_idx
+        hidden_ranges = self.repeat_ranges if self.repeat_ranges and not self.repeats_shown else ()
+        range_idx = bisect_right(hidden_ranges, (from_word, len(self.raw_words))) - 1
+        if range_idx >= 0 and from_word < hidden_ranges[range_idx][1]:
+            repeats = bisect_left(hidden_ranges, (to_word, 0)) - range_idx
+            text = f"» {repeats} wiederholte{'r Abschnitt' if repeats == 1 else ' Abschnitte'} ausgeblendet (Strg+D)"
+        else:
+            sentence_starts = self.skim_sentences[0]
+            skipped = bisect_left(sentence_starts, to_word) - max(0, bisect_right(sentence_starts, from_word) - 1)
+            text = f"» {skipped} {'Satz' if skipped == 1 else 'Sätze'} übersprungen"
+        try: self.skim_label.config(text=text)
+        except tk.TclError: pass
+
+    # --- Background analysis (worker thread) ---
+    def _get_worker(self):
+        if self.worker_executor is None: self.worker_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reader-worker")
+        return self.worker_executor
+
+    def _start_background_analysis(self):
+        """
+        (Re)builds the search index, the repeated paragraphs (if hidden in the settings) and the skim scores
+        (if skimming) of the session on the worker thread; playback continues meanwhile.
+        """
+        self.search_index = None; self.search_query = None; self.search_matches = array('I')
+        self.skim_sentences = None; self.skim_future = None; self.repeat_ranges = None; self.repeat_future = None; self.skip_table = None
+        if self.stream_source: self.search_future = None; return # Only a few windows are resident
+        self.search_future = self._get_worker().submit(build_search_index, list(self.raw_words)) # Snapshot: append_text extends raw_words
+        self._request_repeat_ranges()
+        if self.skim_active: self._request_skim_scores()
+
+    # --- Search (Ctrl+F) ---
+    def open_search(self, event=None):
+        if self.search_future is None: messagebox.showinfo("Suche", "Die Suche ist bei gestreamten Dateien nicht verfügbar.", parent=self); return
+        if not self.search_frame.winfo_ismapped(): self.search_frame.pack(side="bottom", fill="x", pady=(0, 2))
+        if not self.paused: self.toggle_pause()
+        self.search_entry.focus_set(); self.search_entry.select_range(0, "end")
+
+    def close_search(self, event=None):
+        self.search_frame.pack_forget(); self.focus_set()
+        return "break"
+
+    def search_next(self, event=None): self._search_step(True); return "break"
+    def search_previous(self, event=None): self._search_step(False); return "break"
+
+    def _search_step(self, forward):
+        """Jumps to the next/previous match of the query (wrapping around) through the seek path."""
+        query = self.search_var.get().strip()
+        if not query or self.search_future is None or not self.display_items: return
+        if self.search_index is None:
+            if not self.search_future.done(): # Still indexing: retry shortly
+                self.search_status_label.config(text="Index wird erstellt...")
+                if self.search_wait_job is None: self.search_wait_job = self.after(SEARCH_POLL_MS, self._retry_search, forward)
+                return
+            self.search_index = self.search_future.result()
+        new_query = query != self.search_query
+        if new_query: self.search_query = query; self.search_matches = self.search_index.find(query)
+        if not self.search_matches: self.search_status_label.config(text="Nicht gefunden"); return
+        current_word = self.item_to_word_indices.get(min(self.current_item_index, len(self.display_items) - 1), (0, 0))[0]
+        match_idx = next_match(self.search_matches, current_word - 1 if new_query and forward else current_word, forward) # A new query may match right here
+        self._jump_to_item(self._find_item_index_for_word_index(self.search_matches[match_idx]))
+        self.search_status_label.config(text=f"Treffer {match_idx + 1} / {len(self.search_matches)}")
+
+    def _retry_search(self, forward):
+        self.search_wait_job = None; self._search_step(forward)
 
     def increase_speed(self, event=None): self.change_speed(10)
     def decrease_speed(self, event=None): self.change_speed(-10)
 
+    # --- Remote control (control API) ---
+    def set_speed(self, wpm):
+        self.config.set("wpm", max(10, int(wpm))); self.update_status_bar()
+
+    def pause(self):
+        if not self.paused: self.toggle_pause()
+
+    def resume(self):
+        if self.paused: self.toggle_pause()
+
+    def seek_to_word(self, word_index):
+        """Seeks to a token index (global while streaming, limited to the resident windows); pauses like all navigation."""
+        if not self.display_items: return
+        local_word_idx = max(0, min(word_index - self.stream_word_offset, len(self.raw_words) - 1))
+        self._jump_to_item(self._find_item_index_for_word_index(local_word_idx))
+
+    def get_status(self):
+        """Reading state for status queries: position in tokens and items, speed and remaining time."""
+        item_idx = max(0, min(self.current_item_index, len(self.display_items) - 1))
+        word_idx = self.stream_word_offset + self.item_to_word_indices.get(item_idx, (0, 0))[0]
+        total_words = self._get_progress()[1] if self.stream_source else len(self.raw_words)
+        chapter_idx = self._current_chapter_index() if self.chapters and self.display_items else -1
+        return {"state": "ended" if self.at_end else ("paused" if self.paused else "reading"), "wpm": self.config.get("wpm"),
+                "title": self.file_titles[self._get_file_index_for_item(item_idx)], "chapter": self.chapters[chapter_idx][2] if chapter_idx >= 0 else None,
+                "word": word_idx, "words": total_words,
+                "item": item_idx, "items": len(self.display_items), "remaining_ms": self._get_remaining_ms(item_idx)}
+
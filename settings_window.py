@@ -5,6 +5,8 @@ from tkinter import ttk, font, colorchooser, messagebox
 import sys
 import traceback
 
+from font_registry import get_font, get_font_families
+
 try:
     from pynput import keyboard
     HAS_PYNPUT_SETTINGS = True
@@ -142,6 +144,16 @@ class SettingsWindow(tk.Toplevel):
         ttk.Label(wpm_frame, text="Extra Zeit pro Zeichen:").grid(row=3, column=0, sticky="w", padx=(0, 5), pady=5)
         extra_ms_spinbox = ttk.Spinbox(wpm_frame, from_=0, to=50, increment=1, textvariable=self.settings_vars["extra_ms_per_char"], width=4); extra_ms_spinbox.grid(row=3, column=1, sticky="w", padx=5, pady=5)
         ttk.Label(wpm_frame, text="ms (über Schwelle)").grid(row=3, column=2, columnspan=2, sticky="w", padx=5, pady=5)
+        self.settings_vars["adaptive_pacing"] = tk.BooleanVar(value=self.config.get("adaptive_pacing"))
+        ttk.Checkbutton(wpm_frame, text="Adaptives Timing (Zahlen, Nomen, Klammern länger, häufige Wörter kürzer)", variable=self.settings_vars["adaptive_pacing"]).grid(row=4, column=0, columnspan=4, sticky="w", pady=(5, 2))
+        self.settings_vars["skim_percent"] = tk.IntVar(value=self.config.get("skim_percent"))
+        ttk.Label(wpm_frame, text="Überfliegen (Strg+S):").grid(row=5, column=0, sticky="w", padx=(0, 5), pady=5)
+        skim_spinbox = ttk.Spinbox(wpm_frame, from_=5, to=100, increment=5, textvariable=self.settings_vars["skim_percent"], width=4); skim_spinbox.grid(row=5, column=1, sticky="w", padx=5, pady=5)
+        ttk.Label(wpm_frame, text="% der Sätze (die wichtigsten)").grid(row=5, column=2, columnspan=2, sticky="w", padx=5, pady=5)
+        self.settings_vars["hide_repeats"] = tk.BooleanVar(value=self.config.get("hide_repeats"))
+        ttk.Checkbutton(wpm_frame, text="Wiederholte Absätze ausblenden (zitierte Antworten, Signaturen; Strg+D zeigt sie)", variable=self.settings_vars["hide_repeats"]).grid(row=6, column=0, columnspan=4, sticky="w", pady=(5, 2))
+        self.settings_vars["remember_position"] = tk.BooleanVar(value=self.config.get("remember_position"))
+        ttk.Checkbutton(wpm_frame, text="Leseposition merken (auch wenn die Datei inzwischen bearbeitet wurde)", variable=self.settings_vars["remember_position"]).grid(row=7, column=0, columnspan=4, sticky="w", pady=(2, 2))
         wpm_frame.columnconfigure(1, weight=1)
 
         # --- Chunk Size Section ---
@@ -149,7 +161,7 @@ class SettingsWindow(tk.Toplevel):
         self.settings_vars["chunk_size"] = tk.IntVar(value=self.config.get("chunk_size"))
         ttk.Label(chunk_frame, text="Wörter pro Anzeige:").grid(row=0, column=0, sticky="w", padx=(0, 5), pady=5)
         chunk_spinbox = ttk.Spinbox(chunk_frame, from_=1, to=10, increment=1, textvariable=self.settings_vars["chunk_size"], width=4); chunk_spinbox.grid(row=0, column=1, sticky="w", padx=5, pady=5)
-        ttk.Label(chunk_frame, text="(ORP nur bei 1 aktiv)").grid(row=0, column=2, sticky="w", padx=5, pady=5)
+        ttk.Label(chunk_frame, text="(ORP für Wortgruppen siehe unten)").grid(row=0, column=2, sticky="w", padx=5, pady=5)
 
         # --- Pauses Section ---
         pause_frame = ttk.LabelFrame(self.main_frame, text="Pausen (Millisekunden)", padding="15"); pause_frame.pack(fill="x", pady=(0, 15))
@@ -180,13 +192,16 @@ class SettingsWindow(tk.Toplevel):
         self.settings_vars["show_continuous_context"] = tk.BooleanVar(value=self.config.get("show_continuous_context"))
         cont_context_check = ttk.Checkbutton(appearance_frame, text="Beim pausieren Kontext unten anzeigen (Textausschnitt)", variable=self.settings_vars["show_continuous_context"]);
         cont_context_check.grid(row=3, column=0, columnspan=3, sticky="w", pady=(5, 2)) # Add below layout radios
+        self.settings_vars["context_snippet_live"] = tk.BooleanVar(value=self.config.get("context_snippet_live"))
+        live_context_check = ttk.Checkbutton(appearance_frame, text="Textausschnitt auch während des Lesens anzeigen", variable=self.settings_vars["context_snippet_live"])
+        live_context_check.grid(row=4, column=0, columnspan=3, sticky="w", pady=2, padx=(15, 0))
 
         # --- Font & Colors Section ---
         font_frame = ttk.LabelFrame(self.main_frame, text="Farben & Schriftart (Hell-Modus)", padding="15"); font_frame.pack(fill="x", pady=(0, 15))
         ttk.Label(font_frame, text="Hinweis: Diese Farben gelten für den Hell-Modus.").grid(row=0, column=0, columnspan=3, sticky="w", pady=(0,10))
         self.settings_vars["font_family"] = tk.StringVar(value=self.config.get("font_family")); self.settings_vars["font_size"] = tk.IntVar(value=self.config.get("font_size")); self.settings_vars["font_color"] = tk.StringVar(value=self.config.get("font_color")); self.settings_vars["highlight_color"] = tk.StringVar(value=self.config.get("highlight_color")); self.settings_vars["background_color"] = tk.StringVar(value=self.config.get("background_color"))
         ttk.Label(font_frame, text="Schriftart:").grid(row=1, column=0, sticky="w", pady=5)
-        available_fonts = sorted(font.families()); combo_state = "readonly"; font_combo = ttk.Combobox(font_frame, textvariable=self.settings_vars["font_family"], values=available_fonts, width=25, state=combo_state); font_combo.grid(row=1, column=1, columnspan=2, sticky="ew", padx=5, pady=5); font_combo.bind("<<ComboboxSelected>>", self._update_font_preview)
+        available_fonts = get_font_families(); combo_state = "readonly"; font_combo = ttk.Combobox(font_frame, textvariable=self.settings_vars["font_family"], values=available_fonts, width=25, state=combo_state); font_combo.grid(row=1, column=1, columnspan=2, sticky="ew", padx=5, pady=5); font_combo.bind("<<ComboboxSelected>>", self._update_font_preview)
         if combo_state != "readonly": self.settings_vars["font_family"].trace_add("write", self._update_font_preview)
         ttk.Label(font_frame, text="Größe:").grid(row=2, column=0, sticky="w", pady=5)
         font_size_spinbox = ttk.Spinbox(font_frame, from_=8, to=120, textvariable=self.settings_vars["font_size"], width=5, command=self._update_font_preview); font_size_spinbox.grid(row=2, column=1, sticky="w", padx=5, pady=5); self.settings_vars["font_size"].trace_add("write", self._update_font_preview)
@@ -207,10 +222,15 @@ class SettingsWindow(tk.Toplevel):
         orp_frame = ttk.LabelFrame(self.main_frame, text="Optimal Recognition Point (ORP)", padding="15"); orp_frame.pack(fill="x", pady=(0, 15))
         self.settings_vars["orp_position"] = tk.DoubleVar(value=self.config.get("orp_position")); self.ui_vars["orp_position_percent"] = tk.IntVar(value=int(self.config.get("orp_position") * 100)); self.ui_vars["orp_position_percent"].trace_add("write", self._update_orp_label)
         self.settings_vars["enable_orp"] = tk.BooleanVar(value=self.config.get("enable_orp"))
-        orp_check = ttk.Checkbutton(orp_frame, text="ORP hervorheben (nur bei Wortgröße 1)", variable=self.settings_vars["enable_orp"]); orp_check.grid(row=0, column=0, columnspan=3, sticky="w", pady=(0, 10))
+        orp_check = ttk.Checkbutton(orp_frame, text="ORP hervorheben", variable=self.settings_vars["enable_orp"]); orp_check.grid(row=0, column=0, columnspan=4, sticky="w", pady=(0, 10))
         ttk.Label(orp_frame, text="Position (%):").grid(row=1, column=0, sticky="w", pady=5)
         orp_spinbox = ttk.Spinbox(orp_frame, from_=0, to=100, increment=1, textvariable=self.ui_vars["orp_position_percent"], width=5); orp_spinbox.grid(row=1, column=1, sticky="w", padx=5, pady=5)
         self.orp_label = ttk.Label(orp_frame, text="", width=5, anchor="e"); self.orp_label.grid(row=1, column=2, sticky="e", padx=(5, 0), pady=5)
+        self.settings_vars["chunk_orp_mode"] = tk.StringVar(value=self.config.get("chunk_orp_mode"))
+        ttk.Label(orp_frame, text="Bei Wortgruppen:").grid(row=2, column=0, sticky="w", pady=(5, 2))
+        ttk.Radiobutton(orp_frame, text="Längstes Wort", variable=self.settings_vars["chunk_orp_mode"], value="longest").grid(row=2, column=1, sticky="w", pady=(5, 2), padx=5)
+        ttk.Radiobutton(orp_frame, text="Mitte", variable=self.settings_vars["chunk_orp_mode"], value="center").grid(row=2, column=2, sticky="w", pady=(5, 2), padx=5)
+        ttk.Radiobutton(orp_frame, text="Aus", variable=self.settings_vars["chunk_orp_mode"], value="off").grid(row=2, column=3, sticky="w", pady=(5, 2), padx=5)
 
         # --- Window Options Section ---
         window_frame = ttk.LabelFrame(self.main_frame, text="Fenster Optionen", padding="15"); window_frame.pack(fill="x", pady=(0, 15))
@@ -222,6 +242,8 @@ class SettingsWindow(tk.Toplevel):
              startup_check = ttk.Checkbutton(window_frame, text="Beim Windows-Start ausführen", variable=self.settings_vars["run_on_startup"])
              startup_check.pack(anchor="w", pady=(10, 2))
         else: ttk.Label(window_frame, text="Autostart nur unter Windows verfügbar.", foreground="grey").pack(anchor="w", pady=(10, 2))
+        self.settings_vars["control_api"] = tk.BooleanVar(value=self.config.get("control_api"))
+        ttk.Checkbutton(window_frame, text="Lokale Steuerschnittstelle für Skripte (Text senden, Pause, Tempo)", variable=self.settings_vars["control_api"]).pack(anchor="w", pady=2)
 
         # --- Hotkey Section ---
         hotkey_frame = ttk.LabelFrame(self.main_frame, text="Tastenkürzel (Start aus Zwischenablage)", padding="15"); hotkey_frame.pack(fill="x", pady=(0, 15))
@@ -309,7 +331,7 @@ class SettingsWindow(tk.Toplevel):
             # Schriftart erstellen
             try: # Innerer try-Block für Schriftart-Erstellung
                 preview_font_size = max(8, int(size * 0.6))
-                preview_font = font.Font(family=family, size=preview_font_size)
+                preview_font = get_font(family, preview_font_size)
             # Dieser except-Block fängt Fehler von font.Font() ab:
             except tk.TclError:
                  self.font_preview_label.config(text="Ungültige Schriftart", font=font.nametofont("TkDefaultFont"), fg="red", bg="white")
@@ -428,12 +450,16 @@ class SettingsWindow(tk.Toplevel):
                      if not isinstance(value, int) or value < 0: messagebox.showerror("Ungültiger Wert", f"Startverzögerung: >= 0 ms.", parent=self); return
                 elif key == "word_length_threshold":
                      if not isinstance(value, int) or value < 1: messagebox.showerror("Ungültiger Wert", f"Wortlängen-Schwelle: >= 1.", parent=self); return
+                elif key == "skim_percent":
+                     if not isinstance(value, int) or not (5 <= value <= 100): messagebox.showerror("Ungültiger Wert", f"Überfliegen: 5-100 %.", parent=self); return
                 elif key == "extra_ms_per_char":
                      if not isinstance(value, int) or value < 0: messagebox.showerror("Ungültiger Wert", f"Extra Zeit pro Zeichen: >= 0 ms.", parent=self); return
-                elif key in ["dark_mode", "show_context", "enable_orp", "reader_borderless", "reader_always_on_top", "run_on_startup", "show_continuous_context"]: # Added show_continuous_context
+                elif key in ["dark_mode", "show_context", "enable_orp", "reader_borderless", "reader_always_on_top", "run_on_startup", "show_continuous_context", "context_snippet_live", "adaptive_pacing", "control_api", "hide_repeats", "remember_position"]: # Added show_continuous_context
                      if not isinstance(value, bool): messagebox.showerror("Ungültiger Wert", f"'{key}' muss An/Aus sein.", parent=self); return
                 elif key == "context_layout":
                      if value not in ["vertical", "horizontal"]: messagebox.showerror("Ungültiger Wert", f"'{key}' muss 'vertical' oder 'horizontal' sein.", parent=self); return
+                elif key == "chunk_orp_mode":
+                     if value not in ["longest", "center", "off"]: messagebox.showerror("Ungültiger Wert", f"'{key}' muss 'longest', 'center' oder 'off' sein.", parent=self); return
 
                 # Set validated value in config manager
                 self.config.set(key, value)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# Single-instance handoff over a local IPC endpoint (Unix domain socket, named pipe on Windows).
+# Kept free of Tk, PIL and psutil: a second launch imports only this module before it exits.
+
+import os
+import sys
+import json
+import tempfile
+import threading
+from multiprocessing.connection import Listener, Client, AuthenticationError
+
+# --- Constants ---
+INSTANCE_NAME = "SpeedReader"
+AUTHKEY = b"SpeedReader-instance" # Handshake against stray clients; access control comes from the user-private endpoint
+MAX_REQUEST_BYTES = 64 * 1024
+REPLY_TIMEOUT_S = 2.0
+PING_REQUEST = {"action": "ping"} # Answered by the listener itself, never dispatched
+
+def get_instance_address():
+    """Per-user endpoint: a named pipe on Windows, a socket in the runtime/temp directory elsewhere."""
+    if sys.platform == 'win32':
+        user = "".join(c for c in os.getenv('USERNAME', "user") if c.isalnum()) or "user"
+        return rf"\\.\pipe\{INSTANCE_NAME}-{user}"
+    base_dir = os.getenv('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(base_dir, f"{INSTANCE_NAME.lower()}-{os.getuid()}.sock")
+
+def build_launch_request(argv):
+    """Maps command line arguments to a request: files/folders to read, '--clipboard', or just 'activate'."""
+    if "--clipboard" in argv: return {"action": "read_clipboard"}
+    paths = [os.path.abspath(arg) for arg in argv if not arg.startswith("-")]
+    if paths: return {"action": "read_files", "paths": paths}
+    return {"action": "activate"}
+
+def send_to_running_instance(request, address=None):
+    """
+    Forwards a request to the instance owning the endpoint.
+
+    Returns:
+        bool: True if the request was accepted; False if no instance is listening (also for a stale socket file).
+    """
+    address = address or get_instance_address()
+    if sys.platform != 'win32' and not os.path.exists(address): return False
+    try:
+        with Client(address, authkey=AUTHKEY) as conn:
+            conn.send_bytes(json.dumps(request).encode('utf-8'))
+            return conn.poll(REPLY_TIMEOUT_S) and conn.recv_bytes(16) == b"ok"
+    except (OSError, EOFError, AuthenticationError): return False
+
+class InstanceServer:
+    """The first instance's endpoint; requests of later launches are passed to a callback on the listener thread."""
+    def __init__(self, address=None):
+        self.address = address or get_instance_address()
+        self.listener = None; self.thread = None; self.on_request = None; self.closed = False
+
+    def start(self):
+        """
+        Binds the endpoint. A stale Unix socket (nobody answers a ping) is removed and taken over.
+
+        Returns:
+            bool: False if another instance owns the endpoint.
+        """
+        try: self.listener = Listener(self.address, authkey=AUTHKEY)
+        except OSError as e:
+            if send_to_running_instance(PING_REQUEST, self.address): return False
+            if sys.platform == 'win32': print(f"Warning: Instance endpoint unavailable ({e}), running without handoff."); return True
+            print(f"Removing stale instance socket: {self.address}")
+            try: os.unlink(self.address); self.listener = Listener(self.address, authkey=AUTHKEY)
+            except OSError as e_retry: print(f"Warning: Instance endpoint unavailable ({e_retry}), running without handoff."); return True
+        if sys.platform != 'win32':
+            try: os.chmod(self.address, 0o600)
+            except OSError as e: print(f"Warning: Could not restrict instance socket: {e}")
+        print(f"Instance endpoint: {self.address}")
+        return True
+
+    def serve(self, on_request):
+        """Starts accepting requests; on_request(dict) is called from the listener thread."""
+        if self.listener is None: return
+        self.on_request = on_request
+        self.thread = threading.Thread(target=self._serve, daemon=True, name="instance"); self.thread.start()
+
+    def _serve(self):
+        while not self.closed:
+            try: conn = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError) as e:
+                if self.closed: break
+                print(f"Instance endpoint: rejected connection ({e})"); continue
+            request = None
+            try:
+                with conn:
+                    if not conn.poll(REPLY_TIMEOUT_S): continue
+                    request = json.loads(conn.recv_bytes(MAX_REQUEST_BYTES).decode('utf-8'))
+                    if not isinstance(request, dict): raise ValueError("request is not an object")
+                    conn.send_bytes(b"ok")
+            except (OSError, EOFError, ValueError) as e: print(f"Instance endpoint: invalid request ({e})"); continue
+            if request.get("action") != PING_REQUEST["action"]: self.on_request(request)
+
+    def close(self):
+        """Releases the endpoint (the socket file is unlinked by the listener)."""
+        self.closed = True
+        if self.listener is not None:
+            try: self.listener.close()
+            except OSError as e: print(f"Warning: Could not close instance endpoint: {e}")
+            self.listener = None
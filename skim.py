@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Extractive skim mode: scores every sentence by how much rare, document-specific vocabulary it carries
+# and selects the best share of them. No Tk: scoring runs on the reader's worker thread.
+# The skip table built here also collapses hidden token ranges (repeated paragraphs).
+
+import math
+from array import array
+from bisect import bisect_right
+
+from utils import MARKER_TOKENS, compute_structure_indices
+from text_search import normalize_search_token
+
+# --- Constants ---
+MIN_TERM_CHARS = 3          # Shorter tokens never count as content words
+STOPWORD_FREQUENCY = 40     # Quantized frequency (1-255, relative to the bundled list) from which a word counts as a function word
+LEAD_SENTENCE_BONUS = 1.25  # First sentence of a paragraph (topic sentence)
+
+def score_sentences(words, sentence_starts, frequency_lookup=None):
+    """
+    TF-IDF score per sentence, in two passes over the tokens: document frequencies first, then
+    each sentence's sum of tf * idf over its content words, normalized by the square root of its length.
+
+    Args:
+        words (list): Tokens as returned by tokenize_with_offsets.
+        sentence_starts (array): Token index of every sentence start (see compute_structure_indices).
+        frequency_lookup (callable, optional): word -> quantized frequency; frequent words are skipped as stop words.
+
+    Returns:
+        array: One score per sentence ('f' typecode); 0.0 for sentences without content words.
+    """
+    sentence_count = len(sentence_starts); term_cache = {}
+    def content_term(word):
+        term = term_cache.get(word)
+        if term is None:
+            term = "" if word in MARKER_TOKENS else normalize_search_token(word)
+            if len(term) < MIN_TERM_CHARS or (frequency_lookup is not None and frequency_lookup(term) >= STOPWORD_FREQUENCY): term = ""
+            term_cache[word] = term
+        return term
+    sentence_terms = []; document_frequency = {}
+    for s in range(sentence_count):
+        end = sentence_starts[s + 1] if s + 1 < sentence_count else len(words)
+        counts = {}
+        for i in range(sentence_starts[s], end):
+            term = content_term(words[i])
+            if term: counts[term] = counts.get(term, 0) + 1
+        for term in counts: document_frequency[term] = document_frequency.get(term, 0) + 1
+        sentence_terms.append(counts)
+    idf = {term: math.log((1 + sentence_count) / frequency) for term, frequency in document_frequency.items()}
+    scores = array('f', bytes(4 * sentence_count))
+    for s, counts in enumerate(sentence_terms):
+        if not counts: continue
+        start = sentence_starts[s]; length = sum(counts.values())
+        score = sum(count * idf[term] for term, count in counts.items()) / math.sqrt(length)
+        if start == 0 or words[start - 1] in MARKER_TOKENS: score *= LEAD_SENTENCE_BONUS
+        scores[s] = score
+    return scores
+
+def select_sentences(scores, percent):
+    """Flags (bytearray, 1 = read) of the best-scoring percent of the sentences, at least one; order is kept by the caller."""
+    selected = bytearray(len(scores))
+    keep = max(1, math.ceil(len(scores) * max(0, min(100, percent)) / 100)) if len(scores) else 0
+    for s in sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:keep]: selected[s] = 1
+    return selected
+
+def build_skip_table(item_word_starts, selected=None, sentence_starts=None, hidden_ranges=()):
+    """
+    Per display item, the index of the next item to show (itself if shown). An item is hidden if its
+    sentence is not selected (skim mode) or its first word lies in one of the hidden token ranges.
+    The extra last entry maps the end to itself.
+
+    Args:
+        item_word_starts (array): First token index of every display item.
+        selected (bytearray, optional): Per sentence flag from select_sentences (None = all sentences are read).
+        sentence_starts (array, optional): Token index of every sentence start; needed with selected.
+        hidden_ranges (list): Sorted, non-overlapping (start, end) token ranges to collapse (e.g. repeated paragraphs).
+
+    Returns:
+        array: len(item_word_starts) + 1 item indices ('I' typecode).
+    """
+    item_count = len(item_word_starts); table = array('I', bytes(4 * (item_count + 1))); table[item_count] = item_count
+    hidden_starts = [start for start, _end in hidden_ranges]
+    next_shown = item_count
+    for item_idx in range(item_count - 1, -1, -1):
+        word_idx = item_word_starts[item_idx]; shown = True
+        if selected is not None:
+            sentence_idx = bisect_right(sentence_starts, word_idx) - 1
+            shown = sentence_idx < 0 or selected[sentence_idx] # Text before the first sentence (markers) is shown
+        if shown and hidden_ranges:
+            range_idx = bisect_right(hidden_starts, word_idx) - 1
+            shown = range_idx < 0 or word_idx >= hidden_ranges[range_idx][1]
+        if shown: next_shown = item_idx
+        table[item_idx] = next_shown
+    return table
+
+def score_document(words, sentence_starts=None, frequency_lookup=None):
+    """Worker entry point: (sentence_starts, scores); sentence starts are computed unless a prepared document has them."""
+    if sentence_starts is None: sentence_starts = compute_structure_indices(words)[0]
+    return sentence_starts, score_sentences(words, sentence_starts, frequency_lookup)
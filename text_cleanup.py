@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# Cleanup stages between extraction and tokenization (no Tk, safe to run in worker threads).
+
+import re
+import zlib
+from collections import Counter, deque
+
+from extractors import Heading
+
+# --- PDF page cleanup ---
+EDGE_LINES = 3           # Lines at the top and bottom of a page that may be running headers/footers
+REPEAT_WINDOW_PAGES = 8  # Pages behind the current one in the rolling frequency table
+LOOKAHEAD_PAGES = 3      # Pages buffered ahead, so the first pages see their successors too
+MIN_REPEATS = 3          # An edge line is a header/footer if it occurs on this many pages of the window
+SHORT_LINE_RATIO = 0.75  # A line shorter than this share of the page's typical line length can end a paragraph
+
+PAGE_NUMBER_LINE = re.compile(r"^[\s\-–—|·•]*(?:(?:seite|page|s\.|p\.)\s*)?(?:\d+|[ivxlcdm]+)(?:\s*(?:/|von|of)\s*\d+)?[\s\-–—|·•]*$", re.IGNORECASE)
+DIGITS = re.compile(r"\d+")
+HYPHENATED_END = re.compile(r"[^\W\d_]-$") # Letter followed by a hyphen at the line end
+SENTENCE_END = re.compile(r"[.!?:…][\"'»«“”’)\]]*$")
+HYPHEN_KEEP_WORDS = frozenset(("und", "oder", "bzw.", "sowie", "als", "bis", "and", "or", "to", "nor")) # "Ein- und Ausgang"
+
+def _edge_key(line):
+    """Normalized form of a header/footer candidate: case and whitespace folded, numbers masked."""
+    return DIGITS.sub("#", " ".join(line.split()).casefold())
+
+def _edge_indices(lines):
+    """Indices of the first and last EDGE_LINES non-empty lines of a page."""
+    non_empty = [i for i, line in enumerate(lines) if line.strip()]
+    return set(non_empty[:EDGE_LINES] + non_empty[-EDGE_LINES:])
+
+def _join_lines(previous, line):
+    """Joins a line to the text before it, undoing line-break hyphenation."""
+    if HYPHENATED_END.search(previous):
+        first_word = line.split(None, 1)[0] if line.split() else ""
+        if first_word[:1].islower() and first_word.lower() not in HYPHEN_KEEP_WORDS: return previous[:-1] + line # "Verarbei-" + "tung"
+        if first_word[:1].isupper(): return previous + line # "Software-" + "Entwicklung"
+    return previous + " " + line
+
+def _page_paragraphs(lines):
+    """Splits the (already stripped) lines of one page into paragraphs at blank lines and short sentence-final lines."""
+    lengths = sorted(len(line) for line in lines if line)
+    typical_length = lengths[int(len(lengths) * 0.8)] if lengths else 0
+    paragraphs = []; current = ""
+    for line in lines:
+        if not line:
+            if current: paragraphs.append(current); current = ""
+            continue
+        current = _join_lines(current, line) if current else line
+        if SENTENCE_END.search(line) and len(line) < typical_length * SHORT_LINE_RATIO: paragraphs.append(current); current = ""
+    if current: paragraphs.append(current)
+    return paragraphs
+
+def clean_pdf_pages(pages, page_headings=None):
+    """
+    Cleans extracted PDF pages before tokenization and yields paragraphs.
+    page_headings (page index -> [(level, title)]) turns the first new paragraphs of those pages into Heading.
+
+    Running headers/footers and page numbers are dropped: edge lines are counted in a rolling
+    frequency table over REPEAT_WINDOW_PAGES + LOOKAHEAD_PAGES pages, so memory stays bounded.
+    Line-break hyphenation is undone and soft line breaks are joined into paragraphs, also
+    across page boundaries.
+    """
+    counts = Counter(); window = deque(); pending = deque(); carry = ""; unplaced = [] # Bookmarks of pages without paragraphs
+
+    def emit(lines, edges, headings):
+        nonlocal carry, unplaced
+        kept = [line.replace("\u00ad", "").strip() for i, line in enumerate(lines)
+                if not (i in edges and (PAGE_NUMBER_LINE.match(line) or counts[_edge_key(line)] >= MIN_REPEATS))]
+        paragraphs = _page_paragraphs(kept); headings = unplaced + list(headings)
+        if not paragraphs: unplaced = headings; return []
+        first_new = 1 if carry else 0 # A bookmark never points into the paragraph carried over from the last page
+        if carry:
+            if SENTENCE_END.search(carry) or headings: paragraphs.insert(0, carry) # A bookmarked page starts a new paragraph
+            else: # Paragraph continues on this page
+                joined = _join_lines(carry, paragraphs[0])
+                paragraphs[0] = Heading(joined, carry.level, carry.title) if isinstance(carry, Heading) else joined
+        for idx, (level, title) in enumerate(headings, first_new):
+            if idx < len(paragraphs): paragraphs[idx] = Heading(paragraphs[idx], level, title)
+        unplaced = headings[max(0, len(paragraphs) - first_new):]
+        carry = paragraphs.pop() # The last paragraph may continue on the next page
+        return paragraphs
+
+    for page_idx, page in enumerate(pages):
+        lines = page.splitlines(); edges = _edge_indices(lines)
+        keys = {_edge_key(lines[i]) for i in edges}
+        counts.update(keys); window.append(keys); pending.append((lines, edges, page_headings.get(page_idx, ()) if page_headings else ()))
+        if len(window) > REPEAT_WINDOW_PAGES + LOOKAHEAD_PAGES:
+            for key in window.popleft():
+                counts[key] -= 1
+                if counts[key] <= 0: del counts[key]
+        if len(pending) > LOOKAHEAD_PAGES: yield from emit(*pending.popleft())
+    while pending: yield from emit(*pending.popleft())
+    if carry: yield carry
+
+# --- Repeated paragraphs (quoted replies, signatures, disclaimers) ---
+PARAGRAPH_GAP = re.compile(r"\r?\n(?:[ \t>]*\r?\n)+") # Blank lines, also inside quotes ('>' only)
+QUOTE_PREFIX = re.compile(r"^[ \t]*(?:>[ \t]*)+", re.MULTILINE) # E-mail quoting: '> ' / '>> '
+REPEAT_SENTENCE_SPLIT = re.compile(r"[.!?]+(?=\s|$)")
+WORD = re.compile(r"\w+")
+MIN_REPEAT_CHARS = 40          # Shorter paragraphs ("Hallo,", "Danke!") are never hidden
+SHINGLE_WORDS = 6              # Words per shingle
+REPEAT_SHARE = 0.8             # A paragraph is a repeat if this share of its shingles was seen before
+MAX_SHINGLES = 1 << 20         # Bounded shingle table; the oldest entries are forgotten first
+HASH_MODULUS = (1 << 61) - 1; HASH_BASE = 1000003
+
+class RepeatDetector:
+    """
+    Streaming detector for paragraphs that repeat earlier text, also when quoted ('> ') or merged into a
+    larger quote block. Each paragraph is fingerprinted by rolling hashes over the word shingles of its
+    sentences (shingles never span sentences, so re-wrapped or merged quotes keep their fingerprints); the
+    table of seen shingles holds at most max_shingles entries, so memory stays bounded on huge inputs.
+    """
+    def __init__(self, max_shingles=MAX_SHINGLES):
+        self.seen = {}; self.max_shingles = max_shingles
+        self.top_power = pow(HASH_BASE, SHINGLE_WORDS - 1, HASH_MODULUS)
+
+    def _shingles(self, paragraph):
+        for sentence in REPEAT_SENTENCE_SPLIT.split(QUOTE_PREFIX.sub("", paragraph).casefold()):
+            word_hashes = [zlib.crc32(word.encode('utf-8')) for word in WORD.findall(sentence)]
+            rolling = 0
+            for i, word_hash in enumerate(word_hashes):
+                if i >= SHINGLE_WORDS: rolling = (rolling - word_hashes[i - SHINGLE_WORDS] * self.top_power) % HASH_MODULUS
+                rolling = (rolling * HASH_BASE + word_hash) % HASH_MODULUS
+                if i >= SHINGLE_WORDS - 1: yield rolling
+            if 0 < len(word_hashes) < SHINGLE_WORDS: yield rolling # Short sentence: one fingerprint of all its words
+
+    def is_repeat(self, paragraph):
+        """Checks a paragraph against everything fed before and remembers its shingles."""
+        if len(paragraph) < MIN_REPEAT_CHARS: return False
+        seen = self.seen; shingles = set(self._shingles(paragraph))
+        if not shingles: return False
+        known = 0
+        for shingle in shingles:
+            if seen.pop(shingle, None) is not None: known += 1 # Re-inserted below: recently seen entries are evicted last
+            seen[shingle] = True
+        while len(seen) > self.max_shingles: del seen[next(iter(seen))]
+        return known >= REPEAT_SHARE * len(shingles)
+
+def iter_paragraph_spans(text):
+    """Yields (start, end, next_start) of the paragraphs of a text without splitting it into a list."""
+    start = 0
+    for gap in PARAGRAPH_GAP.finditer(text):
+        if gap.start() > start: yield start, gap.start(), gap.end()
+        start = gap.end()
+    if start < len(text): yield start, len(text), len(text)
+
+def find_repeated_paragraphs(text, detector=None):
+    """
+    One streaming pass over the paragraphs of a text. Runs of consecutive repeats are merged.
+
+    Returns:
+        list: (start, end) character ranges to collapse; each range includes the paragraph gaps after its
+              paragraphs, so only the break before the run remains.
+    """
+    detector = detector or RepeatDetector(); ranges = []
+    for start, end, next_start in iter_paragraph_spans(text):
+        if not detector.is_repeat(text[start:end]): continue
+        if ranges and ranges[-1][1] == start: ranges[-1] = (ranges[-1][0], next_start)
+        else: ranges.append((start, next_start))
+    return ranges
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+# Full-text search over the tokens of a reading session: an inverted index (normalized token -> sorted
+# positions) with phrase queries by position intersection. No Tk: built on a worker thread.
+
+import string
+from array import array
+from bisect import bisect_left, bisect_right
+
+from utils import MARKER_TOKENS
+
+# --- Constants ---
+STRIP_CHARS = string.punctuation + "«»„“”‘’‚‹›–—…¿¡" # Removed from both ends of tokens and query words
+
+def normalize_search_token(token):
+    """Case-folded token without surrounding punctuation ('' if nothing is left)."""
+    return token.strip(STRIP_CHARS).casefold()
+
+class SearchIndex:
+    """Inverted index of a token list; positions are token indices, in ascending order per term."""
+    def __init__(self, postings, token_count):
+        self.postings = postings; self.token_count = token_count
+
+    def find(self, query):
+        """
+        Finds a word or phrase (words in consecutive tokens, paragraph markers in between break a phrase).
+
+        Returns:
+            array: Token index of the first word of every match, ascending (empty if none or the query is empty).
+        """
+        terms = [term for term in (normalize_search_token(word) for word in query.split()) if term]
+        if not terms: return array('I')
+        term_postings = [self.postings.get(term) for term in terms]
+        if any(positions is None for positions in term_postings): return array('I')
+        if len(terms) == 1: return term_postings[0]
+        # Start from the rarest term, shift to phrase starts, then keep candidates every other term confirms
+        rarest = min(range(len(terms)), key=lambda i: len(term_postings[i]))
+        candidates = [pos - rarest for pos in term_postings[rarest] if pos >= rarest]
+        for i, positions in enumerate(term_postings):
+            if i == rarest or not candidates: continue
+            position_set = set(positions) if len(positions) < 8 * len(candidates) else None
+            if position_set is not None: candidates = [pos for pos in candidates if pos + i in position_set]
+            else: candidates = [pos for pos in candidates if _contains(positions, pos + i)]
+        return array('I', candidates)
+
+def _contains(sorted_positions, value):
+    idx = bisect_left(sorted_positions, value)
+    return idx < len(sorted_positions) and sorted_positions[idx] == value
+
+def build_search_index(tokens):
+    """One pass over the tokens; each distinct token is normalized once."""
+    postings = {}; normalized = {}
+    for pos, token in enumerate(tokens):
+        term = normalized.get(token)
+        if term is None:
+            term = "" if token in MARKER_TOKENS else normalize_search_token(token); normalized[token] = term
+        if term:
+            positions = postings.get(term)
+            if positions is None: positions = postings[term] = array('I')
+            positions.append(pos)
+    return SearchIndex(postings, len(tokens))
+
+def next_match(matches, word_index, forward=True):
+    """Index into matches of the first match after (or last before) word_index, wrapping around; None if no matches."""
+    if not matches: return None
+    if forward: idx = bisect_right(matches, word_index); return idx if idx < len(matches) else 0
+    idx = bisect_left(matches, word_index) - 1; return idx if idx >= 0 else len(matches) - 1
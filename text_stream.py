@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+
+import os
+import codecs
+import mmap
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import tokenize_with_offsets
+
+# --- Constants ---
+STREAMING_THRESHOLD_BYTES = 16 * 1024 * 1024 # .txt files above this size are streamed instead of read at once
+WINDOW_BYTES = 256 * 1024          # Decoded/tokenized per window
+BOUNDARY_SEARCH_BYTES = 64 * 1024  # How far past WINDOW_BYTES a clean split point is searched
+ENCODING_SAMPLE_BYTES = 64 * 1024
+RESIDENT_WINDOWS = 3               # Windows kept tokenized around the reading position
+
+BOMS = ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'), (codecs.BOM_UTF16_BE, 'utf-16-be'))
+
+def detect_encoding(sample):
+    """
+    Detects the encoding of a byte sample: BOM, then UTF-8 validation, then cp1252.
+
+    Returns:
+        tuple: (encoding, bom_length)
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom): return encoding, len(bom)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False) # Tolerates a cut multi-byte char at the end
+        return 'utf-8', 0
+    except UnicodeDecodeError: return 'cp1252', 0
+
+class MappedTextFile:
+    """A memory-mapped text file that is decoded in windows split at whitespace."""
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.file = open(filepath, 'rb')
+        self.size = self.file.seek(0, 2)
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        sample = self.mm[:ENCODING_SAMPLE_BYTES] if self.mm else b""
+        self.encoding, self.data_start = detect_encoding(sample)
+        self.char_width = 2 if self.encoding.startswith('utf-16') else 1
+        # Split points in encoded form: after a paragraph break, else after a space
+        self.paragraph_seps = ["\n\n".encode(self.encoding), "\n\r\n".encode(self.encoding)]
+        self.space_sep = " ".encode(self.encoding)
+        print(f"Mapped text file: {filepath} ({self.size} bytes, {self.encoding})")
+
+    def _aligned(self, pos):
+        """Moves pos back to a character boundary."""
+        if self.char_width == 2: return pos - ((pos - self.data_start) % 2)
+        if self.encoding == 'utf-8':
+            while pos > self.data_start and (self.mm[pos] & 0xC0) == 0x80: pos -= 1 # UTF-8 continuation byte
+        return pos
+
+    def _find_aligned(self, sep, start, end):
+        pos = self.mm.find(sep, start, end)
+        while pos != -1 and self.char_width == 2 and (pos - self.data_start) % 2:
+            pos = self.mm.find(sep, pos + 1, end)
+        return pos
+
+    def next_boundary(self, start):
+        """Returns the byte offset where the window starting at 'start' ends."""
+        target = start + WINDOW_BYTES
+        if target >= self.size: return self.size
+        search_end = min(self.size, target + BOUNDARY_SEARCH_BYTES)
+        candidates = [p + len(sep) for sep in self.paragraph_seps for p in [self._find_aligned(sep, target, search_end)] if p != -1]
+        if candidates: return min(candidates)
+        pos = self._find_aligned(self.space_sep, target, search_end)
+        if pos != -1: return pos + len(self.space_sep)
+        return self._aligned(target) # No whitespace nearby: split inside a very long token
+
+    def decode(self, start, end):
+        return self.mm[start:end].decode(self.encoding, errors='replace') if self.mm else ""
+
+    def close(self):
+        try:
+            if self.mm: self.mm.close()
+            self.file.close()
+        except (OSError, ValueError) as e: print(f"Warning: Could not close mapped file: {e}")
+
+class StreamingTextSource:
+    """
+    Token windows over a MappedTextFile with an offset index.
+    window_starts[i] is the byte offset of window i; window_token_starts[i] the global
+    index of its first token (known for every window that has been tokenized once).
+    """
+    def __init__(self, filepath):
+        self.mapped = MappedTextFile(filepath)
+        self.window_starts = [self.mapped.data_start]
+        self.window_token_starts = [0]
+        self.complete = self.mapped.size <= self.mapped.data_start
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream")
+
+    @property
+    def title(self): return os.path.basename(self.mapped.filepath)
+
+    def has_window(self, window_idx):
+        """True if the window is known to exist (windows are discovered one after another)."""
+        return 0 <= window_idx < len(self.window_starts) and self.window_starts[window_idx] < self.mapped.size
+
+    def load_window(self, window_idx):
+        """
+        Decodes and tokenizes one window. Windows are discovered sequentially, so
+        window_idx may be at most one past the last known window.
+
+        Returns:
+            TokenizedText: Text and tokens of the window (empty if it does not exist).
+        """
+        if window_idx >= len(self.window_starts) or self.window_starts[window_idx] >= self.mapped.size: return tokenize_with_offsets("")
+        start = self.window_starts[window_idx]
+        end = self.mapped.next_boundary(start)
+        window = tokenize_with_offsets(self.mapped.decode(start, end)); tokens = window.tokens
+        if window_idx == len(self.window_starts) - 1: # Newly discovered window: extend the offset index
+            if end >= self.mapped.size: self.complete = True
+            else: self.window_starts.append(end)
+            if len(self.window_token_starts) == window_idx + 1: self.window_token_starts.append(self.window_token_starts[window_idx] + len(tokens))
+        return window
+
+    def load_window_async(self, window_idx):
+        """Tokenizes a window in the background; returns a Future."""
+        return self.executor.submit(self.load_window, window_idx)
+
+    def window_for_token(self, token_idx):
+        """Window index containing a global token index (only for already indexed windows)."""
+        return max(0, bisect_right(self.window_token_starts, token_idx) - 1)
+
+    def is_last_window(self, window_idx):
+        return self.complete and window_idx >= len(self.window_starts) - 1
+
+    def estimated_total_tokens(self):
+        """Exact once the whole file was indexed, otherwise extrapolated from the bytes seen so far."""
+        indexed_windows = len(self.window_token_starts) - 1
+        if indexed_windows <= 0: return 0
+        tokens_seen = self.window_token_starts[indexed_windows]
+        bytes_seen = (self.window_starts[indexed_windows] if indexed_windows < len(self.window_starts) else self.mapped.size) - self.mapped.data_start
+        if self.complete and indexed_windows >= len(self.window_starts): return tokens_seen
+        return int(tokens_seen * (self.mapped.size - self.mapped.data_start) / max(1, bytes_seen))
+
+    def close(self):
+        self.executor.shutdown(wait=False); self.mapped.close()
@@ -2,9 +2,15 @@
 
 import re
 import os
+import multiprocessing
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from config import get_appdata_path
 import sys # Import sys for platform check if needed
-import tkinter as tk
-from tkinter import font
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -16,9 +22,18 @@ except ImportError:
         print("Install with: pip install Pillow")
 
 DEFAULT_ICON_NAME = "speedreader_icon.png"
+SENTENCE_END_DELIMITERS = ('.', '!', '?', ':') # Used for sentence navigation
+PARAGRAPH_MARKER = "__PARAGRAPH__"
+FILE_MARKER = "__FILE__" # Separator between files read back-to-back in one session
+MARKER_TOKENS = frozenset((PARAGRAPH_MARKER, FILE_MARKER))
 
 # --- Hilfsfunktionen ---
 
+def format_duration(seconds):
+    """'m:ss' or 'h:mm:ss' for reading times."""
+    minutes, seconds = divmod(int(seconds), 60); hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
 def calculate_delay(wpm):
     """Calculates the display duration per word based on WPM."""
     if wpm <= 0: return float('inf')
@@ -43,52 +58,309 @@ def calculate_orp_index(word, position_float=0.3): # Renamed arg for clarity
     index = max(0, int(n * position))
     return min(index, n - 1) # Clamp index to valid range
 
-def preprocess_text(text):
+def compute_orp_indices(words, position_float=0.3):
     """
-    Prepares the text for display: handles abbreviations, splits into words,
-    and inserts special markers for pauses.
+    Calculates the ORP index of every token in one batch pass.
 
     Args:
-        text (str): The raw input text.
+        words (list): Tokens as returned by tokenize_with_offsets.
+        position_float (float): The relative ORP position (0.0 to 1.0).
+
+    Returns:
+        array: One ORP character index per token ('i' typecode), -1 for markers and empty tokens.
+    """
+    position = max(0.0, min(1.0, position_float))
+    orp_indices = array('i', bytes(4 * len(words)))
+    for i, word in enumerate(words):
+        n = len(word)
+        if n == 0 or word in MARKER_TOKENS: orp_indices[i] = -1
+        else: orp_indices[i] = min(int(n * position), n - 1)
+    return orp_indices
+
+def compute_structure_indices(words):
+    """
+    Sentence and paragraph starts in one pass over the tokens (markers belong to neither).
+
+    Returns:
+        tuple: (sentence_starts, paragraph_starts) as 'I' arrays of token indices.
+    """
+    sentence_starts = array('I'); paragraph_starts = array('I')
+    new_sentence = True; new_paragraph = True
+    for i, word in enumerate(words):
+        if word in MARKER_TOKENS: new_sentence = True; new_paragraph = True; continue
+        if new_paragraph: paragraph_starts.append(i); new_paragraph = False
+        if new_sentence: sentence_starts.append(i); new_sentence = False
+        if is_sentence_end(word): new_sentence = True
+    return sentence_starts, paragraph_starts
+
+def group_display_items(words, chunk_size=1):
+    """
+    Groups tokens into display items (chunks); paragraph and file markers always stand alone.
+
+    Returns:
+        tuple: (display_items, item_to_word_indices) where the mapping is
+               item_idx -> (start_word_idx, end_word_idx), end exclusive.
+    """
+    display_items = []; item_to_word_indices = {}
+    if chunk_size < 1: chunk_size = 1
+    current_chunk_words = []; start_idx_for_current_chunk = 0; word_idx = 0
+    while word_idx < len(words):
+        word = words[word_idx]
+        if word in MARKER_TOKENS:
+            if current_chunk_words:
+                item_to_word_indices[len(display_items)] = (start_idx_for_current_chunk, word_idx)
+                display_items.append(" ".join(current_chunk_words)); current_chunk_words = []
+            item_to_word_indices[len(display_items)] = (word_idx, word_idx + 1); display_items.append(word)
+            word_idx += 1; start_idx_for_current_chunk = word_idx
+        else:
+            if not current_chunk_words: start_idx_for_current_chunk = word_idx
+            current_chunk_words.append(word); word_idx += 1
+            if len(current_chunk_words) >= chunk_size or word_idx >= len(words):
+                item_to_word_indices[len(display_items)] = (start_idx_for_current_chunk, word_idx)
+                display_items.append(" ".join(current_chunk_words)); current_chunk_words = []
+    return display_items, item_to_word_indices
+
+def compute_item_orp_indices(words, word_orp_indices, display_items, item_to_word_indices, position_float=0.3, chunk_mode="longest"):
+    """
+    Derives the fixation index of every display item from the per-token ORP indices.
+
+    Single-word items use the token's ORP. Multi-word chunks fixate on the ORP of
+    their longest word ('longest') or on the character at the ORP position of the
+    whole chunk ('center'); 'off' disables ORP for chunks.
 
     Returns:
-        list: A list of words and pause markers.
-    """
-    if not isinstance(text, str): return []
-
-    # --- NEU: Pre-processing for common abbreviations with periods ---
-    # Replace known patterns with placeholders that won't be split by \S+
-    # Using placeholders without periods avoids splitting issues.
-    # We don't necessarily need to convert them back, displaying "z_B" might be acceptable.
-    # Or use a more complex regex in findall. Let's try placeholders first.
-    replacements = {
-        r'\b(z\.B\.)\b': 'z_B',
-        r'\b(usw\.)\b': 'usw',     # usw. often doesn't need the dot kept
-        r'\b(u\.a\.)\b': 'u_a',
-        r'\b(d\.h\.)\b': 'd_h',
-        r'\b(o\.Ä\.)\b': 'o_Ä',
-        r'\b(etc\.)\b': 'etc',     # etc. often doesn't need the dot kept
-        r'\b(bzw\.)\b': 'bzw',     # bzw. often doesn't need the dot kept
-        # Add more common abbreviations as needed
-    }
-    processed_text = text
-    for pattern, replacement in replacements.items():
-        processed_text = re.sub(pattern, replacement, processed_text, flags=re.IGNORECASE)
-
-    # --- Existing processing ---
-    processed_text = processed_text.replace('\n\n', ' __PARAGRAPH__ ')
-    processed_text = processed_text.replace('\n', ' ')
-    processed_text = processed_text.replace('—', ' -- ') # Em dash
-    processed_text = processed_text.replace('–', ' - ')  # En dash
-
-    # Split into sequences of non-whitespace characters or the paragraph marker
-    # \S+ should now handle the placeholders correctly as single "words"
-    raw_words = re.findall(r'\S+|__PARAGRAPH__', processed_text)
-
-    # Filter out any potential empty strings
-    final_words = [w for w in raw_words if w]
-
-    return final_words
+        array: Character index into each display item string ('i' typecode), -1 if no ORP.
+    """
+    position = max(0.0, min(1.0, position_float))
+    item_orp = array('i', bytes(4 * len(display_items)))
+    for item_idx, item in enumerate(display_items):
+        start, end = item_to_word_indices.get(item_idx, (0, 0))
+        if end - start == 1: item_orp[item_idx] = word_orp_indices[start]; continue
+        if end <= start or chunk_mode not in ("longest", "center"): item_orp[item_idx] = -1; continue
+        if chunk_mode == "longest":
+            best_word_idx = max(range(start, end), key=lambda i: len(words[i])) # First longest word wins
+            char_offset = sum(len(words[i]) + 1 for i in range(start, best_word_idx))
+            item_orp[item_idx] = char_offset + word_orp_indices[best_word_idx]
+        else:
+            n = len(item); index = min(int(n * position), n - 1)
+            while index < n - 1 and item[index] == " ": index += 1 # Never fixate on a space
+            item_orp[item_idx] = index
+    return item_orp
+
+# --- Tokenizer rules (abbreviations) ---
+ABBREVIATION_LANGUAGES = ("de", "en")
+DEFAULT_ABBREVIATIONS = {
+    "de": ["z.B.", "usw.", "u.a.", "d.h.", "o.Ä.", "etc.", "bzw.", "Dr.", "Nr.", "ca.", "vgl.", "bspw.", "ggf.", "evtl.",
+           "inkl.", "exkl.", "zzgl.", "u.U.", "u.s.w.", "s.o.", "s.u.", "z.T.", "i.d.R.", "o.g.", "u.v.m.", "Abb.", "Tab.",
+           "Kap.", "Jh.", "Mio.", "Mrd.", "Tsd.", "Prof.", "Dipl.", "Ing.", "Hr.", "Fr.", "Str.", "St.", "Jan.", "Feb.",
+           "Aug.", "Sept.", "Okt.", "Nov.", "Dez.", "bzgl.", "sog.", "Anm.", "Bd.", "Hrsg.", "f.", "ff."],
+    "en": ["e.g.", "i.e.", "Mr.", "Mrs.", "Ms.", "Jr.", "Sr.", "vs.", "etc.", "approx.", "Inc.", "Ltd.", "Co.", "Corp.",
+           "Fig.", "Vol.", "pp.", "cf.", "et al.", "U.S.", "U.K.", "Dept.", "Est.", "Gen.", "Gov.", "Lt.", "Mt.", "Rev."],
+}
+TRAILING_PUNCTUATION = r"[,;:!?)\]\"'»“”’]*" # Allowed after an abbreviation within the same token
+
+_token_pattern = None # Compiled once, see get_token_pattern()
+_abbreviation_keys = frozenset() # Normalized abbreviations (lower-case, no spaces)
+
+def load_abbreviations(language):
+    """Returns the default abbreviations for a language plus the user's rule file (abbreviations_<lang>.txt in the app data dir)."""
+    abbreviations = list(DEFAULT_ABBREVIATIONS.get(language, []))
+    rule_file = get_appdata_path(f"abbreviations_{language}.txt")
+    if os.path.exists(rule_file):
+        try:
+            with open(rule_file, 'r', encoding='utf-8') as f:
+                abbreviations.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+            print(f"Loaded abbreviation rules: {rule_file}")
+        except (IOError, UnicodeDecodeError) as e: print(f"Warning: Could not read abbreviation rules {rule_file}: {e}")
+    return abbreviations
+
+def _trie_to_regex(node):
+    """Converts a character trie (dict, '' marks a word end) into one regex with shared prefixes."""
+    alternatives = []; optional = '' in node
+    for char in sorted(c for c in node if c):
+        child = node[char]; child_regex = _trie_to_regex(child)
+        # Between the parts of an abbreviation ("z.B." / "z. B.") an optional space is allowed
+        if char == '.' and any(c for c in child): char_regex = r"\. ?"
+        elif char == ' ': char_regex = " ?"
+        else: char_regex = re.escape(char)
+        alternatives.append(char_regex + child_regex)
+    if not alternatives: return ''
+    regex = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+    if optional: regex = "(?:" + regex + ")?"
+    return regex
+
+def compile_token_pattern(abbreviations):
+    """Compiles the tokenizer: paragraph breaks, dashes, abbreviations (one trie regex) and words in a single pattern."""
+    trie = {}
+    for abbreviation in abbreviations:
+        node = trie
+        for char in " ".join(abbreviation.split()).lower(): node = node.setdefault(char, {})
+        node[''] = {}
+    abbreviation_regex = _trie_to_regex(trie) or r"(?!)"
+    return re.compile(
+        r"(?P<para>\r?\n\r?\n)|(?P<em>—)|(?P<en>–)"
+        r"|(?P<abbr>" + abbreviation_regex + TRAILING_PUNCTUATION + r")(?=[\s—–]|$)"
+        r"|(?P<word>[^\s—–]+)", re.IGNORECASE)
+
+def get_token_pattern():
+    """Returns the cached tokenizer pattern, compiling the abbreviation rules on first use."""
+    global _token_pattern, _abbreviation_keys
+    if _token_pattern is None:
+        abbreviations = [a for language in ABBREVIATION_LANGUAGES for a in load_abbreviations(language)]
+        _abbreviation_keys = frozenset(a.replace(" ", "").lower() for a in abbreviations)
+        _token_pattern = compile_token_pattern(abbreviations)
+    return _token_pattern
+
+def reload_tokenizer_rules():
+    """Forces the abbreviation rules to be re-read on the next tokenization."""
+    global _token_pattern
+    _token_pattern = None
+
+def is_abbreviation(word):
+    """True if the token (ignoring spaces and case) is a known abbreviation."""
+    if _token_pattern is None: get_token_pattern()
+    return word.replace(" ", "").lower() in _abbreviation_keys
+
+def is_sentence_end(word):
+    """True if the token ends a sentence (abbreviations like 'z.B.' do not)."""
+    return word.endswith(SENTENCE_END_DELIMITERS) and not is_abbreviation(word)
+
+class TokenizedText:
+    """The tokens of a text plus the character span [start, end) of every token in it (for snippets from the source)."""
+    __slots__ = ("text", "tokens", "starts", "ends")
+    def __init__(self, text, tokens, starts, ends):
+        self.text = text; self.tokens = tokens; self.starts = starts; self.ends = ends
+
+def _scan_tokens(text, tokens, starts, ends, base=0, limit=None, pattern=None):
+    """
+    Appends the tokens of text (offsets shifted by base) to the given lists; stops before the first
+    token that does not end before limit. Returns the position up to which text was consumed.
+    """
+    append = tokens.append; add_start = starts.append; add_end = ends.append; consumed = 0
+    for match in (pattern or get_token_pattern()).finditer(text):
+        if limit is not None and match.end() >= limit: break
+        kind = match.lastgroup
+        if kind == 'word' or kind == 'abbr': append(match.group())
+        elif kind == 'para': append(PARAGRAPH_MARKER)
+        elif kind == 'em': append("--") # Em dash
+        else: append("-") # En dash
+        add_start(base + match.start()); consumed = match.end(); add_end(base + consumed)
+    return consumed
+
+def tokenize_with_offsets(text):
+    """
+    Splits the text into words and pause markers and records where each token is in the text.
+    Abbreviations (also spaced, e.g. 'z. B.') stay one token and are shown as written.
+
+    Returns:
+        TokenizedText: tokens (list) with starts/ends ('I' arrays of character offsets).
+    """
+    tokens = []; starts = array('I'); ends = array('I')
+    _scan_tokens(text, tokens, starts, ends)
+    return TokenizedText(text, tokens, starts, ends)
+
+# --- Parallel tokenization (very large texts) ---
+PARALLEL_TOKENIZE_MIN_CHARS = 8 * 1024 * 1024 # Below this, starting worker processes costs more than it saves
+SHARDS_PER_WORKER = 2
+SHARD_BOUNDARY = re.compile(r"\n\s*\n(?=\S)") # Ends at the first character of a paragraph
+
+def find_shard_boundaries(text, shard_count):
+    """
+    Splits points for about shard_count equally long shards, each at the start of a paragraph. No token
+    can span such a point: words and abbreviations (spaced ones included) never contain a line break,
+    and the paragraph marker of the blank lines before it ends there. Fewer points if paragraphs are long.
+    """
+    boundaries = []
+    for shard_idx in range(1, shard_count):
+        match = SHARD_BOUNDARY.search(text, max(len(text) * shard_idx // shard_count, boundaries[-1] if boundaries else 0))
+        if match is None: break
+        if not boundaries or match.end() > boundaries[-1]: boundaries.append(match.end())
+    return boundaries
+
+def _tokenize_shard(pattern, text, base):
+    """Process pool worker: tokens of one shard with offsets into the whole text."""
+    tokens = []; starts = array('I'); ends = array('I')
+    _scan_tokens(text, tokens, starts, ends, base, pattern=pattern)
+    return tokens, starts, ends
+
+def tokenize_parallel(text, max_workers=None):
+    """
+    tokenize_with_offsets in worker processes, with the identical result: the text is split at paragraph
+    breaks into balanced shards (see find_shard_boundaries), the shards are tokenized in a process pool
+    and their tokens and offsets are concatenated in order. Small texts (or a single core) are tokenized serially.
+    Blocks until done: meant for the command line, not for the Tk thread.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if len(text) < PARALLEL_TOKENIZE_MIN_CHARS or workers < 2: return tokenize_with_offsets(text)
+    bounds = [0] + find_shard_boundaries(text, workers * SHARDS_PER_WORKER) + [len(text)]
+    if len(bounds) < 3: return tokenize_with_offsets(text) # One huge paragraph
+    pattern = get_token_pattern() # The rules of this process, sent along (workers would read the rule files again)
+    tokens = []; starts = array('I'); ends = array('I')
+    try:
+        context = multiprocessing.get_context("spawn") # Like the extraction sandbox: no fork of a threaded parent
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds) - 1), mp_context=context) as executor:
+            shards = (text[start:end] for start, end in zip(bounds, bounds[1:]))
+            for shard_tokens, shard_starts, shard_ends in executor.map(_tokenize_shard, repeat(pattern), shards, bounds[:-1]):
+                tokens.extend(shard_tokens); starts.extend(shard_starts); ends.extend(shard_ends)
+    except (OSError, BrokenProcessPool) as e: print(f"Warning: Parallel tokenization failed ({e}), tokenizing serially."); return tokenize_with_offsets(text)
+    print(f"Tokenized {len(text)} characters in {len(bounds) - 1} shards: {len(tokens)} tokens.")
+    return TokenizedText(text, tokens, starts, ends)
+
+TOKENIZER_HOLD_BACK_CHARS = 64 # Longer than any abbreviation or paragraph break a chunk boundary could cut through
+
+class IncrementalTokenizer:
+    """
+    Tokenizes text that arrives in chunks, with the same result as tokenize_with_offsets on the
+    whole text. A token is only taken once it ends TOKENIZER_HOLD_BACK_CHARS before the end of the
+    data received so far; scanning resumes at the end of the last token taken.
+    """
+    def __init__(self):
+        self.parts = []; self.pending = ""; self.pending_start = 0
+        self.tokens = []; self.starts = array('I'); self.ends = array('I')
+
+    def feed(self, data):
+        """Adds a chunk; returns the number of tokens known so far."""
+        self.pending += data
+        limit = len(self.pending) - TOKENIZER_HOLD_BACK_CHARS
+        if limit > 0: self._take(_scan_tokens(self.pending, self.tokens, self.starts, self.ends, self.pending_start, limit))
+        return len(self.tokens)
+
+    def _take(self, consumed):
+        if not consumed: return
+        self.parts.append(self.pending[:consumed]); self.pending = self.pending[consumed:]; self.pending_start += consumed
+
+    def finish(self):
+        """Tokenizes the held-back rest and returns the TokenizedText of everything fed."""
+        self._take(_scan_tokens(self.pending, self.tokens, self.starts, self.ends, self.pending_start))
+        self.parts.append(self.pending); self.pending = ""
+        return TokenizedText("".join(self.parts), self.tokens, self.starts, self.ends)
+
+def tokens_from_offsets(text, starts, ends):
+    """Rebuilds the token list of tokenize_with_offsets from the text and the token spans (prepared documents)."""
+    tokens = []; append = tokens.append
+    for start, end in zip(starts, ends):
+        first_char = text[start]
+        if first_char == '\n' or first_char == '\r': append(PARAGRAPH_MARKER)
+        elif first_char == '—': append("--")
+        elif first_char == '–': append("-")
+        else: append(text[start:end])
+    return tokens
+
+def map_headings_to_tokens(starts, headings):
+    """Turns extractor headings (character offset, level, title) into chapters (token index, level, title)."""
+    chapters = []
+    for offset, level, title in headings:
+        token_idx = bisect_left(starts, offset)
+        if token_idx < len(starts) and (not chapters or token_idx > chapters[-1][0]): chapters.append((token_idx, level, title))
+    return chapters
+
+def map_char_ranges_to_tokens(starts, ranges):
+    """Turns sorted (start, end) character ranges into (first token, end token) ranges; ranges without tokens are dropped."""
+    token_ranges = []
+    for char_start, char_end in ranges:
+        first, end = bisect_left(starts, char_start), bisect_left(starts, char_end)
+        if end > first: token_ranges.append((first, end))
+    return token_ranges
 
 
 def create_default_icon(filename=DEFAULT_ICON_NAME):
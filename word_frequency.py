@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import math
+import mmap
+import struct
+import zlib
+
+from system_utils import resource_path
+
+# --- Index file format ---
+# Header: magic, version, reserved, word count, hash table size
+# Then: (count + 1) uint32 string offsets, table_size uint32 hash slots (entry index + 1, 0 = empty),
+#       count uint8 quantized frequencies, UTF-8 string blob (words sorted).
+INDEX_MAGIC = b"SRWF"; INDEX_VERSION = 1
+HEADER_FORMAT = "<4sHHII"; HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+FREQUENCY_INDEX_NAME = "word_frequency.bin"
+WORDLIST_DIR = "wordlists" # Source lists (one word per line, most frequent first)
+
+class FrequencyIndex:
+    """Read-only, memory-mapped word frequency index. Lookups do not build any Python word table."""
+    def __init__(self, filepath):
+        self.filepath = filepath
+        with open(filepath, 'rb') as f: self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _reserved, self.count, self.table_size = struct.unpack_from(HEADER_FORMAT, self.mm, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self.mm.close(); raise ValueError(f"Unsupported frequency index: {filepath}")
+        view = memoryview(self.mm)
+        offsets_end = HEADER_SIZE + 4 * (self.count + 1); table_end = offsets_end + 4 * self.table_size
+        self.offsets = view[HEADER_SIZE:offsets_end].cast('I')
+        self.table = view[offsets_end:table_end].cast('I')
+        self.frequencies = view[table_end:table_end + self.count]
+        self.blob = view[table_end + self.count:]
+        self.mask = self.table_size - 1
+
+    def lookup(self, word):
+        """Returns the quantized frequency (1-255) of a lower-case word, 0 if unknown."""
+        key = word.encode('utf-8'); slot = zlib.crc32(key) & self.mask; key_len = len(key)
+        while True:
+            entry = self.table[slot]
+            if entry == 0: return 0
+            start = self.offsets[entry - 1]; end = self.offsets[entry]
+            if end - start == key_len and self.blob[start:end] == key: return self.frequencies[entry - 1]
+            slot = (slot + 1) & self.mask
+
+    def close(self):
+        try:
+            self.offsets.release(); self.table.release(); self.frequencies.release(); self.blob.release()
+            self.mm.close()
+        except (BufferError, ValueError) as e: print(f"Warning: Could not close frequency index: {e}")
+
+def build_frequency_index(ranked_words, out_path):
+    """
+    Writes a frequency index from words ordered by descending frequency.
+    Frequencies are quantized on a log scale of the rank relative to the length of the list itself
+    (255 = most frequent, 1 = last listed word); 0 is reserved for unlisted words. A short list only says
+    which words are frequent, not which are rare, so callers treat 0 as unknown rather than rare.
+    """
+    frequencies = {}
+    ranked_words = [w for w in ranked_words if w]
+    log_max = math.log(max(2, len(ranked_words)))
+    for rank, word in enumerate(ranked_words, start=1):
+        quantized = max(1, round(255 - 254 * math.log(rank) / log_max))
+        frequencies[word] = max(quantized, frequencies.get(word, 0)) # Words shared by languages keep the higher value
+    words = sorted(frequencies); encoded = [w.encode('utf-8') for w in words]
+    table_size = 1
+    while table_size < 2 * max(1, len(words)): table_size <<= 1
+    offsets = [0]
+    for key in encoded: offsets.append(offsets[-1] + len(key))
+    table = [0] * table_size
+    for entry_idx, key in enumerate(encoded):
+        slot = zlib.crc32(key) & (table_size - 1)
+        while table[slot]: slot = (slot + 1) & (table_size - 1)
+        table[slot] = entry_idx + 1
+    with open(out_path, 'wb') as f:
+        f.write(struct.pack(HEADER_FORMAT, INDEX_MAGIC, INDEX_VERSION, 0, len(words), table_size))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets)); f.write(struct.pack(f"<{table_size}I", *table))
+        f.write(bytes(frequencies[w] for w in words)); f.write(b"".join(encoded))
+    print(f"Frequency index written: {out_path} ({len(words)} words)")
+
+def read_wordlist(filepath):
+    """Reads a ranked word list (one word per line, '#' comments), lower-cased."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return [line.strip().lower() for line in f if line.strip() and not line.startswith('#')]
+
+# --- Lazy process-wide instance ---
+_frequency_index = None; _frequency_index_failed = False
+
+def get_frequency_index():
+    """Maps the bundled frequency index on first use. Returns None if it is missing or invalid."""
+    global _frequency_index, _frequency_index_failed
+    if _frequency_index is None and not _frequency_index_failed:
+        index_path = resource_path(FREQUENCY_INDEX_NAME)
+        try: _frequency_index = FrequencyIndex(index_path); print(f"Loaded frequency index: {index_path} ({_frequency_index.count} words)")
+        except (OSError, ValueError, struct.error) as e: print(f"Warning: Frequency index not available ({e})."); _frequency_index_failed = True
+    return _frequency_index
+
+def get_frequency_lookup():
+    """Returns the lookup function of the bundled index, or None."""
+    index = get_frequency_index()
+    return index.lookup if index else None
+
+# --- Rebuild: python word_frequency.py [out_path] ---
+if __name__ == "__main__":
+    out_path = sys.argv[1] if len(sys.argv) > 1 else FREQUENCY_INDEX_NAME
+    # Interleave languages by rank so both get the same quantization scale
+    lists = [read_wordlist(os.path.join(WORDLIST_DIR, name)) for name in sorted(os.listdir(WORDLIST_DIR)) if name.endswith(".txt")]
+    ranked = [wl[i] for i in range(max(map(len, lists), default=0)) for wl in lists if i < len(wl)]
+    build_frequency_index(ranked, out_path)